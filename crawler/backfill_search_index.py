@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+검색 색인 백필 (한 번만 실행)
+
+크롤러는 새로 저장한 키워드만 색인하므로 검색 색인 도입 전에 저장된 문서는 포스팅이 없다.
+가장 오래된 문서부터 하루 단위로 읽어서 indexed 표시가 없는 문서만 색인에 더한다.
+이미 색인된 문서는 건너뛰므로 중간에 멈춰도 다시 실행하면 이어서 처리된다.
+
+사용법: cd crawler; python backfill_search_index.py [--since 2025-01-01] [--dry-run]
+(저장소 설정은 크롤러와 같음: CRAWL_STORAGE, FIREBASE_SERVICE_KEY, CRAWL_SQLITE_PATH)
+"""
+
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+from search_index import update_search_index
+
+logger = logging.getLogger(__name__)
+
+def backfill(store, since=None, dry_run=False):
+    """since(없으면 가장 오래된 문서)부터 오늘까지 색인되지 않은 문서를 색인하고 (색인한 문서 수, 읽은 날 수) 반환"""
+    if since is None:
+        oldest = store.query(limit=1, ascending=True)
+        if not oldest:
+            return 0, 0
+        since = oldest[0][1]['createdAt']
+    day = datetime(since.year, since.month, since.day)
+    end = datetime.now()
+
+    indexed = days = 0
+    while day <= end:
+        documents = [
+            (doc_id, data) for doc_id, data in store.query(since=day, until=day + timedelta(days=1), ascending=True)
+            if not data.get('indexed')
+        ]
+        if documents and not dry_run:
+            update_search_index(store, documents)
+        indexed += len(documents)
+        days += 1
+        day += timedelta(days=1)
+    return indexed, days
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--since', type=lambda value: datetime.strptime(value, '%Y-%m-%d'),
+                        help='이 날짜(YYYY-MM-DD)부터 처리 (기본: 가장 오래된 문서)')
+    parser.add_argument('--dry-run', action='store_true', help='색인하지 않고 대상 문서 수만 출력')
+    args = parser.parse_args()
+
+    from main import init_storage
+
+    store = init_storage()
+    try:
+        indexed, days = backfill(store, since=args.since, dry_run=args.dry_run)
+    finally:
+        store.close()
+    verb = '색인 대상' if args.dry_run else '색인 완료'
+    logger.info(f"검색 색인 백필 {verb}: 문서 {indexed}개 ({days}일)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+extract_ai_keywords 마이크로 벤치마크 (기존 용어별 정규식 방식 vs KeywordMatcher)
+
+사용법: python benchmarks/bench_keyword_matcher.py [--titles 10000] [--terms 300]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import KeywordMatcher
+from main import AI_TERMS
+
+WORDS = [
+    'scaling', 'efficient', 'reasoning', 'agents', 'benchmark', 'multimodal',
+    'training', 'inference', 'with', 'for', 'via', 'towards', 'robust', 'data',
+    'sparse', 'attention', 'alignment', 'evaluation', 'open', 'small', 'models',
+]
+
+def legacy_extract(text, ai_terms):
+    """기존 구현 (용어마다 부분 문자열 검사 + 정규식 컴파일)"""
+    keywords = []
+    text_lower = text.lower()
+    for term in ai_terms:
+        if term.lower() in text_lower:
+            pattern = r'\b' + re.escape(term.lower()) + r'\b'
+            if re.search(pattern, text_lower):
+                keywords.append(term)
+    return list(set(keywords))
+
+def make_terms(count):
+    """기본 목록에 합성 용어를 더해 count개 생성"""
+    terms = list(AI_TERMS)
+    i = 0
+    while len(terms) < count:
+        terms.append(f"Model-{i} {random.choice(WORDS).title()}")
+        i += 1
+    return terms
+
+def make_titles(count, terms):
+    """용어가 섞인 합성 논문/기사 제목 생성"""
+    titles = []
+    for _ in range(count):
+        words = random.choices(WORDS, k=random.randint(6, 14))
+        for _ in range(random.randint(0, 2)):
+            words.insert(random.randrange(len(words) + 1), random.choice(terms))
+        titles.append(' '.join(words).capitalize())
+    return titles
+
+def bench(name, fn, titles):
+    started = time.perf_counter()
+    matches = 0
+    for title in titles:
+        matches += len(fn(title))
+    elapsed = time.perf_counter() - started
+    print(f"{name:<16} 총 {elapsed * 1000:9.1f} ms | 제목당 {elapsed / len(titles) * 1e6:8.2f} µs | 매칭 {matches}")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--titles', type=int, default=10000)
+    parser.add_argument('--terms', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    terms = make_terms(args.terms)
+    titles = make_titles(args.titles, terms)
+
+    started = time.perf_counter()
+    matcher = KeywordMatcher(terms)
+    build = time.perf_counter() - started
+    print(f"제목 {len(titles)}개, 용어 {len(matcher)}개 (매처 컴파일 {build * 1000:.1f} ms)")
+
+    # 결과가 기존 구현과 같은지 먼저 확인
+    for title in titles:
+        assert set(matcher.find(title)) == set(legacy_extract(title, terms)), title
+
+    legacy = bench('legacy', lambda t: legacy_extract(t, terms), titles)
+    current = bench('KeywordMatcher', matcher.find, titles)
+    print(f"속도 향상: {legacy / current:.1f}x")
+
+if __name__ == '__main__':
+    main()
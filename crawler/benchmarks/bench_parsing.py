@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML 파싱 벤치마크 (기존 BeautifulSoup html.parser + lambda 필터 vs lxml XPath vs lxml 피드 파서 스트리밍)
+
+소스별로 페이지당 파싱 시간과 최대 메모리 증가량을 출력한다.
+메모리는 별도 프로세스에서 /proc/self/clear_refs 로 최고 RSS를 초기화한 뒤 VmHWM 증가량으로 잰다 (Linux 전용).
+
+사용법: python benchmarks/bench_parsing.py [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+CRAWLER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CRAWLER_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import load_fixture
+
+HTML_SOURCES = ['huggingface', 'paperswithcode', 'ainews']
+
+def legacy_parse(source, content):
+    """기존 crawl_* 함수의 파싱 방식"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    if source == 'huggingface':
+        elements = soup.find_all(['h3', 'h4', 'a'], class_=lambda x: x and any(
+            cls in str(x).lower() for cls in ['title', 'paper', 'link']
+        ))[:15]
+    elif source == 'paperswithcode':
+        elements = soup.find_all('a', href=lambda x: x and '/paper/' in str(x))[:15]
+    else:
+        elements = soup.find_all(['h1', 'h2', 'h3'], class_=lambda x: x and 'title' in str(x).lower())[:10]
+    return [(element.get_text().strip(), element.get('href', '')) for element in elements]
+
+def lxml_parse(source, content):
+    """SOURCE_SELECTORS 기반 파싱"""
+    from html_parsing import select_links
+    from main import SOURCE_SELECTORS
+
+    limit = 10 if source == 'ainews' else 15
+    return select_links(content, SOURCE_SELECTORS[source], limit=limit)
+
+def stream_parse(source, content):
+    """본문을 청크로 나눠 피드 파서에 넣고 limit개를 찾으면 멈춤 (fetch_page 의 스트리밍 경로)"""
+    from itertools import islice
+
+    from html_parsing import iter_links_incremental
+    from main import SOURCE_SELECTORS, STREAM_CHUNK_BYTES
+
+    limit = 10 if source == 'ainews' else 15
+    chunks = (content[i:i + STREAM_CHUNK_BYTES] for i in range(0, len(content), STREAM_CHUNK_BYTES))
+    return list(islice(iter_links_incremental(chunks, SOURCE_SELECTORS[source]), limit))
+
+PARSERS = {'legacy': legacy_parse, 'lxml': lxml_parse, 'stream': stream_parse}
+
+def measure_memory(parser, source):
+    """새 프로세스에서 한 번 파싱했을 때 늘어난 최대 RSS (KB)"""
+    code = (
+        "import json, sys\n"
+        "def status(key):\n"
+        "    for line in open('/proc/self/status'):\n"
+        "        if line.startswith(key):\n"
+        "            return int(line.split()[1])\n"
+        f"sys.path[:0] = [{CRAWLER_DIR!r}, {os.path.dirname(os.path.abspath(__file__))!r}]\n"
+        "import logging; logging.disable(logging.CRITICAL)\n"
+        "import bench_parsing as b\n"
+        f"content = b.load_fixture({source!r})\n"
+        "import bs4, lxml.html, main\n"
+        "open('/proc/self/clear_refs', 'w').write('5')\n"
+        "before = status('VmRSS:')\n"
+        f"result = b.PARSERS[{parser!r}]({source!r}, content)\n"
+        "print(json.dumps(status('VmHWM:') - before))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def measure_time(parser, source, content, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        PARSERS[parser](source, content)
+    return (time.perf_counter() - started) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'source':<16}{'parser':<8}{'size(KB)':>10}{'ms/page':>10}{'peak +KB':>10}")
+    for source in HTML_SOURCES:
+        content = load_fixture(source)
+        # 두 방식의 추출 결과가 같은지 먼저 확인 (제목 태그의 링크는 lxml 쪽만 감싸는 <a> 에서 찾으므로 제목만 비교)
+        assert [title for title, _ in legacy_parse(source, content)] == \
+            [title for title, _ in lxml_parse(source, content)], source
+        assert lxml_parse(source, content) == stream_parse(source, content), source
+        for name in PARSERS:
+            elapsed = measure_time(name, source, content, args.repeat)
+            peak = measure_memory(name, source)
+            print(f"{source:<16}{name:<8}{len(content) // 1024:>10}{elapsed * 1000:>10.2f}{peak:>10}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크/테스트용 메모리 Firestore
+
+크롤러와 Functions 가 쓰는 google.cloud.firestore.Client API 일부(collection/document/query,
+WriteBatch, BulkWriter)를 흉내 내고 읽기/쓰기/RPC 횟수를 센다. crawler/tests, functions/tests 에서도 쓴다.
+"""
+
+import copy
+import threading
+import uuid
+from types import SimpleNamespace
+
+from google.api_core.exceptions import NotFound
+
+ALREADY_EXISTS = 6
+NOT_FOUND = 5
+BULK_BATCH_SIZE = 20
+
+_OPERATORS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a is not None and a < b,
+    '<=': lambda a, b: a is not None and a <= b,
+    '>': lambda a, b: a is not None and a > b,
+    '>=': lambda a, b: a is not None and a >= b,
+    'in': lambda a, b: a in b,
+    'array_contains': lambda a, b: isinstance(a, list) and b in a,
+}
+
+class FakeError(Exception):
+    """Firestore 오류 (gRPC 상태 코드 포함)"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+class FakeDocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return _field(self._data, field)
+
+class FakeDocumentReference:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+
+    def collection(self, name):
+        return FakeCollection(self._client, f"{self.path}/{name}")
+
+    def get(self, field_paths=None):
+        self._client.count(reads=1, rpcs=1)
+        return FakeDocumentSnapshot(self, self._client.load(self.path))
+
+    def create(self, data):
+        self._client.count(rpcs=1)
+        self._client.apply('create', self.path, data)
+
+    def set(self, data, merge=False):
+        self._client.count(rpcs=1)
+        self._client.apply('set', self.path, data, merge=merge)
+
+    def update(self, data):
+        self._client.count(rpcs=1)
+        try:
+            self._client.apply('update', self.path, data)
+        except FakeError as e:
+            # 실제 클라이언트처럼 없는 문서 update 는 NotFound
+            if e.code == NOT_FOUND:
+                raise NotFound(str(e)) from e
+            raise
+
+    def delete(self):
+        self._client.count(rpcs=1)
+        self._client.apply('delete', self.path)
+
+class FakeQuery:
+    def __init__(self, client, path, filters=(), fields=None, orders=(), limit_count=None, offset_count=0,
+                 cursor=None):
+        self._client = client
+        self._path = path
+        self._filters = tuple(filters)
+        self._fields = fields
+        self._orders = tuple(orders)
+        self._limit = limit_count
+        self._offset = offset_count
+        self._cursor = cursor
+
+    def _copy(self, **changes):
+        state = {
+            'filters': self._filters, 'fields': self._fields, 'orders': self._orders,
+            'limit_count': self._limit, 'offset_count': self._offset, 'cursor': self._cursor,
+        }
+        state.update(changes)
+        return FakeQuery(self._client, self._path, **state)
+
+    def where(self, field, op, value):
+        return self._copy(filters=self._filters + ((field, op, value),))
+
+    def select(self, field_paths):
+        return self._copy(fields=list(field_paths))
+
+    def order_by(self, field, direction='ASCENDING'):
+        return self._copy(orders=self._orders + ((field, direction),))
+
+    def limit(self, count):
+        return self._copy(limit_count=count)
+
+    def offset(self, count):
+        return self._copy(offset_count=count)
+
+    def start_after(self, values):
+        """정렬 필드 값(dict, 문서 ID는 '__name__') 바로 다음부터"""
+        return self._copy(cursor=dict(values))
+
+    def _after_cursor(self, path, data):
+        for field, direction in self._orders:
+            value, bound = _order_value(path, data, field), self._cursor.get(field)
+            if value == bound:
+                continue
+            return value < bound if str(direction).upper().startswith('DESC') else value > bound
+        return False
+
+    def _matches(self, data):
+        for field, op, value in self._filters:
+            if not _OPERATORS[op](_field(data, field), value):
+                return False
+        return True
+
+    def _project(self, data):
+        if self._fields is None:
+            return copy.deepcopy(data)
+        return {field: copy.deepcopy(data.get(field)) for field in self._fields if field in data}
+
+    def stream(self):
+        results = [
+            (path, data) for path, data in self._client.scan(self._path)
+            if self._matches(data)
+        ]
+        for field, direction in reversed(self._orders):
+            reverse = str(direction).upper().startswith('DESC')
+            results.sort(
+                key=lambda item: (_order_value(*item, field) is None, _order_value(*item, field)), reverse=reverse
+            )
+        if self._cursor is not None:
+            results = [(path, data) for path, data in results if self._after_cursor(path, data)]
+        results = results[self._offset:]
+        if self._limit is not None:
+            results = results[:self._limit]
+
+        # Firestore 과금처럼 결과가 없어도 최소 1회 읽기로 계산
+        self._client.count(reads=max(len(results), 1), rpcs=1)
+        for path, data in results:
+            yield FakeDocumentSnapshot(FakeDocumentReference(self._client, path), self._project(data))
+
+    def get(self):
+        return list(self.stream())
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client, path):
+        super().__init__(client, path)
+        self.id = path.rsplit('/', 1)[-1]
+
+    def document(self, document_id=None):
+        return FakeDocumentReference(self._client, f"{self._path}/{document_id or uuid.uuid4().hex[:20]}")
+
+    def add(self, data):
+        reference = self.document()
+        reference.create(data)
+        return None, reference
+
+class FakeWriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._operations = []
+
+    def create(self, reference, data):
+        self._operations.append(('create', reference.path, data, {}))
+
+    def set(self, reference, data, merge=False):
+        self._operations.append(('set', reference.path, data, {'merge': merge}))
+
+    def update(self, reference, data):
+        self._operations.append(('update', reference.path, data, {}))
+
+    def delete(self, reference):
+        self._operations.append(('delete', reference.path, None, {}))
+
+    def commit(self):
+        # 배치는 원자적: 하나라도 실패하면 아무것도 반영하지 않음
+        self._client.count(rpcs=1)
+        with self._client.lock:
+            snapshot = copy.deepcopy(self._client.documents)
+            try:
+                for op, path, data, options in self._operations:
+                    self._client.apply(op, path, data, **options)
+            except Exception:
+                self._client.documents = snapshot
+                raise
+        self._operations = []
+
+class FakeBulkWriter:
+    def __init__(self, client):
+        self._client = client
+        self._operations = []
+        self._on_result = None
+        self._on_error = None
+
+    def on_write_result(self, callback):
+        self._on_result = callback
+
+    def on_write_error(self, callback):
+        self._on_error = callback
+
+    def _queue(self, op, reference, data=None, **options):
+        self._operations.append((op, reference, data, options))
+        if len(self._operations) >= BULK_BATCH_SIZE:
+            self.flush()
+
+    def create(self, reference, document_data):
+        self._queue('create', reference, document_data)
+
+    def set(self, reference, document_data, merge=False):
+        self._queue('set', reference, document_data, merge=merge)
+
+    def update(self, reference, field_updates):
+        self._queue('update', reference, field_updates)
+
+    def delete(self, reference):
+        self._queue('delete', reference)
+
+    def flush(self):
+        operations, self._operations = self._operations, []
+        if not operations:
+            return
+        self._client.count(rpcs=1)
+        for op, reference, data, options in operations:
+            attempts = 1
+            while True:
+                try:
+                    self._client.apply(op, reference.path, data, **options)
+                except FakeError as e:
+                    failure = SimpleNamespace(
+                        code=e.code, message=str(e), attempts=attempts,
+                        operation=SimpleNamespace(reference=reference, attempts=attempts)
+                    )
+                    if self._on_error and self._on_error(failure, self):
+                        attempts += 1
+                        continue
+                    break
+                if self._on_result:
+                    self._on_result(reference, SimpleNamespace(update_time=None), self)
+                break
+
+    def close(self):
+        self.flush()
+
+class InMemoryFirestore:
+    """google.cloud.firestore.Client 대용 메모리 저장소"""
+
+    def __init__(self):
+        self.documents = {}
+        self.lock = threading.RLock()
+        self.reads = 0
+        self.writes = 0
+        self.rpcs = 0
+
+    def count(self, reads=0, writes=0, rpcs=0):
+        with self.lock:
+            self.reads += reads
+            self.writes += writes
+            self.rpcs += rpcs
+
+    def stats(self):
+        return {'reads': self.reads, 'writes': self.writes, 'rpcs': self.rpcs, 'documents': len(self.documents)}
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeWriteBatch(self)
+
+    def bulk_writer(self):
+        return FakeBulkWriter(self)
+
+    def get_all(self, references, field_paths=None):
+        references = list(references)
+        self.count(reads=len(references), rpcs=1)
+        for reference in references:
+            yield FakeDocumentSnapshot(reference, self.load(reference.path))
+
+    def load(self, path):
+        with self.lock:
+            data = self.documents.get(path)
+            return copy.deepcopy(data) if data is not None else None
+
+    def scan(self, collection_path):
+        """컬렉션 바로 아래 문서들"""
+        prefix = collection_path + '/'
+        with self.lock:
+            return [
+                (path, copy.deepcopy(data)) for path, data in self.documents.items()
+                if path.startswith(prefix) and '/' not in path[len(prefix):]
+            ]
+
+    def apply(self, op, path, data=None, merge=False):
+        with self.lock:
+            exists = path in self.documents
+            if op == 'create' and exists:
+                raise FakeError(ALREADY_EXISTS, f"Document already exists: {path}")
+            if op == 'update' and not exists:
+                raise FakeError(NOT_FOUND, f"No document to update: {path}")
+            if op == 'delete':
+                self.documents.pop(path, None)
+            elif op == 'update':
+                merged = self.documents[path]
+                for key, value in data.items():
+                    if _is_delete(value):
+                        _remove(merged, key)
+                    else:
+                        _assign(merged, key, _resolve(value, _field(merged, key)))
+            elif op == 'set' and merge and exists:
+                _merge(self.documents[path], data)
+            else:
+                self.documents[path] = _resolve(data, None)
+            self.writes += 1
+
+def _order_value(path, data, field):
+    # '__name__' 은 문서 ID 순서
+    return path.rsplit('/', 1)[-1] if field == '__name__' else _field(data, field)
+
+def _split(field):
+    """필드 경로를 이름 목록으로 (`...` 로 인용된 이름 안의 '.' 은 구분자가 아님)"""
+    parts, current, quoted = [], [], False
+    for char in field:
+        if char == '`':
+            quoted = not quoted
+        elif char == '.' and not quoted:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+def _field(data, field):
+    value = data
+    for part in _split(field):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+def _assign(data, field, value):
+    parts = _split(field)
+    for part in parts[:-1]:
+        data = data.setdefault(part, {})
+    data[parts[-1]] = value
+
+def _remove(data, field):
+    parts = _split(field)
+    for part in parts[:-1]:
+        data = data.get(part) if isinstance(data, dict) else None
+    if isinstance(data, dict):
+        data.pop(parts[-1], None)
+
+def _is_delete(value):
+    return type(value).__name__ == 'Sentinel' and 'delete' in value.description
+
+def _resolve(value, current):
+    """Increment/ArrayUnion 같은 필드 변환을 실제 값으로 바꿈"""
+    if hasattr(value, 'value') and type(value).__name__ == 'Increment':
+        return (current or 0) + value.value
+    if type(value).__name__ == 'ArrayUnion':
+        existing = list(current or [])
+        return existing + [item for item in value.values if item not in existing]
+    if isinstance(value, dict):
+        return {
+            key: _resolve(item, current.get(key) if isinstance(current, dict) else None)
+            for key, item in value.items()
+        }
+    return copy.deepcopy(value)
+
+def _merge(data, changes):
+    """set(merge=True): 중첩 맵은 재귀적으로 합치고 DELETE_FIELD 는 지우고 나머지는 덮어씀"""
+    for key, value in changes.items():
+        if _is_delete(value):
+            data.pop(key, None)
+        elif isinstance(value, dict) and value and isinstance(data.get(key), dict):
+            _merge(data[key], value)
+        else:
+            data[key] = _resolve(value, data.get(key))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 페이지 픽스처
+
+기본 동작은 각 소스의 실제 마크업 구조를 흉내 낸 합성 페이지를 고정 시드로 생성한다.
+네트워크가 되는 환경에서는 --record 로 실제 페이지를 받아 같은 파일명으로 덮어쓸 수 있다.
+
+사용법: python benchmarks/fixtures.py [--record] [--items 60]
+"""
+
+import argparse
+import html
+import os
+import random
+import sys
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# 소스 이름 -> (픽스처 파일, 실제 URL)
+FIXTURES = {
+    'huggingface': ('huggingface_papers.html', 'https://huggingface.co/papers'),
+    'paperswithcode': ('paperswithcode_latest.html', 'https://paperswithcode.com/latest'),
+    'techcrunch': ('techcrunch_ai_feed.xml', 'https://techcrunch.com/category/artificial-intelligence/feed/'),
+    'ainews': ('ainews_home.html', 'https://www.artificialintelligence-news.com'),
+}
+
+TERMS = [
+    'GPT-4o', 'Claude 3.5', 'Gemini 1.5', 'LLaMA', 'Mixtral', 'DeepSeek', 'Qwen',
+    'OpenAI', 'Anthropic', 'Google DeepMind', 'Meta', 'Microsoft', 'LLM', 'RAG',
+    'LoRA', 'RLHF', 'Stable Diffusion', 'Transformer', 'Reinforcement Learning',
+]
+WORDS = [
+    'scaling', 'efficient', 'reasoning', 'agents', 'benchmark', 'multimodal',
+    'training', 'inference', 'with', 'for', 'via', 'towards', 'robust', 'data',
+    'sparse', 'attention', 'alignment', 'evaluation', 'open', 'small', 'models',
+    'long-context', 'retrieval', 'video', 'speech', 'planning', 'tool', 'use',
+]
+
+def fixture_path(source):
+    return os.path.join(FIXTURE_DIR, FIXTURES[source][0])
+
+def load_fixture(source):
+    """픽스처 바이트 읽기 (없으면 생성)"""
+    if not os.path.exists(fixture_path(source)):
+        generate()
+    with open(fixture_path(source), 'rb') as f:
+        return f.read()
+
+def _title(rng):
+    words = rng.choices(WORDS, k=rng.randint(5, 10))
+    if rng.random() < 0.7:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(TERMS))
+    return ' '.join(words).capitalize()
+
+def _noise(rng, blocks):
+    """페이지 구조를 흉내 내는 내비게이션/스크립트/장식 마크업"""
+    parts = []
+    for i in range(blocks):
+        parts.append(
+            f'<div class="flex items-center gap-2 px-{i % 6}"><span class="text-sm text-gray-500">'
+            f'{" ".join(rng.choices(WORDS, k=8))}</span><svg viewBox="0 0 32 32" class="h-4 w-4">'
+            f'<path d="M{i} 0L{i + 10} 16L{i} 32z" fill="currentColor"></path></svg></div>'
+        )
+    return '\n'.join(parts)
+
+def _script(rng, size):
+    payload = ' '.join(rng.choices(WORDS, k=size // 8))
+    return f'<script>window.__DATA__ = {{"props": "{payload}"}};</script>'
+
+def _huggingface(rng, items):
+    cards = []
+    for i in range(items):
+        slug = f"24{rng.randint(1, 12):02d}.{rng.randint(10000, 99999)}"
+        cards.append(
+            f'<article class="relative flex flex-col overflow-hidden rounded-xl border">'
+            f'{_noise(rng, 6)}'
+            f'<h3 class="mb-1 text-lg font-semibold leading-tight">'
+            f'<a href="/papers/{slug}" class="paper-title line-clamp-3">{html.escape(_title(rng))}</a></h3>'
+            f'<div class="flex items-center"><a href="/papers/{slug}#community" class="comment-link">'
+            f'{rng.randint(0, 40)} comments</a><span class="upvotes">{rng.randint(1, 300)}</span></div>'
+            f'</article>'
+        )
+    nav = ''.join(f'<a class="nav-link" href="/{w}">{w.title()}</a>' for w in ['models', 'datasets', 'spaces', 'papers'])
+    return (
+        f'<!doctype html><html><head><meta charset="utf-8"><title>Daily Papers - Hugging Face</title>'
+        f'{_script(rng, 60000)}</head><body><header>{nav}</header>'
+        f'<main><section class="grid gap-4">{"".join(cards)}</section></main>'
+        f'<footer>{_noise(rng, 40)}</footer>{_script(rng, 40000)}</body></html>'
+    )
+
+def _paperswithcode(rng, items):
+    rows = []
+    for i in range(items):
+        slug = '-'.join(rng.choices(WORDS, k=4))
+        rows.append(
+            f'<div class="row infinite-item item paper-card">'
+            f'<div class="col-lg-3 item-image-col"><a href="/paper/{slug}">'
+            f'<div class="item-image" style="background-image: url(/thumbs/{i}.jpg)"></div></a></div>'
+            f'<div class="col-lg-9 item-col"><div class="item-content"><h1><a href="/paper/{slug}">'
+            f'{html.escape(_title(rng))}</a></h1>'
+            f'<p class="item-strip-abstract">{" ".join(rng.choices(WORDS, k=60))}</p>'
+            f'{_noise(rng, 3)}</div></div></div>'
+        )
+    return (
+        f'<!doctype html><html><head><title>Latest papers | Papers With Code</title>'
+        f'{_script(rng, 20000)}</head><body><nav class="navbar">{_noise(rng, 10)}</nav>'
+        f'<div class="container">{"".join(rows)}</div><footer>{_noise(rng, 20)}</footer></body></html>'
+    )
+
+def _ainews(rng, items):
+    posts = []
+    for i in range(items):
+        slug = '-'.join(rng.choices(WORDS, k=5))
+        posts.append(
+            f'<article class="elementor-post elementor-grid-item post-{i}">'
+            f'<div class="elementor-post__thumbnail__link"><img src="/wp-content/uploads/{i}.jpg" alt=""></div>'
+            f'<div class="elementor-post__text"><h3 class="elementor-post__title">'
+            f'<a href="https://www.artificialintelligence-news.com/news/{slug}/">{html.escape(_title(rng))}</a></h3>'
+            f'<div class="elementor-post__excerpt"><p>{" ".join(rng.choices(WORDS, k=40))}</p></div>'
+            f'{_noise(rng, 4)}</div></article>'
+        )
+    return (
+        f'<!DOCTYPE html><html lang="en-GB"><head><title>AI News</title>{_script(rng, 50000)}'
+        f'<style>{"".join(f".c{i}{{margin:{i}px}}" for i in range(2000))}</style></head>'
+        f'<body class="home page-template"><h1 class="site-title">AI News</h1>'
+        f'<div class="elementor-posts-container">{"".join(posts)}</div>'
+        f'<aside class="widget-area"><h2 class="widget-title">Trending</h2>{_noise(rng, 30)}</aside>'
+        f'</body></html>'
+    )
+
+def _techcrunch(rng, items):
+    entries = []
+    for i in range(items):
+        title = _title(rng)
+        slug = '-'.join(title.lower().split()[:6])
+        body = ''.join(f'<p>{" ".join(rng.choices(WORDS, k=50))}</p>' for _ in range(8))
+        entries.append(
+            f'<item><title>{html.escape(title)}</title>'
+            f'<link>https://techcrunch.com/2024/10/{(i % 28) + 1:02d}/{slug}/</link>'
+            f'<pubDate>{["Mon", "Tue", "Wed", "Thu", "Fri"][i % 5]}, {(i % 28) + 1:02d} Oct 2024 '
+            f'{i % 24:02d}:00:00 +0000</pubDate>'
+            f'<dc:creator><![CDATA[Reporter {i % 7}]]></dc:creator>'
+            f'<category><![CDATA[AI]]></category><guid isPermaLink="false">https://techcrunch.com/?p={2800000 + i}</guid>'
+            f'<description><![CDATA[{" ".join(rng.choices(WORDS, k=30))}]]></description>'
+            f'<content:encoded><![CDATA[{body}]]></content:encoded></item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+        '<title>AI News &amp; Artificial Intelligence | TechCrunch</title>'
+        '<link>https://techcrunch.com/category/artificial-intelligence/</link>'
+        f'{"".join(entries)}</channel></rss>'
+    )
+
+GENERATORS = {
+    'huggingface': _huggingface,
+    'paperswithcode': _paperswithcode,
+    'techcrunch': _techcrunch,
+    'ainews': _ainews,
+}
+
+def generate(items=60, seed=42):
+    """합성 픽스처 생성"""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for source, make in GENERATORS.items():
+        rng = random.Random(f"{seed}-{source}")
+        with open(fixture_path(source), 'w', encoding='utf-8') as f:
+            f.write(make(rng, items))
+        print(f"{source}: {fixture_path(source)} ({os.path.getsize(fixture_path(source)) // 1024} KB)")
+
+def record():
+    """실제 페이지를 받아 픽스처로 저장"""
+    import requests
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    for source, (filename, url) in FIXTURES.items():
+        try:
+            response = requests.get(url, headers=headers, timeout=10)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"{source}: 기록 실패 ({e})", file=sys.stderr)
+            continue
+        with open(fixture_path(source), 'wb') as f:
+            f.write(response.content)
+        print(f"{source}: {url} -> {filename} ({len(response.content) // 1024} KB)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--record', action='store_true', help='실제 사이트에서 페이지 기록')
+    parser.add_argument('--items', type=int, default=60)
+    args = parser.parse_args()
+
+    if args.record:
+        record()
+    else:
+        generate(args.items)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오프라인 크롤러 벤치마크
+
+로컬 스텁 서버(픽스처 + 번역 API)와 메모리 Firestore로 main()을 처음부터 끝까지 실행하고,
+단계별(파싱, 키워드 추출, 중복/유사 제목 체크, 쓰기) 시간을 잰 뒤 JSON으로 저장한다.
+커밋 간 비교는 --compare 로 이전 결과 파일을 넘기면 된다.
+
+사용법: python benchmarks/run_benchmarks.py [--latency 0.2] [--translate-latency 0.05] [--storage sqlite]
+                                         [--output benchmarks/results.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CRAWLER_DIR = os.path.dirname(BENCH_DIR)
+sys.path[:0] = [CRAWLER_DIR, BENCH_DIR]
+
+from fake_firestore import InMemoryFirestore
+from stub_server import StubServer
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=CRAWLER_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def timed(fn, repeat=1):
+    """평균 실행 시간(초)과 마지막 결과"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+def bench_end_to_end(main, stub, store, clear_http_cache=False):
+    """main() 한 번 실행 (같은 저장소/캐시로 두 번 부르면 두 번째는 warm run)"""
+    if clear_http_cache:
+        shutil.rmtree(os.path.join(main.CACHE_DIR, 'http'), ignore_errors=True)
+    db = getattr(store, 'db', None)
+    before = dict(db.stats()) if db is not None else {}
+    requests_before = sum(stub.requests.values())
+    elapsed, _ = timed(lambda: main.main(store=store))
+    result = {
+        'seconds': round(elapsed, 4),
+        'http_requests': sum(stub.requests.values()) - requests_before,
+    }
+    if db is not None:
+        after = db.stats()
+        result.update({
+            'firestore_reads': after['reads'] - before['reads'],
+            'firestore_writes': after['writes'] - before['writes'],
+            'firestore_rpcs': after['rpcs'] - before['rpcs'],
+        })
+    result['counters'] = main.metrics.report()['counters']
+    # 문서 수 조회는 위 읽기 횟수 측정이 끝난 뒤에
+    result['documents'] = len(store.query())
+    return result
+
+def make_store(storage):
+    """벤치마크용 빈 저장소 (메모리 Firestore 또는 임시 파일 SQLite)"""
+    from storage import FirestoreStore, SQLiteStore
+
+    if storage == 'sqlite':
+        return SQLiteStore(os.path.join(tempfile.mkdtemp(prefix='crawler-bench-'), 'keywords.sqlite3'))
+    return FirestoreStore(InMemoryFirestore())
+
+def bench_stages(main, repeat, storage):
+    """단계별 마이크로 벤치마크"""
+    from fixtures import load_fixture
+
+    results = {}
+    titles = []
+    # 증분 상태가 있으면 이미 본 항목에서 멈추므로 파싱 자체만 재도록 끔
+    main._crawl_state = None
+
+    parse = {}
+    for source in main.SOURCES:
+        content = load_fixture(source['name'])
+        elapsed, items = timed(lambda: list(main.parse_stage((source, content))), repeat)
+        parse[source['name']] = {'ms_per_page': round(elapsed * 1000, 3), 'items': len(items)}
+        titles.extend(title for _, title, _ in items)
+    results['parse'] = parse
+
+    # 제목 수가 적으므로 여러 번 반복해서 1만 개 이상으로 맞춤
+    corpus = titles * max(1, 10000 // max(len(titles), 1))
+    elapsed, _ = timed(lambda: [main.extract_ai_keywords(title) for title in corpus])
+    results['extract'] = {'titles': len(corpus), 'us_per_title': round(elapsed / len(corpus) * 1e6, 3)}
+
+    store = make_store(storage)
+    index = main.KeywordIndex(path=os.path.join(tempfile.mkdtemp(), 'keyword_index.txt'))
+    for i in range(20000):
+        index.add(f"existing keyword {i}")
+    writer = main.KeywordBatchWriter(store, index=index)
+    candidates = [f"existing keyword {i}" for i in range(0, 20000, 2)] + [f"new keyword {i}" for i in range(10000)]
+    elapsed, _ = timed(lambda: [writer.claim(keyword) for keyword in candidates])
+    results['dedup'] = {'candidates': len(candidates), 'us_per_check': round(elapsed / len(candidates) * 1e6, 3)}
+
+    # 유사 제목 탐지 (보존 기간 분량의 스토리 인덱스에 대해 제목 비교)
+    # 같은 제목을 반복하면 전부 후보가 되므로 픽스처 단어로 만든 서로 다른 제목을 씀
+    stories = main.StoryIndex(os.path.join(tempfile.mkdtemp(), 'stories.json'))
+    vocabulary = sorted({word for title in titles for word in title.split()})
+    rng = random.Random(0)
+    now = time.time()
+    for i in range(2000):
+        stories.add(f"story {i}", ' '.join(rng.sample(vocabulary, 8)), 'bench', main.SOURCES[0]['category'], now)
+    elapsed, _ = timed(lambda: [stories.match(title) for title in titles])
+    results['near_duplicates'] = {
+        'stories': len(stories),
+        'titles': len(titles),
+        'us_per_match': round(elapsed / max(len(titles), 1) * 1e6, 3),
+    }
+
+    source = main.SOURCES[0]
+    docs = [main.keyword_document(f"bench keyword {i}", source) for i in range(2000)]
+
+    def write_all():
+        for doc in docs:
+            writer.write(dict(doc))
+        writer.close()
+
+    elapsed, _ = timed(write_all)
+    results['write'] = {
+        'documents': len(docs),
+        'ms_total': round(elapsed * 1000, 3),
+    }
+    if storage == 'firestore':
+        results['write']['firestore_rpcs'] = store.db.stats()['rpcs']
+
+    # 저장소 범위 조회 (최근 일주일, 카테고리 필터)
+    week_ago = datetime.now() - timedelta(days=7)
+    elapsed, rows = timed(lambda: store.query(since=week_ago, categories=[source['category']], limit=500), repeat)
+    results['query'] = {'rows': len(rows), 'ms_per_query': round(elapsed * 1000, 3)}
+    return results
+
+def compare(current, previous_path):
+    """이전 결과와 비교 출력"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+
+    def walk(new, old, prefix=''):
+        for key, value in new.items():
+            if isinstance(value, dict):
+                walk(value, old.get(key, {}), f"{prefix}{key}.")
+            elif isinstance(value, (int, float)) and isinstance(old.get(key), (int, float)) and old.get(key):
+                change = (value - old[key]) / old[key] * 100
+                print(f"{prefix}{key:<40} {old[key]:>12} -> {value:>12} ({change:+.1f}%)")
+
+    print(f"비교 기준: {previous_path} ({previous.get('meta', {}).get('revision')})")
+    walk({k: v for k, v in current.items() if k != 'meta'}, previous)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.2, help='소스 페이지 응답 지연(초)')
+    parser.add_argument('--translate-latency', type=float, default=0.05, help='번역 API 응답 지연(초)')
+    parser.add_argument('--translation-rate', type=float, default=50, help='초당 번역 요청 제한')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', default=os.path.join(BENCH_DIR, 'results.json'))
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--storage', choices=['firestore', 'sqlite'], default='firestore',
+                        help='저장소 (firestore는 메모리 Firestore)')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency, translate_latency=args.translate_latency) as stub:
+        # main 모듈은 import 시점에 환경변수를 읽으므로 먼저 설정
+        os.environ['TRANSLATION_API_URL'] = stub.url('translate')
+        os.environ['TRANSLATION_RATE'] = str(args.translation_rate)
+        os.environ['CRAWLER_CACHE_DIR'] = tempfile.mkdtemp(prefix='crawler-bench-')
+        os.environ['CRAWLER_REPORT_PATH'] = os.path.join(os.environ['CRAWLER_CACHE_DIR'], 'run_report.json')
+
+        import main as crawler
+        if not args.verbose:
+            logging.disable(logging.INFO)
+
+        for source in crawler.SOURCES:
+            source['url'] = stub.url(source['name'])
+
+        store = make_store(args.storage)
+        results = {
+            'meta': {
+                'revision': git_revision(),
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'latency': args.latency,
+                'translate_latency': args.translate_latency,
+                'translation_rate': args.translation_rate,
+                'storage': args.storage,
+            },
+            'end_to_end': {
+                'cold': bench_end_to_end(crawler, stub, store),
+                'warm': bench_end_to_end(crawler, stub, store),
+                # HTTP 캐시를 지워서 본문은 다시 받지만 증분 상태로 이미 본 항목은 건너뜀
+                'incremental': bench_end_to_end(crawler, stub, store, clear_http_cache=True),
+            },
+            'stages': bench_stages(crawler, args.repeat, args.storage),
+        }
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"결과 저장: {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 로컬 HTTP 스텁 서버
+
+/<source> 경로로 소스 픽스처를, /translate 경로로 MyMemory 형식의 번역 응답을 돌려준다.
+경로별 지연 시간을 줄 수 있고 ETag 조건부 요청(304)도 지원한다.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from fixtures import FIXTURES, load_fixture
+
+class _QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # 크롤러가 limit개를 찾고 스트리밍 응답을 중간에 닫는 것은 정상 동작
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+class StubServer:
+    """with 문으로 쓰는 스레드 HTTP 서버"""
+
+    def __init__(self, latency=0.0, translate_latency=0.0):
+        self.latency = latency
+        self.translate_latency = translate_latency
+        self.requests = {}
+        self.pages = {source: load_fixture(source) for source in FIXTURES}
+        self._lock = threading.Lock()
+        self._server = _QuietServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def url(self, path):
+        return f"{self.base_url}/{path}"
+
+    def _count(self, path):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, status, body=b'', headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                path = parsed.path.strip('/')
+                stub._count(path)
+
+                if path == 'translate':
+                    time.sleep(stub.translate_latency)
+                    text = parse_qs(parsed.query).get('q', [''])[0]
+                    body = json.dumps({
+                        'responseStatus': 200,
+                        'responseData': {'translatedText': f"[ko] {text}"}
+                    }).encode('utf-8')
+                    self._send(200, body, {'Content-Type': 'application/json'})
+                    return
+
+                page = stub.pages.get(path)
+                if page is None:
+                    self._send(404)
+                    return
+
+                time.sleep(stub.latency)
+                etag = '"' + hashlib.sha1(page).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self._send(304, headers={'ETag': etag})
+                    return
+                self._send(200, page, {'ETag': etag, 'Content-Type': 'text/html; charset=utf-8'})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+보존 기간이 지난 키워드를 주간 압축 아카이브로 옮기기
+
+CRAWL_RETENTION_DAYS 보다 오래된 keywords 문서를 주(ISO 주 번호)별로 묶어 gzip JSON 아카이브 하나에 합치고
+(Firestore 는 keyword_archives/<주 ID> 문서의 바이트 필드, SQLite 는 로컬 파일), 원본은 배치로 삭제한다.
+검색 색인에 반영된(indexed) 문서의 포스팅도 함께 지워서 hot 컬렉션과 색인이 보존 기간 분량만 유지되게 한다.
+아카이브를 먼저 쓰고 원본을 지우므로 중간에 실패해도 다음 실행에서 같은 문서 ID로 합쳐진다.
+"""
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from search_index import build_postings
+from weekly_digest import week_id, week_start
+
+logger = logging.getLogger(__name__)
+
+# 0 이면 압축하지 않음
+RETENTION_DAYS = int(os.getenv('CRAWL_RETENTION_DAYS', '90'))
+# 한 실행에서 옮길 최대 문서 수 (오래된 것부터, 남은 문서는 다음 실행에서)
+COMPACTION_LIMIT = 5000
+ARCHIVE_FIELDS = ['keyword', 'translatedKeyword', 'category', 'source', 'url', 'links', 'preview', 'createdAt', 'isActive']
+
+def encode_archive(digest_id, start, documents):
+    """주간 아카이브 바이트 (문서 ID 순 정렬, mtime 0 으로 같은 내용이면 같은 바이트)"""
+    archive = {
+        'weekId': digest_id,
+        'weekStart': start.isoformat(),
+        'count': len(documents),
+        'documents': [
+            {'id': doc_id, **data} for doc_id, data in sorted(documents.items())
+        ],
+    }
+    raw = json.dumps(archive, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+    return gzip.compress(raw, mtime=0)
+
+def decode_archive(payload):
+    return json.loads(gzip.decompress(payload))
+
+def _archived_fields(data):
+    item = {field: data.get(field) for field in ARCHIVE_FIELDS if data.get(field) is not None}
+    if isinstance(item.get('createdAt'), datetime):
+        item['createdAt'] = item['createdAt'].isoformat()
+    return item
+
+def compact(store, retention_days=RETENTION_DAYS, now=None, limit=COMPACTION_LIMIT):
+    """보존 기간이 지난 문서를 아카이브로 옮기고 (옮긴 문서 수, 갱신한 주 수) 반환"""
+    if retention_days <= 0:
+        return 0, 0
+    cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+    documents = store.query(until=cutoff, limit=limit, ascending=True)
+    if not documents:
+        return 0, 0
+
+    weeks = {}
+    for doc_id, data in documents:
+        weeks.setdefault(week_id(data['createdAt']), []).append((doc_id, data))
+
+    archived = 0
+    for digest_id, items in sorted(weeks.items()):
+        # 이전 실행에서 일부만 옮긴 주는 기존 아카이브에 합침
+        merged = {}
+        existing = store.load_archive(digest_id)
+        if existing:
+            for item in decode_archive(existing)['documents']:
+                merged[item.pop('id')] = item
+        merged.update((doc_id, _archived_fields(data)) for doc_id, data in items)
+
+        start = week_start(items[0][1]['createdAt'])
+        payload = encode_archive(digest_id, start, merged)
+        store.write_archive(digest_id, start, payload, len(merged))
+        store.delete([doc_id for doc_id, _ in items])
+        # 색인 도입 전 문서는 포스팅이 없으므로 문서 수를 줄이지 않음
+        indexed = [(doc_id, data) for doc_id, data in items if data.get('indexed')]
+        if indexed:
+            store.remove_from_search_index(build_postings(indexed), len(indexed))
+        archived += len(items)
+        logger.info(f"아카이브 갱신: {digest_id} (+{len(items)}개, 총 {len(merged)}개, {len(payload)}바이트)")
+
+    return archived, len(weeks)
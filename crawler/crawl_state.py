@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+소스별 증분 크롤링 상태 (high-water mark)
+
+소스마다 최근에 본 항목 키(URL 또는 제목 해시)와 가장 최근 게시 시각을 저장해 두고,
+다음 실행의 파싱 단계에서 이미 본 항목에 도달하면 멈추거나 건너뛰게 한다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 소스별로 기억할 최근 항목 수 (페이지 항목 수보다 넉넉하게)
+MAX_SEEN_ITEMS = 200
+
+def item_key(url, title):
+    """항목 식별 키 (URL이 있으면 URL, 없으면 정규화한 제목 기준)"""
+    basis = url or ' '.join(title.lower().split())
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()[:16]
+
+class CrawlState:
+    """소스별 최근 항목 키와 게시 시각 high-water mark"""
+
+    def __init__(self, path, max_seen=MAX_SEEN_ITEMS):
+        self.path = path
+        self.max_seen = max_seen
+        self.sources = {}
+        self._seen = {}
+        self._staged = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.sources = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"크롤링 상태 로드 실패, 처음부터 크롤링: {e}")
+        self._seen = {name: set(entry.get('seen', [])) for name, entry in self.sources.items()}
+
+    def is_known(self, source, key):
+        return key in self._seen.get(source, ())
+
+    def watermark(self, source):
+        """지난 실행까지 본 가장 최근 게시 시각 (epoch 초, 없으면 None)"""
+        return self.sources.get(source, {}).get('publishedAt')
+
+    def record(self, source, key, published=None):
+        """이번 실행에서 본 항목 (commit() 전까지는 다음 실행에 반영되지 않음)"""
+        with self._lock:
+            staged = self._staged.setdefault(source, {'seen': [], 'publishedAt': None})
+            staged['seen'].append(key)
+            if published is not None:
+                staged['publishedAt'] = max(published, staged['publishedAt'] or published)
+
+    def commit(self):
+        """이번 실행에서 본 항목을 합쳐 디스크에 기록"""
+        with self._lock:
+            staged, self._staged = self._staged, {}
+            if not staged:
+                return
+            for source, update in staged.items():
+                entry = self.sources.setdefault(source, {'seen': [], 'publishedAt': None})
+                # 최근 항목이 앞에 오도록 합치고 오래된 키는 버림
+                seen = list(dict.fromkeys(update['seen'] + entry['seen']))[:self.max_seen]
+                entry['seen'] = seen
+                self._seen[source] = set(seen)
+                if update['publishedAt'] is not None:
+                    entry['publishedAt'] = max(update['publishedAt'], entry.get('publishedAt') or 0)
+            try:
+                if os.path.dirname(self.path):
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.sources, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"크롤링 상태 저장 실패: {e}")
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+중복 키워드 문서 정리 (한 번만 실행)
+
+내용 해시 문서 ID(keyword_doc_id) 도입 전 문서는 자동 ID 로 저장되어 있어서 ID 로는 같은 키워드를 찾지 못한다.
+키워드 인덱스(KeywordIndex)는 저장된 키워드 문자열로 해시를 다시 계산하므로 이후 실행에서는 중복 저장되지 않지만,
+인덱스 도입 전 실행에서 이미 같은 키워드가 해시 ID 로 한 번 더 저장되었을 수 있다.
+가장 오래된 문서부터 하루 단위로 읽어 정규화한 키워드별로 처음 본 문서만 남기고 나머지는 지운다
+(주간 다이제스트 항목과, 검색 색인에 반영된 문서의 포스팅도 함께 제거).
+
+사용법: cd crawler; python dedup_keywords.py [--dry-run]
+(저장소 설정은 크롤러와 같음: CRAWL_STORAGE, FIREBASE_SERVICE_KEY, CRAWL_SQLITE_PATH)
+"""
+
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+from search_index import build_postings
+from weekly_digest import week_id
+
+logger = logging.getLogger(__name__)
+
+def dedup(store, dry_run=False):
+    """같은 키워드의 문서 중 가장 오래된 것만 남기고 (지운 문서 수, 남은 문서 수) 반환"""
+    from main import keyword_doc_id
+
+    oldest = store.query(limit=1, ascending=True)
+    if not oldest:
+        return 0, 0
+    since = oldest[0][1]['createdAt']
+    day = datetime(since.year, since.month, since.day)
+    end = datetime.now()
+
+    kept = set()
+    removed = 0
+    while day <= end:
+        duplicates = []
+        for doc_id, data in store.query(since=day, until=day + timedelta(days=1), ascending=True):
+            key = keyword_doc_id(data.get('keyword') or '')
+            if key in kept:
+                duplicates.append((doc_id, data))
+            else:
+                kept.add(key)
+        if duplicates and not dry_run:
+            store.delete([doc_id for doc_id, _ in duplicates])
+            # 지운 문서가 프런트엔드에 계속 보이지 않도록 다이제스트 항목도 뺌
+            entries = {}
+            for doc_id, data in duplicates:
+                entries.setdefault(week_id(data['createdAt']), []).append((data.get('category'), doc_id))
+            for digest_id, items in entries.items():
+                store.remove_from_digest(digest_id, items)
+            indexed = [(doc_id, data) for doc_id, data in duplicates if data.get('indexed')]
+            if indexed:
+                store.remove_from_search_index(build_postings(indexed), len(indexed))
+        removed += len(duplicates)
+        day += timedelta(days=1)
+    return removed, len(kept)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dry-run', action='store_true', help='지우지 않고 중복 문서 수만 출력')
+    args = parser.parse_args()
+
+    from main import init_storage
+
+    store = init_storage()
+    try:
+        removed, kept = dedup(store, dry_run=args.dry_run)
+    finally:
+        store.close()
+    verb = '삭제 대상' if args.dry_run else '삭제 완료'
+    logger.info(f"중복 키워드 {verb}: {removed}개 (남은 키워드 {kept}개)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+새 기사의 미리보기 메타데이터 수집 (og:title/og:description/og:image/게시 시각)
+
+저장이 끝난 뒤 이번 실행에서 새로 만든 제목 문서의 기사 URL만 제한된 워커 풀로 가져온다.
+본문은 스트리밍으로 받아 파서에 조금씩 넣고, </head> 나 <body> 를 만나면 (또는 MAX_HEAD_BYTES 를 넘으면) 읽기를 멈춘다.
+결과는 정규화한 URL -> 내용 해시 -> 미리보기로 캐시해서 같은 기사(og:url/canonical 이 같은 다른 URL 포함)를 다시 가져오지 않는다.
+"""
+
+import codecs
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+# <head> 가 이보다 길면 거기까지만 봄
+MAX_HEAD_BYTES = 256 * 1024
+PREVIEW_CHUNK_BYTES = 16 * 1024
+# 이 기간 동안 다시 보지 않은 URL은 캐시에서 제거
+PREVIEW_CACHE_DAYS = 30
+
+# 미리보기 필드 -> 우선순위 순 메타 태그 이름 (property/name/itemprop, 소문자)
+PREVIEW_META = {
+    'title': ('og:title', 'twitter:title'),
+    'description': ('og:description', 'twitter:description', 'description'),
+    'image': ('og:image', 'og:image:url', 'og:image:secure_url', 'twitter:image'),
+    'publishedAt': ('article:published_time', 'og:published_time', 'datepublished', 'pubdate', 'date'),
+}
+PREVIEW_LIMITS = {'title': 200, 'description': 300, 'image': 1000, 'publishedAt': 40}
+_WANTED = {name for names in PREVIEW_META.values() for name in names} | {'og:url'}
+# 같은 기사로 취급할 때 무시하는 추적용 쿼리 파라미터
+_TRACKING_PREFIXES = ('utm_', 'mc_')
+_TRACKING_PARAMS = frozenset(['fbclid', 'gclid', 'ref'])
+
+def normalize_url(url):
+    """캐시 키용 URL (fragment/추적 파라미터 제거, 호스트 소문자)"""
+    parts = urlparse(url.strip())
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith(_TRACKING_PREFIXES) and key.lower() not in _TRACKING_PARAMS]
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', '', urlencode(query), ''))
+
+class HeadMetadataParser(HTMLParser):
+    """<head> 의 메타 태그만 모으는 파서 (</head> 나 <body> 를 만나면 done)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.canonical = None
+        self.title = []
+        self.done = False
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self.done = True
+            return
+        attrs = dict(attrs)
+        if tag == 'meta':
+            name = (attrs.get('property') or attrs.get('name') or attrs.get('itemprop') or '').strip().lower()
+            content = (attrs.get('content') or '').strip()
+            if name in _WANTED and content:
+                self.meta.setdefault(name, content)
+        elif tag == 'link' and 'canonical' in (attrs.get('rel') or '').lower().split():
+            self.canonical = self.canonical or attrs.get('href')
+        elif tag == 'title':
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+        elif tag == 'head':
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title.append(data)
+
+    def preview(self):
+        """수집한 메타 태그 -> 미리보기 (없는 필드는 생략, og:title 이 없으면 <title>)"""
+        preview = {}
+        for field, names in PREVIEW_META.items():
+            value = next((self.meta[name] for name in names if name in self.meta), None)
+            if field == 'title' and value is None:
+                value = ' '.join(''.join(self.title).split()) or None
+            if value:
+                preview[field] = value[:PREVIEW_LIMITS[field]]
+        return preview
+
+def read_preview(chunks, encoding=None, max_bytes=MAX_HEAD_BYTES):
+    """바이트 청크를 </head> 까지만 읽어 (미리보기, 대표 URL) 반환 (나머지 청크는 소비하지 않음)"""
+    parser = HeadMetadataParser()
+    decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    read = 0
+    for chunk in chunks:
+        read += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or read >= max_bytes:
+            break
+    return parser.preview(), parser.meta.get('og:url') or parser.canonical
+
+def content_hash(preview):
+    return hashlib.sha1(json.dumps(preview, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+class PreviewCache:
+    """정규화한 URL -> 내용 해시, 내용 해시 -> 미리보기 (메타 태그가 없던 페이지도 빈 미리보기로 기록)"""
+
+    def __init__(self, path, max_age_days=PREVIEW_CACHE_DAYS):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self.urls = {}
+        self.previews = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.urls = data.get('urls', {})
+            self.previews = data.get('previews', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"미리보기 캐시 로드 실패, 비어 있는 캐시로 시작: {e}")
+
+    def __len__(self):
+        return len(self.urls)
+
+    def get(self, url):
+        """캐시된 미리보기 (없으면 None)"""
+        entry = self.urls.get(normalize_url(url))
+        if entry is None:
+            return None
+        entry[1] = time.time()
+        return self.previews.get(entry[0])
+
+    def put(self, url, preview, aliases=()):
+        """미리보기 기록 (aliases: og:url/canonical 처럼 같은 기사를 가리키는 다른 URL)"""
+        digest = content_hash(preview)
+        self.previews[digest] = preview
+        now = time.time()
+        for key in {normalize_url(url), *(normalize_url(alias) for alias in aliases if alias)}:
+            self.urls[key] = [digest, now]
+
+    def save(self):
+        """오래된 URL과 참조가 없는 미리보기를 정리하고 원자적으로 기록"""
+        cutoff = time.time() - self.max_age
+        self.urls = {url: entry for url, entry in self.urls.items() if entry[1] >= cutoff}
+        used = {entry[0] for entry in self.urls.values()}
+        self.previews = {digest: preview for digest, preview in self.previews.items() if digest in used}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'urls': self.urls, 'previews': self.previews}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"미리보기 캐시 저장 실패: {e}")
+
+def enrich(documents, fetch, cache, workers=4):
+    """제목 문서들의 미리보기 ({문서 ID: 미리보기}, 새로 가져온 URL 수)
+
+    fetch(url) 은 (미리보기, 대표 URL) 을 반환하고, 건너뛴 URL은 None 을 반환한다 (캐시에 남기지 않음).
+    """
+    targets = {}
+    for doc_id, data in documents:
+        if data.get('links') is not None and data.get('url'):
+            targets.setdefault(normalize_url(data['url']), (data['url'], []))[1].append(doc_id)
+
+    previews, missing = {}, []
+    for url, doc_ids in targets.values():
+        preview = cache.get(url)
+        if preview is None:
+            missing.append(url)
+        elif preview:
+            previews.update((doc_id, preview) for doc_id in doc_ids)
+
+    fetched = 0
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix='enrich') as pool:
+            futures = {pool.submit(fetch, url): url for url in missing}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"미리보기 가져오기 실패: {url} - {e}")
+                    continue
+                if result is None:
+                    continue
+                preview, canonical = result
+                cache.put(url, preview, aliases=[urljoin(url, canonical)] if canonical else [])
+                fetched += 1
+                if preview:
+                    previews.update((doc_id, preview) for doc_id in targets[normalize_url(url)][1])
+    return previews, fetched
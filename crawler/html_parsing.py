@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+lxml 기반 HTML 파싱 (소스별로 미리 컴파일한 XPath 셀렉터 사용)
+
+iter_links 는 전체 본문을 트리로 만든 뒤 셀렉터를 적용하고,
+iter_links_incremental 은 본문 청크를 받는 대로 피드 파서에 넣어 맞는 요소를 닫히는 대로 내보낸다.
+"""
+
+from collections import deque
+from itertools import islice
+
+from lxml import etree, html
+
+_LOWER_CLASS = "translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+def class_contains(*words):
+    """class 속성에 단어 중 하나가 포함되는지 (대소문자 무시) 검사하는 XPath 조건"""
+    return ' or '.join(f"contains({_LOWER_CLASS}, '{word}')" for word in words)
+
+def tag_in(*tags):
+    """태그 이름이 목록에 있는지 검사하는 XPath 조건"""
+    return ' or '.join(f"self::{tag}" for tag in tags)
+
+def compile_selector(expression):
+    """XPath 식 컴파일 (모듈 로드 시 한 번만)"""
+    return etree.XPath(expression)
+
+def parse_html(content):
+    """HTML 바이트/문자열을 lxml 트리로 파싱"""
+    return html.fromstring(content)
+
+def link_href(element):
+    """요소의 href (제목 태그처럼 링크가 아니면 안쪽 또는 감싸는 <a> 의 href)"""
+    if element.get('href'):
+        return element.get('href')
+    for link in element.iter('a'):
+        if link.get('href'):
+            return link.get('href')
+    for link in element.iterancestors('a'):
+        if link.get('href'):
+            return link.get('href')
+    return ''
+
+def iter_links(content, selector):
+    """셀렉터에 맞는 요소들의 (텍스트, href)를 문서 순서대로 (중간에 멈추면 나머지 텍스트는 만들지 않음)"""
+    if not content or not content.strip():
+        return
+    for element in selector(parse_html(content)):
+        yield element.text_content().strip(), link_href(element)
+
+def select_links(content, selector, limit=None):
+    """셀렉터에 맞는 요소들의 (텍스트, href) 목록 (문서 순서)"""
+    return list(islice(iter_links(content, selector), limit))
+
+def element_matcher(selector):
+    """'//' 로 시작하는 셀렉터를 요소 하나에 대한 조건으로 바꾼 XPath (스트리밍 파싱용)"""
+    if not selector.path.startswith('//') or selector.path.startswith('///'):
+        raise ValueError(f"스트리밍 파싱은 '//' 로 시작하는 셀렉터만 지원합니다: {selector.path}")
+    return etree.XPath('self::' + selector.path[2:])
+
+def iter_links_incremental(chunks, selector):
+    """바이트 청크를 받는 대로 파싱해서 셀렉터에 맞는 요소의 (텍스트, href)를 문서 순서대로
+
+    요소는 시작 태그에서 셀렉터와 맞춰 보고, 앞선 후보가 모두 닫히면 내보낸다.
+    소비를 멈추면 나머지 청크는 읽지 않는다 (iter_links 와 같은 결과).
+    """
+    matches = element_matcher(selector)
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    # lxml.html 트리와 같은 요소 클래스 (text_content 등)
+    parser.set_element_class_lookup(html.HtmlElementClassLookup())
+    pending = deque()
+    open_ids = set()
+
+    def ready():
+        while pending and id(pending[0]) not in open_ids:
+            element = pending.popleft()
+            yield element.text_content().strip(), link_href(element)
+
+    def handle(events):
+        for event, element in events:
+            if event == 'start':
+                if matches(element):
+                    pending.append(element)
+                    open_ids.add(id(element))
+            elif id(element) in open_ids:
+                open_ids.discard(id(element))
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        handle(parser.read_events())
+        yield from ready()
+    parser.close()
+    handle(parser.read_events())
+    open_ids.clear()
+    yield from ready()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+크롤러용 디스크 HTTP 캐시 (ETag/Last-Modified 기반 조건부 요청)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class HttpCache:
+    """URL별 검증 헤더와 응답 본문을 디렉터리에 저장"""
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = os.path.join(path, 'index.json')
+        self.body_dir = os.path.join(path, 'bodies')
+        self.entries = {}
+        self._staged = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"HTTP 캐시 인덱스 로드 실패, 비어 있는 캐시로 시작: {e}")
+
+    def _body_path(self, url):
+        return os.path.join(self.body_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.body')
+
+    def conditional_headers(self, url):
+        """저장된 검증 값으로 만든 조건부 요청 헤더"""
+        with self._lock:
+            entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_body(self, url):
+        """저장된 응답 본문 (없으면 None)"""
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def stage(self, url, response, body=None):
+        """응답을 임시 보관 (commit() 전까지는 다음 실행에 반영되지 않음, body: 스트리밍으로 읽은 본문)"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._staged[url] = (
+                {'etag': etag, 'last_modified': last_modified, 'fetched_at': time.time()},
+                response.content if body is None else body
+            )
+
+    def commit(self):
+        """보관한 응답을 디스크에 기록"""
+        with self._lock:
+            staged, self._staged = self._staged, {}
+            if not staged:
+                return
+            try:
+                os.makedirs(self.body_dir, exist_ok=True)
+                for url, (entry, body) in staged.items():
+                    with open(self._body_path(url), 'wb') as f:
+                        f.write(body)
+                    self.entries[url] = entry
+
+                tmp_path = self.index_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, self.index_path)
+                logger.info(f"HTTP 캐시 저장: {len(staged)}개 URL")
+            except Exception as e:
+                logger.warning(f"HTTP 캐시 저장 실패: {e}")
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+AI 키워드 매칭 엔진 (용어 목록을 한 번만 컴파일해서 한 번의 스캔으로 매칭)
+"""
+
+import re
+
+def _trie_pattern(node):
+    """접두사 트리를 공통 접두사를 공유하는 정규식으로 변환 (긴 용어 우선)"""
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # 더 긴 용어를 먼저 시도하고 실패하면 여기서 끝나는 용어로 되돌아감
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+class KeywordMatcher:
+    """단어 경계를 지키는 대소문자 무시 다중 용어 매처"""
+
+    def __init__(self, terms):
+        # 같은 용어(대소문자만 다른 경우)는 처음 나온 표기를 사용
+        self.canonical = {}
+        for term in terms:
+            self.canonical.setdefault(term.lower(), term)
+
+        # 용어들을 접두사 트리로 묶어서 위치마다 분기 수를 줄임
+        trie = {}
+        for term in self.canonical:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        # 전방탐색으로 감싸서 겹치는 위치의 용어도 모두 찾기
+        self.pattern = re.compile(r'\b(?=(' + _trie_pattern(trie) + r')\b)', re.IGNORECASE)
+
+        # 같은 위치에서 시작하는 짧은 용어 ('Claude 3.5' -> 'Claude 3')
+        self.prefixes = {
+            term: [
+                other for other in self.canonical
+                if other != term and term.startswith(other)
+                and re.match(re.escape(other) + r'\b', term)
+            ]
+            for term in self.canonical
+        }
+
+    def __len__(self):
+        return len(self.canonical)
+
+    def find(self, text):
+        """텍스트에 등장하는 용어 목록 (등장 순서, 중복 제거)"""
+        found = {}
+        for match in self.pattern.finditer(text):
+            term = match.group(1).lower()
+            found.setdefault(self.canonical[term], None)
+            for prefix in self.prefixes[term]:
+                found.setdefault(self.canonical[prefix], None)
+        return list(found)
+
+def load_terms(path):
+    """한 줄에 하나씩 적힌 용어 파일 읽기 (# 주석, 빈 줄 무시)"""
+    with open(path, encoding='utf-8') as f:
+        return [
+            line.strip() for line in f
+            if line.strip() and not line.lstrip().startswith('#')
+        ]
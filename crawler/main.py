@@ -213,22 +213,201 @@ AI Weekly News Crawler for GitHub Actions
 
 import os
 import json
+import hashlib
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import feedparser
 from datetime import datetime, timedelta
+from urllib.parse import urljoin, urlparse
 import logging
 from google.cloud import firestore
 from google.oauth2 import service_account
 import time
+import calendar
+from itertools import islice
+
+from compaction import compact
+from crawl_state import CrawlState, item_key
+from enrichment import PREVIEW_CHUNK_BYTES, PreviewCache, enrich, read_preview
+from html_parsing import class_contains, compile_selector, iter_links, iter_links_incremental, select_links, tag_in
+from http_cache import HttpCache
+from keyword_matcher import KeywordMatcher, load_terms
+from metrics import metrics, profiling
+from near_duplicates import StoryIndex
+from pipeline import Pipeline
+from resilience import Deadline, HostHealth, backoff_delay
+from search_index import build_postings, update_search_index
+from storage import FirestoreStore, SQLiteStore, WriteResult
+from translation_cache import TranslationCache
+from trends import TermCounter
+from weekly_digest import update_weekly_digest, week_id
 
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# 동시 크롤링 설정 (CRAWL_CONCURRENCY=1 이면 순차 실행)
+MAX_WORKERS = int(os.getenv('CRAWL_CONCURRENCY', '4'))
+REQUEST_TIMEOUT = 10
+# 실행 전체(가져오기/번역) 시간 예산(초), 넘으면 남은 소스/번역은 건너뛰고 저장만 마침
+CRAWL_TIME_BUDGET = float(os.getenv('CRAWL_TIME_BUDGET', '300'))
+# 남은 예산이 이보다 적으면 새 요청을 보내지 않음 (아주 짧은 타임아웃은 호스트 장애와 구분되지 않음)
+MIN_REQUEST_BUDGET = 1.0
+MAX_FETCH_ATTEMPTS = 2
+
+# 캐시/스냅샷 저장 위치 (GitHub Actions 캐시로 실행 간 보존)
+CACHE_DIR = os.getenv('CRAWLER_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+
+# 호스트별 keep-alive 세션 풀
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(url):
+    """URL 호스트에 해당하는 공유 세션 반환 (없으면 생성)"""
+    host = urlparse(url).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(MAX_WORKERS, 1))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[host] = session
+        return session
+
+def http_get(url, **kwargs):
+    """호스트별 세션을 재사용하는 GET 요청"""
+    kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+    return get_session(url).get(url, **kwargs)
+
+def close_sessions():
+    """열려 있는 세션 정리"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+# 조건부 요청용 HTTP 캐시 (main()에서 초기화)
+# CRAWL_FORCE=1 이면 304 응답이어도 캐시된 본문으로 다시 처리
+FORCE_RECRAWL = os.getenv('CRAWL_FORCE') == '1'
+_http_cache = None
+
+def init_http_cache():
+    """크롤러 HTTP 캐시 초기화"""
+    global _http_cache
+    _http_cache = HttpCache(os.path.join(CACHE_DIR, 'http'))
+    return _http_cache
+
+# 소스별 증분 크롤링 상태 (마지막으로 본 항목/게시 시각)
+_crawl_state = None
+
+def init_crawl_state():
+    """증분 크롤링 상태 초기화"""
+    global _crawl_state
+    _crawl_state = CrawlState(os.path.join(CACHE_DIR, 'crawl_state.json'))
+    return _crawl_state
+
+# 새로 본 항목의 용어별 일간 언급 수 (crawl()에서 초기화, 없으면 세지 않음)
+_term_counter = None
+
+def init_term_counter():
+    """용어 카운터 초기화"""
+    global _term_counter
+    _term_counter = TermCounter()
+    return _term_counter
+
+# 실행 시간 예산과 호스트 상태 (crawl()에서 초기화, 없으면 제한 없음)
+_deadline = None
+_host_health = None
+
+def init_deadline():
+    """실행 시간 예산 시작"""
+    global _deadline
+    _deadline = Deadline(CRAWL_TIME_BUDGET)
+    return _deadline
+
+def init_host_health():
+    """호스트별 서킷 브레이커/응답 시간 기록 로드"""
+    global _host_health
+    _host_health = HostHealth(os.path.join(CACHE_DIR, 'host_health.json'))
+    return _host_health
+
+def request_timeout(limit=REQUEST_TIMEOUT):
+    """남은 시간 예산을 넘지 않는 요청 타임아웃 (예산이 없으면 limit)"""
+    return _deadline.timeout(limit) if _deadline is not None else limit
+
+def budget_expired():
+    return _deadline is not None and _deadline.expired(MIN_REQUEST_BUDGET)
+
+def budget_timeout(error, timeout, limit=REQUEST_TIMEOUT):
+    """예산 때문에 limit보다 짧아진 타임아웃으로 끝난 요청인지 (호스트 실패로 세지 않음)"""
+    return isinstance(error, requests.Timeout) and timeout < limit
+
+def host_allowed(url):
+    return _host_health is None or _host_health.allow(urlparse(url).netloc)
+
+# 셀렉터로 파싱하는 페이지를 스트리밍으로 읽을 때의 청크 크기
+STREAM_CHUNK_BYTES = 16 * 1024
+
+def fetch_page(url, headers=None, timeout=REQUEST_TIMEOUT, selector=None, limit=None):
+    """조건부 GET으로 본문 가져오기 (304 Not Modified면 None)
+    
+    selector가 있으면 본문을 청크로 받는 대로 파싱해서 (텍스트, href) 목록을 반환하고,
+    limit개를 찾으면 나머지 본문은 읽지 않는다.
+    """
+    headers = dict(headers or {})
+    if _http_cache is not None:
+        headers.update(_http_cache.conditional_headers(url))
+    
+    with http_get(url, headers=headers, timeout=timeout, stream=True) as response:
+        metrics.incr('http_requests')
+        if response.status_code == 304:
+            body = _http_cache.load_body(url) if FORCE_RECRAWL else None
+            if body is None:
+                logger.info(f"변경 없음 (304): {url}")
+                return None
+            return body if selector is None else select_links(body, selector, limit)
+        
+        response.raise_for_status()
+        if selector is None:
+            body = response.content
+        else:
+            read = []
+            
+            def chunks():
+                for chunk in response.iter_content(STREAM_CHUNK_BYTES):
+                    read.append(chunk)
+                    yield chunk
+            
+            links = list(islice(iter_links_incremental(chunks(), selector), limit))
+            # 읽은 앞부분만 캐시 (강제 재크롤링 때 같은 limit개를 다시 찾기에 충분)
+            body = b''.join(read)
+            metrics.incr('stream_bytes_read', len(body))
+            if limit is not None and len(links) == limit:
+                metrics.incr('streams_stopped_early')
+        if _http_cache is not None:
+            _http_cache.stage(url, response, body)
+        return body if selector is None else links
+
+# 저장소 선택: CRAWL_STORAGE=firestore(기본)|sqlite, CRAWL_DRY_RUN=1 이면 메모리 SQLite에만 쓰고 캐시도 갱신하지 않음
+STORAGE_BACKEND = os.getenv('CRAWL_STORAGE', 'firestore')
+SQLITE_PATH = os.getenv('CRAWL_SQLITE_PATH', os.path.join(CACHE_DIR, 'keywords.sqlite3'))
+DRY_RUN = os.getenv('CRAWL_DRY_RUN') == '1'
+
+def init_storage():
+    """설정에 맞는 키워드 저장소 생성"""
+    if DRY_RUN:
+        logger.info("드라이런: 메모리 SQLite 저장소 사용")
+        return SQLiteStore(':memory:')
+    if STORAGE_BACKEND == 'sqlite':
+        logger.info(f"SQLite 저장소 사용: {SQLITE_PATH}")
+        return SQLiteStore(SQLITE_PATH)
+    return FirestoreStore(init_firestore())
+
 # Firebase 초기화
 def init_firestore():
     """Firebase Firestore 클라이언트 초기화"""
@@ -255,40 +434,163 @@ def init_firestore():
         logger.error(f"Firestore 초기화 오류: {e}")
         raise
 
+# 번역 API 설정 (로컬 스텁 서버로 교체 가능)
+TRANSLATION_API_URL = os.getenv('TRANSLATION_API_URL', 'https://api.mymemory.translated.net/get')
+TRANSLATION_WORKERS = int(os.getenv('TRANSLATION_WORKERS', '4'))
+# MyMemory 무료 할당량을 넘지 않도록 초당 요청 수 제한
+TRANSLATION_RATE = float(os.getenv('TRANSLATION_RATE', '2'))
+TRANSLATION_BURST = 4
+MAX_TRANSLATION_RETRIES = 3
+RETRY_BACKOFF = 1.0
+
+class TokenBucket:
+    """초당 rate개의 토큰을 채우는 스레드 안전 토큰 버킷"""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """토큰을 하나 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_translation_limiter = TokenBucket(TRANSLATION_RATE, TRANSLATION_BURST)
+
+# 번역 캐시 (main()에서 초기화)
+_translation_cache = None
+
+def init_translation_cache(db=None):
+    """번역 캐시 초기화 (TRANSLATION_CACHE_FIRESTORE=1 이면 Firestore 계층 사용)"""
+    global _translation_cache
+    use_firestore = os.getenv('TRANSLATION_CACHE_FIRESTORE') == '1'
+    _translation_cache = TranslationCache(
+        os.path.join(CACHE_DIR, 'translations.sqlite3'),
+        db=db if use_firestore else None
+    )
+    return _translation_cache
+
+def record_host_failure(host):
+    if _host_health is not None:
+        _host_health.record_failure(host)
+
+def _request_translation(text):
+    """번역 API 호출 (속도 제한 + 재시도), 실패 시 None"""
+    params = {
+        'q': text,
+        'langpair': 'en|ko'
+    }
+    
+    host = urlparse(TRANSLATION_API_URL).netloc
+    for attempt in range(MAX_TRANSLATION_RETRIES):
+        if attempt:
+            # 지터를 준 지수 백오프
+            time.sleep(backoff_delay(attempt, base=RETRY_BACKOFF))
+        
+        # 예산을 다 썼거나 번역 API가 계속 실패 중이면 번역 없이 저장 (다음 실행에서 다시 번역)
+        if budget_expired():
+            metrics.incr('translations_skipped_budget')
+            return None
+        if not host_allowed(TRANSLATION_API_URL):
+            metrics.incr('translations_skipped_circuit_open')
+            return None
+        
+        _translation_limiter.acquire()
+        metrics.incr('translation_api_calls')
+        timeout = request_timeout()
+        try:
+            response = http_get(TRANSLATION_API_URL, params=params, timeout=timeout)
+            if response.status_code == 429 or response.status_code >= 500:
+                logger.warning(f"번역 API 응답 {response.status_code}, 재시도 {attempt + 1}/{MAX_TRANSLATION_RETRIES}")
+                record_host_failure(host)
+                continue
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            if budget_timeout(e, timeout):
+                metrics.incr('translations_skipped_budget')
+                return None
+            logger.warning(f"번역 요청 오류: {e}, 재시도 {attempt + 1}/{MAX_TRANSLATION_RETRIES}")
+            record_host_failure(host)
+            continue
+        
+        status = int(data.get('responseStatus') or 0)
+        if status == 200:
+            if _host_health is not None:
+                _host_health.record_success(host)
+            return data['responseData']['translatedText']
+        if status == 429:
+            record_host_failure(host)
+            continue
+        
+        logger.warning(f"번역 실패: {data.get('responseDetails', 'Unknown error')}")
+        return None
+    
+    logger.error(f"번역 재시도 초과: {text[:50]}")
+    return None
+
+# 이전 실행에서 번역하지 못하고 저장한 문서를 실행마다 최대 이만큼 다시 번역
+RETRANSLATE_LIMIT = 20
+
+def retranslate_pending(store, skip_ids=()):
+    """번역 없이 저장된 문서를 다시 번역해서 문서/다이제스트/검색 색인에 반영하고 번역한 수 반환"""
+    translated = []
+    for doc_id, data in store.untranslated(RETRANSLATE_LIMIT + len(skip_ids)):
+        if doc_id in skip_ids:
+            continue
+        if budget_expired():
+            break
+        text = translate_to_korean(data['keyword'])
+        if text is None:
+            continue
+        data['translatedKeyword'] = text
+        store.set_translation(doc_id, text, week_id(data['createdAt']), data.get('category'))
+        translated.append((doc_id, data))
+    # 이미 색인된 문서는 번역 n-gram 포스팅만 더함 (문서 수는 그대로)
+    indexed = [(doc_id, data) for doc_id, data in translated if data.get('indexed')]
+    if indexed:
+        store.add_to_search_index(build_postings(indexed), 0)
+    return len(translated)
+
 # 번역 함수 추가
 def translate_to_korean(text):
-    """텍스트를 한국어로 번역"""
+    """텍스트를 한국어로 번역 (캐시 우선, 실패하면 None)"""
     try:
         # 텍스트가 너무 길면 자르기 (API 제한)
         if len(text) > 500:
             text = text[:500] + "..."
         
-        # MyMemory 무료 번역 API 사용
-        url = "https://api.mymemory.translated.net/get"
-        params = {
-            'q': text,
-            'langpair': 'en|ko'
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
+        if _translation_cache is not None:
+            cached = _translation_cache.get(text, 'en|ko')
+            if cached is not None:
+                metrics.incr('translation_cache_hits')
+                return cached
         
-        data = response.json()
+        # MyMemory 무료 번역 API 사용
+        translated = _request_translation(text)
+        if translated is None:
+            metrics.incr('translation_failures')
+            return None
         
-        if data.get('responseStatus') == 200:
-            translated = data['responseData']['translatedText']
-            logger.info(f"번역 완료: {text[:50]}... -> {translated[:50]}...")
-            return translated
-        else:
-            logger.warning(f"번역 실패: {data.get('responseDetails', 'Unknown error')}")
-            return text
+        logger.info(f"번역 완료: {text[:50]}... -> {translated[:50]}...")
+        if _translation_cache is not None:
+            _translation_cache.set(text, translated, 'en|ko')
+        return translated
             
     except Exception as e:
         logger.error(f"번역 오류: {e}")
-        return text
-    
-    # API 호출 제한을 위한 딜레이
-    time.sleep(0.5)
+        return None
 
 # 카테고리 매핑
 CATEGORY_MAPPING = {
@@ -300,218 +602,677 @@ CATEGORY_MAPPING = {
     'hackernews': '실습/코드'
 }
 
-def save_keyword_to_firestore(db, keyword, category, source, url=None, translated_keyword=None):
-    """키워드를 Firestore에 저장 (번역 포함)"""
-    try:
-        # 중복 체크 (원본 키워드 기준)
-        existing = db.collection('keywords').where('keyword', '==', keyword).limit(1).get()
-        if len(existing) > 0:
+# 소스별 제목 셀렉터 (모듈 로드 시 컴파일)
+SOURCE_SELECTORS = {
+    'huggingface': compile_selector(
+        f"//*[{tag_in('h3', 'h4', 'a')}][{class_contains('title', 'paper', 'link')}]"
+    ),
+    'paperswithcode': compile_selector("//a[contains(@href, '/paper/')]"),
+    'ainews': compile_selector(
+        f"//*[{tag_in('h1', 'h2', 'h3')}][{class_contains('title')}]"
+    ),
+}
+
+def keyword_doc_id(keyword):
+    """키워드 내용으로부터 결정적인 문서 ID 생성"""
+    normalized = ' '.join(keyword.split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:40]
+
+KEYWORD_INDEX_PATH = os.path.join(CACHE_DIR, 'keyword_index.txt')
+# 스냅샷 이후 다른 실행에서 저장된 문서를 놓치지 않기 위한 여유 시간
+INDEX_REFRESH_MARGIN = timedelta(hours=1)
+
+class KeywordIndex:
+    """저장된 키워드의 문서 ID 집합 (중복 체크를 메모리에서 처리)"""
+    
+    def __init__(self, path=KEYWORD_INDEX_PATH):
+        self.path = path
+        self.keys = set()
+        self.updated_at = None
+        self._lock = threading.Lock()
+    
+    def __contains__(self, keyword):
+        return keyword_doc_id(keyword) in self.keys
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def add(self, keyword):
+        with self._lock:
+            self.keys.add(keyword_doc_id(keyword))
+    
+    def _load_snapshot(self):
+        """정렬된 키 파일에서 인덱스 복원"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                header = f.readline().strip()
+                self.updated_at = datetime.fromisoformat(header.lstrip('# '))
+                self.keys = {line.strip() for line in f if line.strip()}
+            logger.info(f"키워드 인덱스 스냅샷 로드: {len(self.keys)}개 ({self.updated_at})")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"키워드 인덱스 스냅샷 로드 실패, 전체 조회로 대체: {e}")
+            self.keys = set()
+            self.updated_at = None
+            return False
+    
+    def refresh(self, store):
+        """저장소에서 마지막 갱신 이후의 키워드만 가져오기"""
+        since = self.updated_at - INDEX_REFRESH_MARGIN if self.updated_at else None
+        started = datetime.now()
+        added = 0
+        for keyword in store.keywords_since(since):
+            self.keys.add(keyword_doc_id(keyword))
+            added += 1
+        self.updated_at = started
+        logger.info(f"키워드 인덱스 갱신: {added}개 조회, 총 {len(self.keys)}개")
+    
+    def load(self, store):
+        """스냅샷 로드 후 그 이후 변경분만 저장소에서 보충"""
+        self._load_snapshot()
+        self.refresh(store)
+        return self
+    
+    def save(self):
+        """인덱스를 정렬된 키 파일로 저장"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(f"# {self.updated_at.isoformat()}\n")
+                for key in sorted(self.keys):
+                    f.write(key + '\n')
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"키워드 인덱스 저장 실패: {e}")
+
+# 제목 유사도로 묶은 스토리 인덱스 (보존 기간 동안 유지)
+STORY_INDEX_PATH = os.path.join(CACHE_DIR, 'stories.json')
+
+# 저장소에 한 번에 넘길 문서 수 (Firestore BulkWriter 배치 크기와 같게)
+WRITE_BATCH_SIZE = 20
+
+class KeywordBatchWriter:
+    """파이프라인에서 들어오는 키워드를 모아서 저장소에 배치 단위로 저장"""
+    
+    def __init__(self, store, index=None, stories=None, batch_size=WRITE_BATCH_SIZE):
+        self.store = store
+        self.index = index
+        self.stories = stories
+        self.batch_size = batch_size
+        self._story_links = {}
+        self._claimed = set()
+        self._written = {}
+        self._pending = []
+        self._created_ids = set()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.duplicates = 0
+        self.failed = 0
+        self._failed_ids = set()
+    
+    def claim(self, keyword):
+        """처음 보는 키워드면 True (저장된 키워드 + 이번 실행에서 수집한 키워드 기준)"""
+        if self.index is not None and keyword in self.index:
+            with self._lock:
+                self.duplicates += 1
+            metrics.incr('duplicates_skipped')
             logger.info(f"키워드 '{keyword}' 이미 존재함")
             return False
         
-        # 번역이 없으면 번역 시도
-        if not translated_keyword:
-            translated_keyword = translate_to_korean(keyword)
-        
-        # 새 키워드 저장
-        doc_data = {
-            'keyword': keyword,
-            'translatedKeyword': translated_keyword,
-            'category': category,
-            'source': source,
-            'url': url,
-            'createdAt': datetime.now(),
-            'isActive': True
-        }
+        doc_id = keyword_doc_id(keyword)
+        with self._lock:
+            if doc_id in self._claimed:
+                metrics.incr('duplicates_in_run')
+                logger.info(f"키워드 '{keyword}' 이번 실행에서 이미 수집됨")
+                return False
+            self._claimed.add(doc_id)
+            return True
+    
+    def merge_story(self, data):
+        """다른 소스에 비슷한 제목의 스토리가 있으면 그 스토리에 링크만 추가하고 True"""
+        if self.stories is None or data.get('links') is None:
+            return False
+        match = self.stories.match(data['keyword'])
+        # 같은 소스의 비슷한 제목은 다른 기사일 수 있으므로 정확히 같은 제목일 때만 중복 처리
+        if match is None or data['source'] in match[1]['sources']:
+            return False
         
-        db.collection('keywords').add(doc_data)
-        logger.info(f"새 키워드 저장: {keyword} ({translated_keyword}) [{category}]")
+        story_id, story = match
+        digest_id = week_id(datetime.fromtimestamp(story['createdAt']))
+        with self._lock:
+            pending = self._story_links.setdefault(
+                story_id, {'links': [], 'keywords': [], 'digest': digest_id, 'category': story['category']}
+            )
+            pending['links'].extend(data['links'])
+            pending['keywords'].append(data['keyword'])
+        self.stories.add_source(story_id, data['source'])
+        metrics.incr('near_duplicates')
+        logger.info(f"'{data['keyword']}' 을(를) 기존 스토리에 링크로 추가 ({', '.join(story['sources'])})")
         return True
+    
+    def register_story(self, data):
+        """새 제목 문서를 스토리 인덱스에 등록"""
+        if self.stories is not None and data.get('links') is not None:
+            self.stories.add(
+                keyword_doc_id(data['keyword']), data['keyword'], data['source'],
+                data['category'], data['createdAt'].timestamp(),
+            )
+    
+    def created_documents(self):
+        """이번 실행에서 새로 저장된 (문서 ID, 문서) 목록"""
+        return [(doc_id, self._written[doc_id]) for doc_id in self._created_ids]
+    
+    def write(self, data):
+        """키워드 문서 저장 요청 (batch_size개가 모이면 저장소로 전송)"""
+        doc_id = keyword_doc_id(data['keyword'])
+        with self._lock:
+            self._written[doc_id] = data
+            self._pending.append((doc_id, data))
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self._flush(batch)
+    
+    def _flush(self, batch):
+        try:
+            result = self.store.bulk_upsert(batch)
+        except Exception as e:
+            # 배치 전체를 실패로 기록해야 인덱스/증분 상태에 남지 않고 다음 실행에서 다시 저장됨
+            logger.error(f"일괄 저장 오류, {len(batch)}개를 실패로 처리: {e}")
+            result = WriteResult(set(), set(), {doc_id for doc_id, _ in batch})
+        with self._lock:
+            self.created += len(result.created)
+            self.duplicates += len(result.existing)
+            self.failed += len(result.failed)
+            self._created_ids.update(result.created)
+            self._failed_ids.update(result.failed)
+        metrics.incr('storage_writes', len(result.created))
+        metrics.incr('storage_write_conflicts', len(result.existing))
+        metrics.incr('storage_write_failures', len(result.failed))
+    
+    def close(self):
+        """남은 배치를 전송하고 결과 반영"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            with metrics.timer('write', 'flush'):
+                self._flush(batch)
         
-    except Exception as e:
-        logger.error(f"Firestore 저장 오류: {e}")
-        return False
+        # 저장에 실패한 키워드는 다음 실행에서 다시 시도하도록 인덱스에서 제외
+        if self.index is not None:
+            for doc_id, data in self._written.items():
+                if doc_id not in self._failed_ids:
+                    self.index.add(data['keyword'])
+        if self.stories is not None:
+            self.stories.discard(self._failed_ids)
+        self._flush_story_links()
+        
+        logger.info(
+            f"일괄 저장 완료: 신규 {self.created}개, 중복 {self.duplicates}개, 실패 {self.failed}개"
+        )
+        return self.created
+    
+    def _flush_story_links(self):
+        """모아 둔 스토리 링크를 저장소에 반영 (이번 실행에서 만든 스토리는 다이제스트에 링크째 들어감)"""
+        for story_id, pending in self._story_links.items():
+            if story_id in self._failed_ids:
+                continue
+            created_now = story_id in self._created_ids
+            if created_now:
+                self._written[story_id]['links'] = self._written[story_id]['links'] + pending['links']
+            try:
+                self.store.add_story_links(
+                    story_id, pending['links'], None if created_now else pending['digest'], pending['category']
+                )
+            except Exception as e:
+                logger.error(f"스토리 링크 저장 실패: {story_id} - {e}")
+                continue
+            metrics.incr('story_links_added', len(pending['links']))
+            # 합친 제목도 처리한 것으로 기록해서 같은 소스에서 다시 나와도 새 문서로 저장하지 않음
+            if self.index is not None:
+                for keyword in pending['keywords']:
+                    self.index.add(keyword)
+
+# 기본 AI 용어 목록 (AI_TERMS_FILE 환경변수로 교체 가능)
+AI_TERMS = [
+    'GPT-4o', 'GPT-4', 'Claude 3.5', 'Claude 3', 'Gemini 1.5', 'Gemini',
+    'LLaMA', 'Mixtral', 'Phi-3', 'DeepSeek', 'Qwen', 'Nous Hermes',
+    'OpenAI', 'Anthropic', 'Google DeepMind', 'Meta', 'Microsoft',
+    'BERT', 'T5', 'PaLM', 'Bard', 'ChatGPT', 'LLaVA',
+    'Transformer', 'CLIP', 'DALL-E', 'Midjourney', 'Stable Diffusion',
+    'RAG', 'LoRA', 'PEFT', 'Fine-tuning', 'Prompt Engineering',
+    'AGI', 'LLM', 'Neural Network', 'Deep Learning', 'Machine Learning',
+    'Computer Vision', 'Natural Language Processing', 'NLP',
+    'Reinforcement Learning', 'RLHF', 'Constitutional AI'
+]
+
+def load_ai_terms():
+    """AI 용어 목록 로드 (설정 파일이 없으면 기본 목록)"""
+    terms_file = os.getenv('AI_TERMS_FILE')
+    if terms_file:
+        try:
+            terms = load_terms(terms_file)
+            logger.info(f"AI 용어 목록 로드: {terms_file} ({len(terms)}개)")
+            return terms
+        except Exception as e:
+            logger.warning(f"AI 용어 파일 로드 실패, 기본 목록 사용: {e}")
+    return AI_TERMS
+
+# 모듈 로드 시 한 번만 컴파일
+_keyword_matcher = KeywordMatcher(load_ai_terms())
 
 def extract_ai_keywords(text):
     """텍스트에서 AI 관련 키워드 추출"""
-    ai_terms = [
-        'GPT-4o', 'GPT-4', 'Claude 3.5', 'Claude 3', 'Gemini 1.5', 'Gemini',
-        'LLaMA', 'Mixtral', 'Phi-3', 'DeepSeek', 'Qwen', 'Nous Hermes',
-        'OpenAI', 'Anthropic', 'Google DeepMind', 'Meta', 'Microsoft',
-        'BERT', 'T5', 'PaLM', 'Bard', 'ChatGPT', 'LLaVA',
-        'Transformer', 'CLIP', 'DALL-E', 'Midjourney', 'Stable Diffusion',
-        'RAG', 'LoRA', 'PEFT', 'Fine-tuning', 'Prompt Engineering',
-        'AGI', 'LLM', 'Neural Network', 'Deep Learning', 'Machine Learning',
-        'Computer Vision', 'Natural Language Processing', 'NLP',
-        'Reinforcement Learning', 'RLHF', 'Constitutional AI'
-    ]
-    
-    keywords = []
-    text_lower = text.lower()
-    
-    for term in ai_terms:
-        if term.lower() in text_lower:
-            # 정확한 매칭을 위해 단어 경계 확인
-            import re
-            pattern = r'\b' + re.escape(term.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                keywords.append(term)
-    
-    return list(set(keywords))  # 중복 제거
-
-def crawl_huggingface_papers(db):
-    """Hugging Face Papers 크롤링"""
-    try:
-        url = "https://huggingface.co/papers"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 논문 제목들 추출 (셀렉터는 실제 사이트 구조에 따라 조정 필요)
-        paper_elements = soup.find_all(['h3', 'h4', 'a'], class_=lambda x: x and any(
-            cls in str(x).lower() for cls in ['title', 'paper', 'link']
-        ))
+    return _keyword_matcher.find(text)
+
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 크롤링 소스 선언 (URL, 셀렉터, 카테고리, 개수 제한만 정의)
+SOURCES = [
+    {
+        'name': 'huggingface',
+        'label': 'Hugging Face',
+        'url': "https://huggingface.co/papers",
+        'selector': SOURCE_SELECTORS['huggingface'],
+        'category': CATEGORY_MAPPING['huggingface'],
+        'limit': 15,  # 최신 15개만
+        'keywords': 3,  # 제목 외에 추출 키워드 상위 3개도 저장
+        'exclude': 'paper',
+        'ordered': False,  # 인기순 정렬이라 이미 본 항목에서 멈추지 않고 건너뛰기만 함
+        'headers': BROWSER_HEADERS,
+    },
+    {
+        'name': 'paperswithcode',
+        'label': 'Papers with Code',
+        'url': "https://paperswithcode.com/latest",
+        'selector': SOURCE_SELECTORS['paperswithcode'],
+        'category': CATEGORY_MAPPING['paperswithcode'],
+        'limit': 15,
+        'headers': BROWSER_HEADERS,
+    },
+    {
+        'name': 'techcrunch',
+        'label': 'TechCrunch',
+        'url': "https://techcrunch.com/category/artificial-intelligence/feed/",
+        'type': 'rss',
+        'category': CATEGORY_MAPPING['techcrunch'],
+        'limit': 10,
+        'keywords': 2,
+        'min_length': 0,
+    },
+    {
+        'name': 'ainews',
+        'label': 'AI News',
+        'url': "https://www.artificialintelligence-news.com",
+        'selector': SOURCE_SELECTORS['ainews'],
+        'category': CATEGORY_MAPPING['ainews'],
+        'limit': 10,
+        'headers': BROWSER_HEADERS,
+    },
+]
+
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '64'))
+
+# 새 기사 미리보기 수집 (CRAWL_ENRICH=1 일 때만, 실행 마지막 단계에서 제한된 워커 풀로)
+ENRICH_ENABLED = os.getenv('CRAWL_ENRICH') == '1'
+ENRICH_WORKERS = int(os.getenv('ENRICH_WORKERS', '4'))
+ENRICH_TIMEOUT = 5
+PREVIEW_CACHE_PATH = os.path.join(CACHE_DIR, 'previews.json')
+
+def keyword_document(keyword, source, url=None, story=False):
+    """저장할 키워드 문서 (story=True 면 여러 소스 링크를 모으는 제목 문서)"""
+    data = {
+        'keyword': keyword,
+        'translatedKeyword': None,
+        'category': source['category'],
+        'source': source['name'],
+        'url': url,
+        'createdAt': datetime.now(),
+        'isActive': True
+    }
+    if story:
+        data['links'] = [{'source': source['name'], 'url': url}]
+    return data
+
+def fetch_source(source):
+    """소스 본문 가져오기 (소스별 타임아웃, 지터 백오프 재시도, 서킷 브레이커 반영)"""
+    url = source['url']
+    host = urlparse(url).netloc
+    limit = _host_health.source_timeout(source['name'], host, REQUEST_TIMEOUT) if _host_health else REQUEST_TIMEOUT
+    
+    for attempt in range(MAX_FETCH_ATTEMPTS):
+        if attempt:
+            delay = backoff_delay(attempt)
+            if _deadline is not None and delay >= _deadline.remaining():
+                break
+            metrics.incr('fetch_retries')
+            time.sleep(delay)
+        if budget_expired() or not host_allowed(url):
+            break
         
-        count = 0
-        for element in paper_elements[:15]:  # 최신 15개만
-            title = element.get_text().strip()
-            href = element.get('href', '')
-            
-            if len(title) > 10 and 'paper' not in title.lower():  # 의미있는 제목만
-                # AI 키워드 추출
-                ai_keywords = extract_ai_keywords(title)
-                if ai_keywords:
-                    # 제목 자체도 키워드로 추가
-                    save_keyword_to_firestore(db, title[:100], CATEGORY_MAPPING['huggingface'], 'huggingface', href)
-                    count += 1
-                    
-                    # 추출된 키워드들도 저장
-                    for keyword in ai_keywords[:3]:  # 상위 3개만
-                        save_keyword_to_firestore(db, keyword, CATEGORY_MAPPING['huggingface'], 'huggingface')
-        
-        logger.info(f"Hugging Face: {count}개 키워드 처리")
+        started = time.monotonic()
+        timeout = request_timeout(limit)
+        try:
+            content = fetch_page(
+                url, headers=source.get('headers'), timeout=timeout,
+                selector=source.get('selector'), limit=source['limit'],
+            )
+        except requests.RequestException as e:
+            status = getattr(e.response, 'status_code', None)
+            logger.warning(f"{source['label']} 가져오기 실패 ({attempt + 1}/{MAX_FETCH_ATTEMPTS}): {e}")
+            if budget_timeout(e, timeout, limit):
+                break
+            if _host_health is not None:
+                _host_health.record_failure(host)
+            # 4xx 는 다시 요청해도 같은 결과이므로 재시도하지 않음
+            if status is not None and 400 <= status < 500 and status != 429:
+                raise
+            continue
         
-    except Exception as e:
-        logger.error(f"Hugging Face 크롤링 오류: {e}")
+        if _host_health is not None:
+            _host_health.record_success(host)
+            _host_health.record_latency(source['name'], time.monotonic() - started)
+        return content
+    
+    raise TimeoutError(f"{source['label']}: 재시도/시간 예산 초과 또는 서킷 브레이커 열림")
 
-def crawl_papers_with_code(db):
-    """Papers with Code 크롤링"""
+def fetch_stage(source):
+    """fetch 단계: 소스 본문(셀렉터 소스는 스트리밍으로 파싱한 링크 목록) 가져오기 (변경이 없거나 건너뛴 소스는 출력 없음)"""
+    if budget_expired():
+        metrics.incr('sources_skipped_budget')
+        logger.warning(f"{source['label']}: 시간 예산 초과로 건너뜀")
+        return []
+    if not host_allowed(source['url']):
+        metrics.incr('sources_skipped_circuit_open')
+        logger.warning(f"{source['label']}: 서킷 브레이커가 열려 있어 건너뜀")
+        return []
+    
     try:
-        url = "https://paperswithcode.com/latest"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 논문 제목들 추출
-        paper_links = soup.find_all('a', href=lambda x: x and '/paper/' in str(x))
+        with metrics.timer('fetch', source['name']):
+            content = fetch_source(source)
+    except Exception as e:
+        metrics.incr('fetch_errors')
+        logger.error(f"{source['label']} 크롤링 오류: {e}")
+        return []
+    if content is None:
+        metrics.incr('sources_not_modified')
+        return []
+    return [(source, content)]
+
+# 이미 본 항목이 연속으로 이만큼 나오면 나머지는 지난 실행에서 처리한 것으로 보고 중단
+# (상단 고정 기사 하나 때문에 멈추지 않도록 1보다 크게)
+KNOWN_ITEMS_STOP = 3
+
+def rss_entries(content):
+    """RSS 항목의 (제목, 링크, 게시 시각 epoch 초)"""
+    for entry in feedparser.parse(content).entries:
+        published = entry.get('published_parsed') or entry.get('updated_parsed')
+        yield entry.get('title', ''), entry.get('link'), calendar.timegm(published) if published else None
+
+def parse_stage(job):
+    """parse 단계: 본문에서 새 (제목, 링크) 항목 추출 (지난 실행에서 본 항목에 도달하면 중단)"""
+    source, content = job
+    name = source['name']
+    incremental = _crawl_state is not None and not FORCE_RECRAWL
+    with metrics.timer('parse', name):
+        if source.get('type') == 'rss':
+            entries = rss_entries(content)
+        elif isinstance(content, list):
+            # fetch 단계에서 스트리밍으로 이미 추출한 (제목, 링크)
+            entries = ((title, url, None) for title, url in content)
+        else:
+            entries = ((title, url, None) for title, url in iter_links(content, source['selector']))
+        watermark = _crawl_state.watermark(name) if incremental else None
         
-        count = 0
-        for link in paper_links[:15]:
-            title = link.get_text().strip()
-            href = link.get('href', '')
+        items = []
+        known_in_row = 0
+        for position, (title, url, published) in enumerate(entries):
+            if position >= source['limit']:
+                break
+            title = title.strip()
+            key = item_key(url, title)
+            # 상대 경로 링크는 소스 URL 기준 절대 URL로 저장 (미리보기 수집/프론트엔드 링크용)
+            url = urljoin(source['url'], url) if url else None
             
-            if len(title) > 10:
-                ai_keywords = extract_ai_keywords(title)
-                if ai_keywords:
-                    save_keyword_to_firestore(db, title[:100], CATEGORY_MAPPING['paperswithcode'], 'paperswithcode', href)
-                    count += 1
-        
-        logger.info(f"Papers with Code: {count}개 키워드 처리")
+            if incremental:
+                # 게시 시각이 있으면 high-water mark 이전 항목에서 바로 중단 (피드는 최신순)
+                if published is not None and watermark is not None and published < watermark:
+                    metrics.incr('sources_stopped_early')
+                    break
+                if _crawl_state.is_known(name, key):
+                    metrics.incr('items_known')
+                    known_in_row += 1
+                    if source.get('ordered', True) and known_in_row >= KNOWN_ITEMS_STOP:
+                        metrics.incr('sources_stopped_early')
+                        break
+                    continue
+                known_in_row = 0
+            if _crawl_state is not None:
+                _crawl_state.record(name, key, published)
+            
+            if len(title) <= source.get('min_length', 10):  # 의미있는 제목만
+                continue
+            if source.get('exclude') and source['exclude'] in title.lower():
+                continue
+            items.append((source, title, url))
+    
+    metrics.incr('items_parsed', len(items))
+    return items
+
+def extract_stage(item):
+    """extract 단계: AI 키워드가 있는 제목과 추출 키워드를 문서로 변환"""
+    source, title, url = item
+    with metrics.timer('extract', source['name']):
+        ai_keywords = extract_ai_keywords(title)
+        if not ai_keywords:
+            return []
+        # 파싱 단계가 지난 실행에서 본 항목을 걸러내므로 같은 기사를 두 번 세지 않음 (강제 재크롤링은 제외)
+        if _term_counter is not None and not FORCE_RECRAWL:
+            _term_counter.add(ai_keywords)
         
-    except Exception as e:
-        logger.error(f"Papers with Code 크롤링 오류: {e}")
+        # 제목 자체도 키워드로 추가
+        docs = [(source, keyword_document(title[:100], source, url, story=True))]
+        for keyword in ai_keywords[:source.get('keywords', 0)]:
+            docs.append((source, keyword_document(keyword, source)))
+    return docs
+
+def translate_stage(job):
+    """translate 단계: 캐시/번역 API로 한국어 번역 채우기"""
+    source, data = job
+    with metrics.timer('translate', source['name']):
+        data['translatedKeyword'] = translate_to_korean(data['keyword'])
+    return [(source, data)]
+
+def run_pipeline(writer, sources=SOURCES):
+    """fetch -> parse -> extract -> dedup(정확/유사 제목) -> translate -> write 파이프라인 실행 ((소스별 처리 수, 단계 오류 수) 반환)"""
+    counts = {source['name']: 0 for source in sources}
+    counts_lock = threading.Lock()
+    
+    def dedup_stage(job):
+        source, data = job
+        # 다른 소스의 비슷한 제목은 번역/저장하지 않고 기존 스토리에 링크로 합침
+        if writer.merge_story(data) or not writer.claim(data['keyword']):
+            return
+        writer.register_story(data)
+        yield job
+    
+    def write_stage(job):
+        source, data = job
+        with metrics.timer('write', source['name']):
+            writer.write(data)
+        with counts_lock:
+            counts[source['name']] += 1
+    
+    pipeline = (
+        Pipeline(queue_size=PIPELINE_QUEUE_SIZE)
+        .stage('fetch', fetch_stage, workers=MAX_WORKERS)
+        .stage('parse', parse_stage)
+        .stage('extract', extract_stage)
+        .stage('dedup', dedup_stage)
+        .stage('translate', translate_stage, workers=TRANSLATION_WORKERS)
+        .stage('write', write_stage)
+    )
+    pipeline.run(sources)
+    
+    for source in sources:
+        logger.info(f"{source['label']}: {counts[source['name']]}개 키워드 처리")
+    metrics.incr('pipeline_errors', pipeline.errors)
+    return counts, pipeline.errors
+
+def fetch_preview(url):
+    """기사 페이지를 스트리밍으로 받아 <head> 까지만 읽고 (미리보기, 대표 URL) 반환 (건너뛰면 None)"""
+    if budget_expired() or not host_allowed(url):
+        return None
+    with http_get(url, headers=BROWSER_HEADERS, timeout=request_timeout(ENRICH_TIMEOUT), stream=True) as response:
+        metrics.incr('http_requests')
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '')
+        # PDF 같은 HTML이 아닌 링크는 메타데이터가 없으므로 본문을 읽지 않음
+        if 'html' not in content_type:
+            return {}, None
+        encoding = response.encoding if 'charset' in content_type.lower() else None
+        return read_preview(response.iter_content(PREVIEW_CHUNK_BYTES), encoding)
+
+def enrich_documents(store, documents):
+    """새 제목 문서에 기사 미리보기를 붙여 저장 (이미 반영된 다이제스트 항목에도 합침)"""
+    documents = list(documents)
+    cache = PreviewCache(PREVIEW_CACHE_PATH)
+    with metrics.timer('enrich'):
+        previews, fetched = enrich(documents, fetch_preview, cache, workers=ENRICH_WORKERS)
+    if previews:
+        digests = {
+            doc_id: (week_id(data['createdAt']), data.get('category'))
+            for doc_id, data in documents if doc_id in previews
+        }
+        store.set_previews(previews, digests)
+    metrics.incr('previews_fetched', fetched)
+    metrics.incr('previews_added', len(previews))
+    logger.info(f"기사 미리보기: {len(previews)}개 추가 (새로 가져온 페이지 {fetched}개)")
+    if not DRY_RUN:
+        cache.save()
+    return len(previews)
+
+# 실행 보고서/프로파일 출력 위치
+REPORT_PATH = os.getenv('CRAWLER_REPORT_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'run_report.json'))
+PROFILE_MODE = os.getenv('CRAWLER_PROFILE')
+
+def main(db=None, store=None):
+    """메인 크롤링 함수 (db 또는 store를 넘기면 해당 저장소 사용)"""
+    metrics.reset()
+    try:
+        with profiling(PROFILE_MODE, CACHE_DIR):
+            crawl(db, store)
+    finally:
+        metrics.write_json(REPORT_PATH)
+        metrics.write_step_summary()
 
-def crawl_techcrunch_ai(db):
-    """TechCrunch AI RSS 크롤링"""
+def crawl(db=None, store=None):
+    """크롤링 실행"""
+    logger.info("=== AI Weekly News 크롤링 시작 ===")
+    
     try:
-        rss_url = "https://techcrunch.com/category/artificial-intelligence/feed/"
-        feed = feedparser.parse(rss_url)
+        # 저장소 초기화 (Firestore 클라이언트를 직접 넘기면 Firestore 저장소로 감쌈)
+        owns_store = store is None
+        if store is None:
+            store = FirestoreStore(db) if db is not None else init_storage()
+        reads_before = store.reads
         
-        count = 0
-        for entry in feed.entries[:10]:
-            title = entry.title
-            link = entry.link
-            
-            # AI 관련 키워드 추출
-            ai_keywords = extract_ai_keywords(title)
-            if ai_keywords:
-                save_keyword_to_firestore(db, title[:100], CATEGORY_MAPPING['techcrunch'], 'techcrunch', link)
-                count += 1
-                
-                for keyword in ai_keywords[:2]:
-                    save_keyword_to_firestore(db, keyword, CATEGORY_MAPPING['techcrunch'], 'techcrunch')
+        # 가져오기/번역 시간 예산 시작
+        init_deadline()
+        init_host_health()
         
-        logger.info(f"TechCrunch: {count}개 키워드 처리")
+        # 기존 키워드 인덱스 로드 (중복 체크는 메모리에서)
+        index = KeywordIndex().load(store)
+        stories = StoryIndex(STORY_INDEX_PATH)
+        translation_cache = init_translation_cache(getattr(store, 'db', None))
+        http_cache = init_http_cache()
+        crawl_state = init_crawl_state()
+        term_counter = init_term_counter()
         
-    except Exception as e:
-        logger.error(f"TechCrunch 크롤링 오류: {e}")
-
-def crawl_ai_news(db):
-    """AI News 사이트 크롤링"""
-    try:
-        url = "https://www.artificialintelligence-news.com"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        # 각 사이트 크롤링 (단계별 파이프라인으로 가져오기/번역/저장을 겹쳐서 실행)
+        writer = KeywordBatchWriter(store, index=index, stories=stories)
+        _, pipeline_errors = run_pipeline(writer)
+        writer.close()
         
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        # 이번 주 다이제스트 문서에 새 키워드 반영
+        try:
+            update_weekly_digest(store, writer.created_documents(), set(CATEGORY_MAPPING.values()))
+        except Exception as e:
+            logger.error(f"주간 다이제스트 갱신 실패: {e}")
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # 검색 색인에 새 키워드 반영
+        try:
+            update_search_index(store, writer.created_documents())
+        except Exception as e:
+            logger.error(f"검색 색인 갱신 실패: {e}")
         
-        # 기사 제목들 추출
-        articles = soup.find_all(['h1', 'h2', 'h3'], class_=lambda x: x and 'title' in str(x).lower())
+        # 예산/장애로 번역 없이 저장된 이전 문서 다시 번역 (이번 실행에서 실패한 문서는 다음 실행에서)
+        try:
+            skip_ids = {doc_id for doc_id, _ in writer.created_documents()}
+            metrics.incr('translations_retried', retranslate_pending(store, skip_ids))
+        except Exception as e:
+            logger.error(f"미번역 키워드 재번역 실패: {e}")
         
-        count = 0
-        for article in articles[:10]:
-            title = article.get_text().strip()
-            
-            if len(title) > 10:
-                ai_keywords = extract_ai_keywords(title)
-                if ai_keywords:
-                    save_keyword_to_firestore(db, title[:100], CATEGORY_MAPPING['ainews'], 'ainews')
-                    count += 1
+        # 보존 기간이 지난 키워드를 주간 아카이브로 옮겨 hot 컬렉션을 작게 유지 (드라이런은 저장소를 바꾸지 않음)
+        if not DRY_RUN:
+            try:
+                archived, weeks = compact(store)
+                metrics.incr('archived_documents', archived)
+                if archived:
+                    logger.info(f"보존 기간 지난 키워드 {archived}개를 {weeks}개 주간 아카이브로 이동")
+            except Exception as e:
+                logger.error(f"아카이브 압축 실패: {e}")
         
-        logger.info(f"AI News: {count}개 키워드 처리")
+        translation_cache.close()
+        metrics.incr('translation_cache_misses', translation_cache.misses)
         
-    except Exception as e:
-        logger.error(f"AI News 크롤링 오류: {e}")
-
-def main():
-    """메인 크롤링 함수"""
-    logger.info("=== AI Weekly News 크롤링 시작 ===")
-    
-    try:
-        # Firestore 초기화
-        db = init_firestore()
+        # 드라이런은 다음 실행에 영향이 없도록 로컬 상태를 기록하지 않음
+        if DRY_RUN:
+            logger.info("드라이런: 인덱스/HTTP 캐시/증분 상태를 저장하지 않음")
+        else:
+            stories.save()
+            # 저장이 모두 성공하고 단계 오류도 없을 때만 인덱스/검증 헤더/증분 상태를 기록
+            # (중간에 잃은 항목이 있으면 다음 실행에서 다시 처리)
+            if writer.failed == 0 and pipeline_errors == 0:
+                index.save()
+                http_cache.commit()
+                crawl_state.commit()
+                # 카운트도 증분 상태와 함께 반영해야 다시 처리할 항목이 두 번 세어지지 않음
+                try:
+                    metrics.incr('term_mentions', term_counter.flush(store))
+                except Exception as e:
+                    logger.error(f"용어 카운터 갱신 실패: {e}")
         
-        # 각 사이트 크롤링
-        crawl_huggingface_papers(db)
-        crawl_papers_with_code(db)
-        crawl_techcrunch_ai(db)
-        crawl_ai_news(db)
+        # 새 기사의 og 미리보기 (선택, 다이제스트/색인/상태 기록이 모두 끝난 뒤 마지막 단계로 실행하고
+        # 이미 저장된 다이제스트 항목에 합침, 실패해도 크롤링 결과에는 영향 없음)
+        if ENRICH_ENABLED:
+            try:
+                enrich_documents(store, writer.created_documents())
+            except Exception as e:
+                logger.error(f"기사 미리보기 수집 실패: {e}")
         
-        # 크롤링 완료 로그
-        logger.info("=== 크롤링 완료 ===")
+        metrics.incr('storage_reads', store.reads - reads_before)
         
-        # 최근 일주일 키워드 개수 확인
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_keywords = db.collection('keywords').where('createdAt', '>=', week_ago).get()
-        logger.info(f"최근 일주일 총 키워드: {len(recent_keywords)}개")
+        # 크롤링 완료 로그 (별도 집계 쿼리 없이 카운터 사용)
+        logger.info("=== 크롤링 완료 ===")
+        logger.info(f"이번 실행 신규 키워드: {writer.created}개, 중복 {writer.duplicates}개")
+        if owns_store:
+            store.close()
         
     except Exception as e:
         logger.error(f"크롤링 중 오류 발생: {e}")
         raise
+    finally:
+        # 브레이커 상태는 실패한 실행에서도 다음 실행으로 넘김
+        if _host_health is not None:
+            _host_health.save()
+            metrics.set('circuitBreakers', _host_health.report())
+        close_sessions()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+크롤링 실행 지표 (단계별 타이머, 카운터, 선택적 프로파일링)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+STAGES = ['fetch', 'parse', 'extract', 'translate', 'write']
+
+class RunMetrics:
+    """한 번의 크롤링 실행 동안 모이는 타이머/카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._started = time.monotonic()
+            self.timers = {}
+            self.counters = {}
+            self.extra = {}
+
+    @contextmanager
+    def timer(self, stage, source=None):
+        """단계 실행 시간 누적 (소스별)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            key = (stage, source or 'all')
+            with self._lock:
+                seconds, calls = self.timers.get(key, (0.0, 0))
+                self.timers[key] = (seconds + elapsed, calls + 1)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name, value):
+        """카운터 외의 부가 정보 (프로파일 결과 등)"""
+        with self._lock:
+            self.extra[name] = value
+
+    def report(self):
+        """JSON으로 저장할 실행 보고서"""
+        with self._lock:
+            stages = {}
+            for (stage, source), (seconds, calls) in sorted(self.timers.items()):
+                stages.setdefault(stage, {})[source] = {'seconds': round(seconds, 4), 'calls': calls}
+            return {
+                'startedAt': self.started_at.isoformat(timespec='seconds'),
+                'durationSeconds': round(time.monotonic() - self._started, 3),
+                'stages': stages,
+                'counters': dict(sorted(self.counters.items())),
+                **self.extra,
+            }
+
+    def write_json(self, path):
+        report = self.report()
+        try:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            logger.info(f"실행 보고서 저장: {path}")
+        except Exception as e:
+            logger.warning(f"실행 보고서 저장 실패: {e}")
+        return report
+
+    def write_step_summary(self, path=None):
+        """GitHub Actions 작업 요약($GITHUB_STEP_SUMMARY)에 보고서 추가"""
+        path = path or os.getenv('GITHUB_STEP_SUMMARY')
+        if not path:
+            return
+        report = self.report()
+        sources = sorted({source for stage in report['stages'].values() for source in stage})
+
+        lines = ['## 크롤링 실행 보고서', '', f"총 소요 시간: {report['durationSeconds']}초", '']
+        lines.append('| 소스 | ' + ' | '.join(STAGES) + ' |')
+        lines.append('|---' * (len(STAGES) + 1) + '|')
+        for source in sources:
+            cells = [
+                f"{report['stages'].get(stage, {}).get(source, {}).get('seconds', 0):.2f}s"
+                for stage in STAGES
+            ]
+            lines.append(f"| {source} | " + ' | '.join(cells) + ' |')
+        lines += ['', '| 카운터 | 값 |', '|---|---|']
+        lines += [f"| {name} | {value} |" for name, value in report['counters'].items()]
+        lines += ['', '<details><summary>JSON</summary>', '', '```json',
+                  json.dumps(report, ensure_ascii=False, indent=2), '```', '</details>', '']
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines))
+        except Exception as e:
+            logger.warning(f"작업 요약 기록 실패: {e}")
+
+# 워커가 큐에서 다음 입력을 기다리는 시간
+_LOCK_WAIT = "<method 'acquire' of '_thread.lock' objects>"
+
+@contextmanager
+def profiling(mode, output_dir):
+    """CRAWLER_PROFILE=cprofile|tracemalloc 일 때 실행 전체를 프로파일링 (cProfile은 파이프라인 워커 스레드 포함)"""
+    if mode == 'cprofile':
+        import cProfile
+        import pstats
+
+        # cProfile은 켠 스레드만 보므로 실행 중에 시작하는 스레드마다 Profile을 따로 켜고 끝나면 합침
+        profiles = []
+        profiles_lock = threading.Lock()
+        original_run = threading.Thread.run
+
+        def profiled_run(thread):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # 3.12+ 에서는 프로파일러를 동시에 하나만 켤 수 있음 (메인 스레드 기준으로만 기록)
+                return original_run(thread)
+            try:
+                return original_run(thread)
+            finally:
+                profile.disable()
+                with profiles_lock:
+                    profiles.append(profile)
+
+        profiler = cProfile.Profile()
+        threading.Thread.run = profiled_run
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            threading.Thread.run = original_run
+            os.makedirs(output_dir, exist_ok=True)
+            path = os.path.join(output_dir, 'crawler.prof')
+            with profiles_lock:
+                top = pstats.Stats(profiler, *profiles)
+            top.dump_stats(path)
+            # 큐/join 대기는 누적 시간이 실행 전체와 같아지므로 자체 시간 기준으로 상위 함수를 고르고 락 대기는 뺌
+            busy = [(func, stat) for func, stat in top.stats.items() if func[2] != _LOCK_WAIT]
+            metrics.set('profile', {
+                'file': path,
+                'threads': len(profiles) + 1,
+                # 파이프라인 단계 함수별 누적 시간 (모든 워커 합계)
+                'stages': {
+                    func[2]: round(stat[3], 4)
+                    for func, stat in sorted(top.stats.items()) if func[2].endswith('_stage')
+                },
+                'top': [
+                    {
+                        'function': f"{func[0]}:{func[1]}({func[2]})",
+                        'selfSeconds': round(stat[2], 4),
+                        'cumulativeSeconds': round(stat[3], 4),
+                    }
+                    for func, stat in sorted(busy, key=lambda item: item[1][2], reverse=True)[:15]
+                ]
+            })
+    elif mode == 'tracemalloc':
+        import tracemalloc
+
+        tracemalloc.start(10)
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            metrics.set('memory', {
+                'currentKB': current // 1024,
+                'peakKB': peak // 1024,
+                'top': [
+                    {'location': str(stat.traceback[0]), 'sizeKB': stat.size // 1024}
+                    for stat in snapshot.statistics('lineno')[:15]
+                ]
+            })
+    else:
+        yield
+
+# 크롤러 전체에서 공유하는 지표
+metrics = RunMetrics()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+유계 큐로 연결된 단계별 스레드 파이프라인
+
+각 단계는 입력 하나를 받아 0개 이상의 출력을 내는 함수(제너레이터)이고,
+출력은 바로 다음 단계 큐로 넘어간다. 큐 크기가 제한되어 있어서
+뒤 단계가 느리면 앞 단계가 기다린다 (backpressure).
+"""
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+class Pipeline:
+    """fetch -> parse -> ... -> write 처럼 이어지는 스레드 파이프라인"""
+
+    def __init__(self, queue_size=64):
+        self.queue_size = queue_size
+        self.stages = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def stage(self, name, fn, workers=1):
+        """단계 추가 (fn(item)은 출력 iterable 또는 None 반환)"""
+        self.stages.append((name, fn, max(workers, 1)))
+        return self
+
+    def _run_stage(self, name, fn, inbox, outbox, remaining):
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                # 같은 단계의 다른 워커도 끝낼 수 있도록 다시 넣어 둠
+                inbox.put(_DONE)
+                break
+            try:
+                for output in fn(item) or ():
+                    if outbox is not None:
+                        outbox.put(output)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.error(f"파이프라인 {name} 단계 오류: {e}")
+
+        # 단계의 마지막 워커가 다음 단계에 종료를 알림
+        with self._lock:
+            remaining[name] -= 1
+            last = remaining[name] == 0
+        if last and outbox is not None:
+            outbox.put(_DONE)
+
+    def run(self, items):
+        """입력을 흘려보내고 모든 단계가 끝날 때까지 대기"""
+        started = time.monotonic()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining = {name: workers for name, _, workers in self.stages}
+        threads = []
+
+        for i, (name, fn, workers) in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(queues) else None
+            for n in range(workers):
+                thread = threading.Thread(
+                    target=self._run_stage,
+                    args=(name, fn, queues[i], outbox, remaining),
+                    name=f"{name}_{n}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        for item in items:
+            queues[0].put(item)
+        queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+        logger.info(f"파이프라인 완료: {time.monotonic() - started:.2f}초, 오류 {self.errors}건")
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+실행 시간 예산, 지터 백오프, 호스트별 서킷 브레이커
+
+브레이커 상태와 소스별 응답 시간 기록은 캐시 디렉터리에 저장해서 다음 실행에서도 이어 쓴다.
+계속 실패하는 사이트는 실행이 끝나도 열린 상태로 남아서 다음 실행에서는 요청하지 않고
+쿨다운이 지나면 짧은 타임아웃으로 한 번만 확인(half-open)한다.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class Deadline:
+    """실행 전체 시간 예산"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.started = time.monotonic()
+
+    def remaining(self):
+        return self.seconds - (time.monotonic() - self.started)
+
+    def expired(self, margin=0):
+        """남은 예산이 margin초 이하인지"""
+        return self.remaining() <= margin
+
+    def timeout(self, limit):
+        """남은 예산을 넘지 않는 요청 타임아웃"""
+        return max(min(limit, self.remaining()), 0)
+
+def backoff_delay(attempt, base=1.0, cap=8.0):
+    """attempt번째 재시도 전 대기 시간 (full jitter 지수 백오프)"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+# 연속 실패가 이만큼 쌓이면 브레이커를 연다
+FAILURE_THRESHOLD = 3
+# 처음 열릴 때의 쿨다운 (실패가 반복되면 두 배씩 늘려 MAX_COOLDOWN 까지)
+BASE_COOLDOWN = 6 * 3600
+MAX_COOLDOWN = 7 * 24 * 3600
+# 쿨다운이 끝난 호스트를 확인할 때의 짧은 타임아웃
+PROBE_TIMEOUT = 3
+# 소스별 타임아웃 = 평균 응답 시간 x 배수 (최소/최대 사이로)
+LATENCY_MULTIPLIER = 3
+MIN_TIMEOUT = 2
+LATENCY_SMOOTHING = 0.3
+
+class HostHealth:
+    """호스트별 서킷 브레이커 + 소스별 응답 시간 기록"""
+
+    def __init__(self, path, failure_threshold=FAILURE_THRESHOLD):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.hosts = {}
+        self.sources = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.hosts = state.get('hosts', {})
+            self.sources = state.get('sources', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"호스트 상태 로드 실패, 초기 상태로 시작: {e}")
+
+    def _host(self, host):
+        return self.hosts.setdefault(host, {'state': 'closed', 'failures': 0, 'openUntil': 0, 'cooldown': BASE_COOLDOWN})
+
+    def allow(self, host):
+        """요청해도 되는지 (열려 있으면 False, 쿨다운이 끝났으면 half-open 으로 전환)"""
+        with self._lock:
+            entry = self._host(host)
+            if entry['state'] == 'open':
+                if time.time() < entry['openUntil']:
+                    return False
+                entry['state'] = 'half_open'
+                logger.info(f"서킷 브레이커 확인 요청 허용: {host}")
+            return True
+
+    def is_probing(self, host):
+        with self._lock:
+            return self._host(host)['state'] == 'half_open'
+
+    def record_success(self, host):
+        with self._lock:
+            entry = self._host(host)
+            if entry['state'] != 'closed':
+                logger.info(f"서킷 브레이커 닫힘: {host}")
+            entry.update(state='closed', failures=0, openUntil=0, cooldown=BASE_COOLDOWN)
+
+    def record_failure(self, host):
+        """실패 기록, 브레이커가 열리면 True"""
+        with self._lock:
+            entry = self._host(host)
+            if entry['state'] == 'open':
+                return True
+            entry['failures'] += 1
+            if entry['state'] != 'half_open' and entry['failures'] < self.failure_threshold:
+                return False
+            # 확인 요청 실패는 바로 다시 열고, 다음 쿨다운은 두 배로
+            entry['state'] = 'open'
+            entry['openUntil'] = time.time() + entry['cooldown']
+            cooldown = entry['cooldown']
+            entry['cooldown'] = min(entry['cooldown'] * 2, MAX_COOLDOWN)
+        logger.warning(f"서킷 브레이커 열림: {host} ({cooldown // 3600}시간 동안 건너뜀)")
+        return True
+
+    def record_latency(self, source, seconds):
+        """소스 응답 시간의 지수 이동 평균 갱신"""
+        with self._lock:
+            entry = self.sources.setdefault(source, {})
+            previous = entry.get('latency')
+            entry['latency'] = seconds if previous is None else (
+                LATENCY_SMOOTHING * seconds + (1 - LATENCY_SMOOTHING) * previous
+            )
+
+    def source_timeout(self, source, host, limit):
+        """지난 실행의 응답 시간으로 정한 소스별 타임아웃 (기록이 없으면 limit)"""
+        if self.is_probing(host):
+            return min(PROBE_TIMEOUT, limit)
+        with self._lock:
+            latency = self.sources.get(source, {}).get('latency')
+        if latency is None:
+            return limit
+        return min(max(latency * LATENCY_MULTIPLIER, MIN_TIMEOUT), limit)
+
+    def report(self):
+        """닫혀 있지 않은 브레이커 목록 (실행 보고서용)"""
+        with self._lock:
+            return {host: dict(entry) for host, entry in self.hosts.items() if entry['state'] != 'closed'}
+
+    def save(self):
+        with self._lock:
+            state = {'hosts': self.hosts, 'sources': self.sources}
+            try:
+                if os.path.dirname(self.path):
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"호스트 상태 저장 실패: {e}")
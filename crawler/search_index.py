@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+키워드 검색용 역색인
+
+새로 저장된 키워드 문서의 영문 토큰과 한국어 번역(translatedKeyword)의 글자 바이그램을 색인어로 뽑아,
+색인어 앞 두 글자로 나눈 샤드 문서(search_index/<샤드>)에 포스팅을 merge 로 덧붙인다.
+포스팅은 문서 ID -> [날짜(YYYYMMDD), 카테고리, 가중치] 이고, 검색(functions/search.py)은
+질의어의 샤드만 읽어서 순위를 매긴 뒤 결과 페이지의 문서만 조회한다.
+색인 규칙(tokenize, hangul_ngrams, shard_id)은 functions/search.py 와 같아야 한다.
+색인 도입 전에 저장된 문서는 backfill_search_index.py 로 한 번 색인한다.
+"""
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_COLLECTION = 'search_index'
+# 전체 문서 수 (idf 계산용), 샤드 ID는 영문/숫자/한글로 시작하므로 겹치지 않음
+SEARCH_META_DOCUMENT = '_meta'
+SHARD_PREFIX_LENGTH = 2
+
+# 제목/키워드 토큰이 번역 n-gram 보다 더 정확한 근거이므로 가중치를 높게
+KEYWORD_WEIGHT = 2
+TRANSLATION_WEIGHT = 1
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-.][a-z0-9]+)*")
+_HANGUL_PATTERN = re.compile(r"[가-힣]+")
+STOPWORDS = frozenset(
+    'a an the and or of to in on for with by from at as is are be its it this that new how why what'.split()
+)
+
+def tokenize(text):
+    """영문/숫자 토큰 (소문자, 불용어 제거)"""
+    return {token for token in _TOKEN_PATTERN.findall((text or '').lower()) if token not in STOPWORDS}
+
+def hangul_ngrams(text):
+    """한글 단어의 글자 바이그램 (한 글자 단어는 그대로)"""
+    grams = set()
+    for word in _HANGUL_PATTERN.findall(text or ''):
+        if len(word) == 1:
+            grams.add(word)
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+def shard_id(token):
+    return token[:SHARD_PREFIX_LENGTH]
+
+def index_terms(data):
+    """문서의 색인어 -> 가중치"""
+    terms = {gram: TRANSLATION_WEIGHT for gram in hangul_ngrams(data.get('translatedKeyword'))}
+    for gram in hangul_ngrams(data.get('keyword')):
+        terms[gram] = KEYWORD_WEIGHT
+    for token in tokenize(data.get('keyword')):
+        terms[token] = KEYWORD_WEIGHT
+    return terms
+
+def build_postings(documents):
+    """(문서 ID, 문서) 목록 -> {샤드: {색인어: {문서 ID: [날짜, 카테고리, 가중치]}}}"""
+    shards = {}
+    for doc_id, data in documents:
+        created_at = data.get('createdAt')
+        day = int(created_at.strftime('%Y%m%d')) if created_at else 0
+        for term, weight in index_terms(data).items():
+            shards.setdefault(shard_id(term), {}).setdefault(term, {})[doc_id] = [day, data.get('category'), weight]
+    return shards
+
+def update_search_index(store, documents):
+    """새로 저장된 문서들을 검색 색인에 반영하고 갱신한 샤드 수 반환"""
+    documents = list(documents)
+    if not documents:
+        return 0
+    shards = build_postings(documents)
+    store.add_to_search_index(shards, len(documents))
+    # 색인된 문서만 아카이브로 옮길 때 색인에서 빼고 문서 수를 줄임
+    store.mark_indexed([doc_id for doc_id, _ in documents])
+    logger.info(f"검색 색인 갱신: 문서 {len(documents)}개, 샤드 {len(shards)}개")
+    return len(shards)
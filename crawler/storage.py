@@ -0,0 +1,732 @@
+# -*- coding: utf-8 -*-
+"""
+키워드 저장소 (Firestore / 로컬 SQLite)
+
+크롤러는 이 인터페이스만 사용하므로 서비스 계정 없이도 SQLite 로 오프라인 실행,
+로컬 벤치마크, 드라이런(CRAWL_DRY_RUN=1, 메모리 SQLite)을 할 수 있다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# 문서 ID가 이미 존재할 때 반환되는 gRPC 상태 코드
+ALREADY_EXISTS = 6
+MAX_WRITE_ATTEMPTS = 5
+# Firestore 배치 하나에 넣을 수 있는 최대 쓰기 수
+MAX_BATCH_WRITES = 500
+# Firestore 문서 최대 크기(1MiB)에서 다른 필드 몫을 뺀 아카이브 바이트 제한
+MAX_ARCHIVE_BYTES = 1000000
+
+# bulk_upsert 결과 (문서 ID 집합)
+WriteResult = namedtuple('WriteResult', ['created', 'existing', 'failed'])
+
+class KeywordStore(ABC):
+    """키워드 저장소 인터페이스 (구현이 빠진 메서드가 있으면 생성할 때 TypeError)
+
+    문서는 (문서 ID, 데이터) 쌍으로 주고받고, 데이터 필드는 Firestore 문서와 같다
+    (keyword, translatedKeyword, category, source, url, createdAt, isActive, 제목 문서는 links/preview,
+    검색 색인에 반영된 문서는 indexed).
+    """
+
+    name = None
+
+    @abstractmethod
+    def bulk_upsert(self, documents, overwrite=False):
+        """문서 일괄 저장 (overwrite=False 면 이미 있는 문서는 그대로 두고 existing 으로 반환)"""
+
+    @abstractmethod
+    def keywords_since(self, since=None):
+        """since 이후 저장된 키워드 문자열 (since가 없으면 전체)"""
+
+    @abstractmethod
+    def query(self, since=None, until=None, categories=None, limit=None, ascending=False):
+        """createdAt 범위/카테고리로 조회한 (문서 ID, 데이터) 목록 (기본 최신순, ascending=True 면 오래된 순)"""
+
+    @abstractmethod
+    def delete(self, doc_ids):
+        """키워드 문서 삭제"""
+
+    @abstractmethod
+    def add_to_digest(self, digest_id, week_start, sections):
+        """주간 다이제스트에 키워드 추가 (sections: 카테고리 -> {문서 ID: 항목})"""
+
+    @abstractmethod
+    def remove_from_digest(self, digest_id, entries):
+        """다이제스트에서 (카테고리, 문서 ID) 항목들을 빼고 개수를 줄임 (없는 항목은 무시, 뺀 항목 수 반환)"""
+
+    @abstractmethod
+    def add_story_links(self, doc_id, links, digest_id=None, category=None):
+        """스토리 문서의 links 에 소스 링크 추가 (digest_id가 있으면 다이제스트에 이미 있는 항목에도 반영)"""
+
+    @abstractmethod
+    def set_previews(self, previews, digests=None):
+        """문서 ID -> 기사 미리보기(og 메타데이터)를 문서의 preview 필드에 기록
+
+        digests(문서 ID -> (다이제스트 ID, 카테고리))가 있으면 다이제스트에 이미 있는 항목에도 반영한다.
+        """
+
+    @abstractmethod
+    def untranslated(self, limit):
+        """번역 없이 저장된 문서 (최근 것부터 limit개)"""
+
+    @abstractmethod
+    def set_translation(self, doc_id, translated, digest_id=None, category=None):
+        """문서의 번역 기록 (digest_id가 있으면 다이제스트에 이미 있는 항목에도 반영)"""
+
+    @abstractmethod
+    def add_term_counts(self, day, counts):
+        """날짜별 용어 카운터에 더하기 (day: 'YYYY-MM-DD', counts: 용어 -> 언급 수)"""
+
+    @abstractmethod
+    def term_counts(self, days):
+        """날짜별 용어 카운터 ({날짜: {용어: 언급 수}}, 카운터가 없는 날짜는 빠짐)"""
+
+    @abstractmethod
+    def add_to_search_index(self, shards, documents):
+        """검색 색인 샤드에 포스팅 추가 (shards: 샤드 -> {색인어: {문서 ID: 포스팅}}, documents: 새 문서 수)"""
+
+    @abstractmethod
+    def mark_indexed(self, doc_ids):
+        """검색 색인에 반영한 문서에 indexed 표시 (아카이브로 옮길 때 이 문서만 색인에서 뺌)"""
+
+    @abstractmethod
+    def remove_from_search_index(self, shards, documents):
+        """검색 색인에서 포스팅 제거 (add_to_search_index 와 같은 형식)"""
+
+    @abstractmethod
+    def write_archive(self, digest_id, week_start, payload, count):
+        """주간 아카이브 저장 (payload: gzip JSON 바이트, 같은 주는 덮어씀)"""
+
+    @abstractmethod
+    def load_archive(self, digest_id):
+        """주간 아카이브 바이트 (없으면 None)"""
+
+    def close(self):
+        pass
+
+class FirestoreStore(KeywordStore):
+    """Firestore 저장소 (BulkWriter 로 일괄 저장, merge 로 다이제스트 갱신)"""
+
+    name = 'firestore'
+
+    def __init__(self, db, collection='keywords', digest_collection='digests', trends_collection='term_counts',
+                 search_collection='search_index', archive_collection='keyword_archives'):
+        self.db = db
+        self.collection = db.collection(collection)
+        self.digests = db.collection(digest_collection)
+        self.trends = db.collection(trends_collection)
+        self.search_index = db.collection(search_collection)
+        self.archives = db.collection(archive_collection)
+        self.reads = 0
+
+    def bulk_upsert(self, documents, overwrite=False):
+        created, existing, failed = set(), set(), set()
+        lock = threading.Lock()
+
+        def on_result(reference, result, bulk_writer):
+            with lock:
+                created.add(reference.id)
+
+        def on_error(error, bulk_writer):
+            # 이미 저장된 문서는 재시도하지 않음
+            with lock:
+                if error.code == ALREADY_EXISTS:
+                    existing.add(error.operation.reference.id)
+                    return False
+                if error.attempts < MAX_WRITE_ATTEMPTS:
+                    return True
+                failed.add(error.operation.reference.id)
+            logger.error(f"Firestore 저장 오류: {error.operation.reference.id} - {error.message}")
+            return False
+
+        bulk_writer = self.db.bulk_writer()
+        bulk_writer.on_write_result(on_result)
+        bulk_writer.on_write_error(on_error)
+        for doc_id, data in documents:
+            reference = self.collection.document(doc_id)
+            if overwrite:
+                bulk_writer.set(reference, data)
+            else:
+                bulk_writer.create(reference, data)
+        bulk_writer.close()
+        return WriteResult(created, existing, failed)
+
+    def delete(self, doc_ids):
+        doc_ids = list(doc_ids)
+        for start in range(0, len(doc_ids), MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for doc_id in doc_ids[start:start + MAX_BATCH_WRITES]:
+                batch.delete(self.collection.document(doc_id))
+            batch.commit()
+
+    def keywords_since(self, since=None):
+        query = self.collection.select(['keyword'])
+        if since is not None:
+            query = query.where('createdAt', '>=', since)
+        count = 0
+        for doc in query.stream():
+            count += 1
+            keyword = doc.get('keyword')
+            if keyword:
+                yield keyword
+        # 결과가 없어도 쿼리 1회는 읽기 1건으로 과금됨
+        self.reads += max(count, 1)
+
+    def query(self, since=None, until=None, categories=None, limit=None, ascending=False):
+        query = self.collection
+        if since is not None:
+            query = query.where('createdAt', '>=', since)
+        if until is not None:
+            query = query.where('createdAt', '<', until)
+        if categories:
+            query = query.where('category', 'in', list(categories))
+        query = query.order_by('createdAt', direction='ASCENDING' if ascending else 'DESCENDING')
+        if limit is not None:
+            query = query.limit(limit)
+        results = [(doc.id, doc.to_dict()) for doc in query.stream()]
+        self.reads += max(len(results), 1)
+        return results
+
+    def add_to_digest(self, digest_id, week_start, sections):
+        from google.cloud import firestore
+
+        # 빈 맵은 merge 시 기존 값을 덮어쓰므로 키워드가 있는 카테고리에만 넣음
+        categories = {}
+        for category, keywords in sections.items():
+            categories[category] = {'count': firestore.Increment(len(keywords))}
+            if keywords:
+                categories[category]['keywords'] = keywords
+
+        # merge + Increment 로 기존 키워드를 다시 읽지 않고 덧붙임 (주의 첫 실행이면 문서가 새로 생성됨)
+        self.digests.document(digest_id).set({
+            'weekId': digest_id,
+            'weekStart': week_start,
+            'updatedAt': datetime.now(),
+            'count': firestore.Increment(sum(len(keywords) for keywords in sections.values())),
+            'categories': categories,
+        }, merge=True)
+
+    def _update_digest_entries(self, digest_id, changes):
+        """다이제스트에 이미 있는 항목만 갱신 ({(카테고리, 문서 ID): {필드: 값}}, 갱신한 항목 수 반환)
+
+        set(merge=True) 나 없는 경로로의 update 는 빈 다이제스트나 keyword 없는 항목을 만들므로
+        SQLite 처럼 항목 경로를 먼저 읽어서 있는 항목에만 쓴다.
+        """
+        from google.cloud.firestore_v1.field_path import FieldPath
+
+        reference = self.digests.document(digest_id)
+        existing = self._existing_digest_entries(reference, changes)
+        updates = {}
+        for key, path in existing.items():
+            for field, value in changes[key].items():
+                updates[FieldPath(*path.parts, field).to_api_repr()] = value
+        return len(existing) if self._update_digest(reference, updates) else 0
+
+    def _existing_digest_entries(self, reference, keys):
+        """다이제스트에 있는 (카테고리, 문서 ID) 항목 -> 항목 FieldPath (항목 경로만 읽음)"""
+        from google.cloud.firestore_v1.field_path import FieldPath
+
+        # 카테고리 이름에 '/' 나 공백이 있으므로 경로는 FieldPath 로 인용
+        paths = {key: FieldPath('categories', key[0], 'keywords', key[1]) for key in keys}
+        if not paths:
+            return {}
+        snapshot = reference.get(field_paths=[path.to_api_repr() for path in paths.values()])
+        self.reads += 1
+        if not snapshot.exists:
+            return {}
+        existing = {}
+        for key, path in paths.items():
+            try:
+                entry = snapshot.get(path.to_api_repr())
+            except KeyError:
+                entry = None
+            if entry is not None:
+                existing[key] = path
+        return existing
+
+    def _update_digest(self, reference, updates):
+        """다이제스트 update (그사이 문서가 지워졌으면 False)"""
+        from google.api_core.exceptions import NotFound
+
+        if not updates:
+            return False
+        try:
+            reference.update(updates)
+        except NotFound:
+            return False
+        return True
+
+    def remove_from_digest(self, digest_id, entries):
+        from google.cloud import firestore
+        from google.cloud.firestore_v1.field_path import FieldPath
+
+        reference = self.digests.document(digest_id)
+        existing = self._existing_digest_entries(reference, set(entries))
+        updates = {path.to_api_repr(): firestore.DELETE_FIELD for path in existing.values()}
+        removed = {}
+        for category, _ in existing:
+            removed[category] = removed.get(category, 0) + 1
+        for category, count in removed.items():
+            updates[FieldPath('categories', category, 'count').to_api_repr()] = firestore.Increment(-count)
+        if existing:
+            updates['count'] = firestore.Increment(-len(existing))
+        return len(existing) if self._update_digest(reference, updates) else 0
+
+    def add_story_links(self, doc_id, links, digest_id=None, category=None):
+        from google.cloud import firestore
+
+        self.collection.document(doc_id).update({'links': firestore.ArrayUnion(links)})
+        if digest_id is not None:
+            self._update_digest_entries(digest_id, {(category, doc_id): {'links': firestore.ArrayUnion(links)}})
+
+    def untranslated(self, limit):
+        # 정렬한 뒤에 limit 해야 최근 문서가 나옴 (translatedKeyword + createdAt 복합 색인, firestore.indexes.json)
+        query = (self.collection.where('translatedKeyword', '==', None)
+                 .order_by('createdAt', direction='DESCENDING').limit(limit))
+        results = [(doc.id, doc.to_dict()) for doc in query.stream()]
+        self.reads += max(len(results), 1)
+        return results
+
+    def set_translation(self, doc_id, translated, digest_id=None, category=None):
+        self.collection.document(doc_id).update({'translatedKeyword': translated})
+        if digest_id is not None:
+            self._update_digest_entries(digest_id, {(category, doc_id): {'translatedKeyword': translated}})
+
+    def set_previews(self, previews, digests=None):
+        items = list(previews.items())
+        for start in range(0, len(items), MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for doc_id, preview in items[start:start + MAX_BATCH_WRITES]:
+                batch.update(self.collection.document(doc_id), {'preview': preview})
+            batch.commit()
+        # 다이제스트마다 항목 경로를 한 번 읽고 한 번 update
+        changes = {}
+        for doc_id, (digest_id, category) in (digests or {}).items():
+            if doc_id in previews:
+                changes.setdefault(digest_id, {})[(category, doc_id)] = {'preview': previews[doc_id]}
+        for digest_id, entries in changes.items():
+            self._update_digest_entries(digest_id, entries)
+
+    def add_term_counts(self, day, counts):
+        from google.cloud import firestore
+
+        # 날짜별 문서 하나에 용어 맵을 두고 Increment 로 더함 (읽기 없이 한 번의 쓰기)
+        self.trends.document(day).set({
+            'day': day,
+            'updatedAt': datetime.now(),
+            'total': firestore.Increment(sum(counts.values())),
+            'terms': {term: firestore.Increment(count) for term, count in counts.items()},
+        }, merge=True)
+
+    def term_counts(self, days):
+        references = [self.trends.document(day) for day in days]
+        if not references:
+            return {}
+        snapshots = self.db.get_all(references, field_paths=['terms'])
+        self.reads += len(references)
+        return {snapshot.id: snapshot.get('terms') or {} for snapshot in snapshots if snapshot.exists}
+
+    def add_to_search_index(self, shards, documents):
+        from google.cloud import firestore
+
+        # 샤드마다 merge 한 번 (기존 포스팅을 읽지 않고 문서 ID 단위로 덧붙임)
+        self._merge_search_shards(shards, firestore.Increment(documents))
+
+    def mark_indexed(self, doc_ids):
+        doc_ids = list(doc_ids)
+        for start in range(0, len(doc_ids), MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for doc_id in doc_ids[start:start + MAX_BATCH_WRITES]:
+                batch.update(self.collection.document(doc_id), {'indexed': True})
+            batch.commit()
+
+    def remove_from_search_index(self, shards, documents):
+        from google.cloud import firestore
+
+        removed = {
+            shard: {term: {doc_id: firestore.DELETE_FIELD for doc_id in docs} for term, docs in postings.items()}
+            for shard, postings in shards.items()
+        }
+        self._merge_search_shards(removed, firestore.Increment(-documents))
+
+    def _merge_search_shards(self, shards, documents):
+        writes = [(self.search_index.document(shard), {'tokens': postings}) for shard, postings in shards.items()]
+        writes.append((self.search_index.document('_meta'), {'documents': documents, 'updatedAt': datetime.now()}))
+        for start in range(0, len(writes), MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for reference, data in writes[start:start + MAX_BATCH_WRITES]:
+                batch.set(reference, data, merge=True)
+            batch.commit()
+
+    def write_archive(self, digest_id, week_start, payload, count):
+        if len(payload) > MAX_ARCHIVE_BYTES:
+            raise ValueError(f"아카이브가 문서 크기 제한을 넘음: {digest_id} ({len(payload)}바이트)")
+        self.archives.document(digest_id).set({
+            'weekId': digest_id,
+            'weekStart': week_start,
+            'count': count,
+            'bytes': len(payload),
+            'data': payload,
+            'updatedAt': datetime.now(),
+        })
+
+    def load_archive(self, digest_id):
+        snapshot = self.archives.document(digest_id).get()
+        self.reads += 1
+        return snapshot.get('data') if snapshot.exists else None
+
+# SQLite 컬럼 <-> 문서 필드
+_COLUMNS = [
+    ('keyword', 'keyword'),
+    ('translated_keyword', 'translatedKeyword'),
+    ('category', 'category'),
+    ('source', 'source'),
+    ('url', 'url'),
+    ('created_at', 'createdAt'),
+    ('is_active', 'isActive'),
+    ('links', 'links'),
+    ('preview', 'preview'),
+    ('indexed', 'indexed'),
+]
+# JSON 문자열로 저장하는 필드 (값이 없으면 문서에서 생략)
+_JSON_FIELDS = ('links', 'preview')
+
+def _union(existing, links):
+    """ArrayUnion 과 같이 없는 링크만 뒤에 추가"""
+    return existing + [link for link in links if link not in existing]
+
+class SQLiteStore(KeywordStore):
+    """로컬 SQLite 저장소 (path=':memory:' 이면 드라이런용 메모리 DB, 아카이브는 archive_dir 의 파일)"""
+
+    name = 'sqlite'
+
+    def __init__(self, path, archive_dir=None):
+        self.path = path
+        if archive_dir is None and path != ':memory:':
+            archive_dir = os.path.join(os.path.dirname(path), 'archives')
+        self.archive_dir = archive_dir
+        self.reads = 0
+        self._lock = threading.Lock()
+
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS keywords (
+                id TEXT PRIMARY KEY,
+                keyword TEXT NOT NULL,
+                translated_keyword TEXT,
+                category TEXT,
+                source TEXT,
+                url TEXT,
+                created_at REAL NOT NULL,
+                is_active INTEGER NOT NULL DEFAULT 1,
+                links TEXT,
+                preview TEXT,
+                indexed INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_keywords_created ON keywords (created_at);
+            CREATE INDEX IF NOT EXISTS idx_keywords_category_created ON keywords (category, created_at);
+            CREATE TABLE IF NOT EXISTS term_counts (
+                day TEXT NOT NULL,
+                term TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (day, term)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS search_postings (
+                term TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                category TEXT,
+                weight INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS digests (
+                id TEXT PRIMARY KEY,
+                week_start REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );"""
+        )
+        # links/preview 컬럼이 없던 이전 버전 DB
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(keywords)")}
+        for column in _JSON_FIELDS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE keywords ADD COLUMN {column} TEXT")
+        if 'indexed' not in existing:
+            self._conn.execute("ALTER TABLE keywords ADD COLUMN indexed INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    @staticmethod
+    def _row(data):
+        row = [data.get(field) for _, field in _COLUMNS]
+        row[5] = (data.get('createdAt') or datetime.now()).timestamp()
+        row[6] = 1 if data.get('isActive', True) else 0
+        row[7] = json.dumps(data['links'], ensure_ascii=False) if data.get('links') is not None else None
+        row[8] = json.dumps(data['preview'], ensure_ascii=False) if data.get('preview') is not None else None
+        row[9] = 1 if data.get('indexed') else 0
+        return row
+
+    @staticmethod
+    def _document(row):
+        data = dict(zip([field for _, field in _COLUMNS], row[1:]))
+        data['createdAt'] = datetime.fromtimestamp(data['createdAt'])
+        data['isActive'] = bool(data['isActive'])
+        for field in _JSON_FIELDS:
+            if data[field] is None:
+                del data[field]
+            else:
+                data[field] = json.loads(data[field])
+        # Firestore 처럼 색인된 문서에만 indexed 필드가 있음
+        if data['indexed']:
+            data['indexed'] = True
+        else:
+            del data['indexed']
+        return row[0], data
+
+    def bulk_upsert(self, documents, overwrite=False):
+        documents = list(documents)
+        columns = ', '.join(['id'] + [column for column, _ in _COLUMNS])
+        placeholders = ', '.join('?' * (len(_COLUMNS) + 1))
+        with self._lock, self._conn:
+            existing = self._exists([doc_id for doc_id, _ in documents])
+            rows = [
+                [doc_id] + self._row(data) for doc_id, data in documents
+                if overwrite or doc_id not in existing
+            ]
+            verb = 'INSERT OR REPLACE' if overwrite else 'INSERT OR IGNORE'
+            self._conn.executemany(f"{verb} INTO keywords ({columns}) VALUES ({placeholders})", rows)
+        created = {row[0] for row in rows} - (set() if overwrite else existing)
+        return WriteResult(created, set() if overwrite else existing, set())
+
+    def _exists(self, doc_ids):
+        found = set()
+        # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start:start + 500]
+            found.update(row[0] for row in self._conn.execute(
+                f"SELECT id FROM keywords WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return found
+
+    def delete(self, doc_ids):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM keywords WHERE id = ?", [(doc_id,) for doc_id in doc_ids])
+
+    def keywords_since(self, since=None):
+        with self._lock:
+            if since is None:
+                rows = self._conn.execute("SELECT keyword FROM keywords").fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT keyword FROM keywords WHERE created_at >= ?", (since.timestamp(),)
+                ).fetchall()
+        self.reads += len(rows)
+        return [row[0] for row in rows]
+
+    def query(self, since=None, until=None, categories=None, limit=None, ascending=False):
+        conditions, params = [], []
+        if since is not None:
+            conditions.append('created_at >= ?')
+            params.append(since.timestamp())
+        if until is not None:
+            conditions.append('created_at < ?')
+            params.append(until.timestamp())
+        if categories:
+            conditions.append(f"category IN ({', '.join('?' * len(categories))})")
+            params.extend(categories)
+        sql = f"SELECT id, {', '.join(column for column, _ in _COLUMNS)} FROM keywords"
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY created_at ' + ('ASC' if ascending else 'DESC')
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        self.reads += len(rows)
+        return [self._document(row) for row in rows]
+
+    def add_to_digest(self, digest_id, week_start, sections):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT data FROM digests WHERE id = ?", (digest_id,)).fetchone()
+            digest = json.loads(row[0]) if row else {'weekId': digest_id, 'count': 0, 'categories': {}}
+            for category, keywords in sections.items():
+                section = digest['categories'].setdefault(category, {'count': 0, 'keywords': {}})
+                section['count'] += len(keywords)
+                section['keywords'].update(keywords)
+                digest['count'] += len(keywords)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO digests (id, week_start, updated_at, data) VALUES (?, ?, ?, ?)",
+                (digest_id, week_start.timestamp(), datetime.now().timestamp(),
+                 json.dumps(digest, ensure_ascii=False, default=str))
+            )
+
+    def remove_from_digest(self, digest_id, entries):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT data FROM digests WHERE id = ?", (digest_id,)).fetchone()
+            if row is None:
+                return 0
+            digest = json.loads(row[0])
+            removed = 0
+            for category, doc_id in set(entries):
+                section = digest['categories'].get(category)
+                if section is not None and section.get('keywords', {}).pop(doc_id, None) is not None:
+                    section['count'] -= 1
+                    digest['count'] -= 1
+                    removed += 1
+            if removed:
+                self._conn.execute(
+                    "UPDATE digests SET data = ? WHERE id = ?", (json.dumps(digest, ensure_ascii=False), digest_id)
+                )
+            return removed
+
+    def add_story_links(self, doc_id, links, digest_id=None, category=None):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT links FROM keywords WHERE id = ?", (doc_id,)).fetchone()
+            if row is None:
+                raise KeyError(doc_id)
+            merged = _union(json.loads(row[0] or '[]'), links)
+            self._conn.execute(
+                "UPDATE keywords SET links = ? WHERE id = ?", (json.dumps(merged, ensure_ascii=False), doc_id)
+            )
+            if digest_id is None:
+                return
+            row = self._conn.execute("SELECT data FROM digests WHERE id = ?", (digest_id,)).fetchone()
+            if row is None:
+                return
+            digest = json.loads(row[0])
+            entry = digest['categories'].get(category, {}).get('keywords', {}).get(doc_id)
+            if entry is not None:
+                entry['links'] = _union(entry.get('links') or [], links)
+                self._conn.execute(
+                    "UPDATE digests SET data = ? WHERE id = ?", (json.dumps(digest, ensure_ascii=False), digest_id)
+                )
+
+    def untranslated(self, limit):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(column for column, _ in _COLUMNS)} FROM keywords "
+                "WHERE translated_keyword IS NULL ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        self.reads += len(rows)
+        return [self._document(row) for row in rows]
+
+    def set_translation(self, doc_id, translated, digest_id=None, category=None):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE keywords SET translated_keyword = ? WHERE id = ?", (translated, doc_id))
+            if digest_id is None:
+                return
+            row = self._conn.execute("SELECT data FROM digests WHERE id = ?", (digest_id,)).fetchone()
+            if row is None:
+                return
+            digest = json.loads(row[0])
+            entry = digest['categories'].get(category, {}).get('keywords', {}).get(doc_id)
+            if entry is not None:
+                entry['translatedKeyword'] = translated
+                self._conn.execute(
+                    "UPDATE digests SET data = ? WHERE id = ?", (json.dumps(digest, ensure_ascii=False), digest_id)
+                )
+
+    def set_previews(self, previews, digests=None):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE keywords SET preview = ? WHERE id = ?",
+                [(json.dumps(preview, ensure_ascii=False), doc_id) for doc_id, preview in previews.items()]
+            )
+            changes = {}
+            for doc_id, (digest_id, category) in (digests or {}).items():
+                if doc_id in previews:
+                    changes.setdefault(digest_id, []).append((category, doc_id))
+            for digest_id, entries in changes.items():
+                row = self._conn.execute("SELECT data FROM digests WHERE id = ?", (digest_id,)).fetchone()
+                if row is None:
+                    continue
+                digest = json.loads(row[0])
+                for category, doc_id in entries:
+                    entry = digest['categories'].get(category, {}).get('keywords', {}).get(doc_id)
+                    if entry is not None:
+                        entry['preview'] = previews[doc_id]
+                self._conn.execute(
+                    "UPDATE digests SET data = ? WHERE id = ?", (json.dumps(digest, ensure_ascii=False), digest_id)
+                )
+
+    def add_term_counts(self, day, counts):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO term_counts (day, term, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (day, term) DO UPDATE SET count = count + excluded.count",
+                [(day, term, count) for term, count in counts.items()]
+            )
+
+    def term_counts(self, days):
+        days = list(days)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT day, term, count FROM term_counts WHERE day IN ({', '.join('?' * len(days))})", days
+            ).fetchall() if days else []
+        self.reads += len(rows)
+        result = {}
+        for day, term, count in rows:
+            result.setdefault(day, {})[term] = count
+        return result
+
+    def add_to_search_index(self, shards, documents):
+        # 로컬 색인은 샤드 대신 (색인어, 문서 ID) 기본 키로 접두사 범위 조회가 가능한 테이블 하나에 둠
+        rows = [
+            (term, doc_id, *posting)
+            for postings in shards.values()
+            for term, docs in postings.items()
+            for doc_id, posting in docs.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO search_postings (term, doc_id, day, category, weight) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def mark_indexed(self, doc_ids):
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE keywords SET indexed = 1 WHERE id = ?", [(doc_id,) for doc_id in doc_ids])
+
+    def remove_from_search_index(self, shards, documents):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM search_postings WHERE term = ? AND doc_id = ?",
+                [(term, doc_id) for postings in shards.values() for term, docs in postings.items() for doc_id in docs]
+            )
+
+    def _archive_path(self, digest_id):
+        if self.archive_dir is None:
+            raise ValueError("메모리 저장소에는 아카이브 디렉터리가 없음")
+        return os.path.join(self.archive_dir, f"{digest_id}.json.gz")
+
+    def write_archive(self, digest_id, week_start, payload, count):
+        path = self._archive_path(digest_id)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def load_archive(self, digest_id):
+        try:
+            with open(self._archive_path(digest_id), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
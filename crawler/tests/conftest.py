@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""크롤러 테스트 공통 설정 (크롤러 모듈은 평면 import 이므로 crawler/, crawler/benchmarks/ 를 경로에 추가)"""
+
+import os
+import sys
+
+CRAWLER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [CRAWLER_DIR, os.path.join(CRAWLER_DIR, 'benchmarks')]
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+저장소 구현 동등성 테스트
+
+같은 시나리오를 FirestoreStore(메모리 Firestore)와 SQLiteStore(메모리 DB)에 돌려서
+문서 저장/병합, 다이제스트, 검색 색인 샤드, 용어 카운터, 아카이브 결과가 같은지 확인한다.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from fake_firestore import InMemoryFirestore
+from search_index import build_postings, update_search_index
+from storage import FirestoreStore, KeywordStore, SQLiteStore
+from weekly_digest import update_weekly_digest, week_id
+
+NOW = datetime(2026, 10, 14, 12, 0, 0)
+CATEGORIES = {'모델', '논문/학회'}
+
+@pytest.fixture(params=['firestore', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'firestore':
+        store = FirestoreStore(InMemoryFirestore())
+    else:
+        store = SQLiteStore(str(tmp_path / 'keywords.db'))
+    yield store
+    store.close()
+
+def keyword(text, category='모델', hours=0, **fields):
+    data = {
+        'keyword': text,
+        'translatedKeyword': None,
+        'category': category,
+        'source': 'huggingface',
+        'url': f"https://example.com/{text.replace(' ', '-')}",
+        'createdAt': NOW - timedelta(hours=hours),
+        'isActive': True,
+    }
+    data.update(fields)
+    return data
+
+def load_digest(store, digest_id):
+    """저장된 다이제스트 (카테고리 -> (개수, 항목)), 없으면 None"""
+    if isinstance(store, FirestoreStore):
+        snapshot = store.digests.document(digest_id).get()
+        digest = snapshot.to_dict() if snapshot.exists else None
+    else:
+        row = store._conn.execute("SELECT data FROM digests WHERE id = ?", (digest_id,)).fetchone()
+        digest = json.loads(row[0]) if row else None
+    if digest is None:
+        return None
+    categories = {
+        category: (section['count'], section.get('keywords', {}))
+        for category, section in digest['categories'].items()
+    }
+    return digest['count'], categories
+
+def load_postings(store):
+    """검색 색인 포스팅 ({색인어: {문서 ID: [날짜, 카테고리, 가중치]}})"""
+    postings = {}
+    if isinstance(store, FirestoreStore):
+        for snapshot in store.search_index.stream():
+            if snapshot.id != '_meta':
+                for term, docs in snapshot.to_dict().get('tokens', {}).items():
+                    if docs:
+                        postings.setdefault(term, {}).update(docs)
+    else:
+        for term, doc_id, day, category, weight in store._conn.execute(
+            "SELECT term, doc_id, day, category, weight FROM search_postings"
+        ):
+            postings.setdefault(term, {})[doc_id] = [day, category, weight]
+    return postings
+
+def test_incomplete_backend_fails_at_construction():
+    class Partial(KeywordStore):
+        def bulk_upsert(self, documents, overwrite=False):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+def test_bulk_upsert_reports_created_and_existing(store):
+    result = store.bulk_upsert([('a', keyword('GPT-5 release')), ('b', keyword('Gemini update', hours=1))])
+    assert result.created == {'a', 'b'}
+    assert result.existing == set()
+
+    result = store.bulk_upsert([('a', keyword('changed')), ('c', keyword('Claude paper', hours=2))])
+    assert result.created == {'c'}
+    assert result.existing == {'a'}
+    assert result.failed == set()
+    assert dict(store.query())['a']['keyword'] == 'GPT-5 release'
+
+    store.bulk_upsert([('a', keyword('changed'))], overwrite=True)
+    assert dict(store.query())['a']['keyword'] == 'changed'
+
+def test_query_filters_and_orders(store):
+    store.bulk_upsert([
+        ('new', keyword('newest', hours=1)),
+        ('mid', keyword('middle', category='논문/학회', hours=30)),
+        ('old', keyword('oldest', hours=80)),
+    ])
+    assert [doc_id for doc_id, _ in store.query()] == ['new', 'mid', 'old']
+    assert [doc_id for doc_id, _ in store.query(ascending=True, limit=2)] == ['old', 'mid']
+    assert [doc_id for doc_id, _ in store.query(since=NOW - timedelta(days=2))] == ['new', 'mid']
+    assert [doc_id for doc_id, _ in store.query(until=NOW - timedelta(days=1))] == ['mid', 'old']
+    assert [doc_id for doc_id, _ in store.query(categories=['논문/학회'])] == ['mid']
+    assert sorted(store.keywords_since(NOW - timedelta(days=2))) == ['middle', 'newest']
+
+    store.delete(['mid'])
+    assert [doc_id for doc_id, _ in store.query()] == ['new', 'old']
+
+def test_story_links_are_merged(store):
+    digest_id = week_id(NOW)
+    story = keyword('Gemini 2 launches', links=[])
+    store.bulk_upsert([('story', story)])
+    update_weekly_digest(store, [('story', story)], CATEGORIES)
+
+    first = {'source': 'techcrunch', 'url': 'https://t.example/1'}
+    second = {'source': 'ainews', 'url': 'https://a.example/2'}
+    store.add_story_links('story', [first], digest_id, '모델')
+    store.add_story_links('story', [first, second], digest_id, '모델')
+
+    assert dict(store.query())['story']['links'] == [first, second]
+    _, categories = load_digest(store, digest_id)
+    assert categories['모델'][1]['story']['links'] == [first, second]
+
+def test_digest_accumulates_and_updates_only_existing_entries(store):
+    digest_id = week_id(NOW)
+    first = [('a', keyword('GPT-5 release')), ('b', keyword('Claude paper', category='논문/학회'))]
+    later = [('c', keyword('Gemini update'))]
+    store.bulk_upsert(first + later + [('legacy', keyword('old keyword', hours=24 * 60))])
+    update_weekly_digest(store, first, CATEGORIES)
+    update_weekly_digest(store, later, CATEGORIES)
+
+    count, categories = load_digest(store, digest_id)
+    assert count == 3
+    assert categories['모델'][0] == 2 and set(categories['모델'][1]) == {'a', 'c'}
+    assert categories['논문/학회'][0] == 1 and set(categories['논문/학회'][1]) == {'b'}
+
+    store.set_translation('a', 'GPT-5 출시', digest_id, '모델')
+    store.set_previews({'c': {'title': 'Gemini'}}, {'c': (digest_id, '모델')})
+    # 다이제스트에 없는 문서는 다이제스트를 만들거나 항목을 추가하지 않음
+    store.set_translation('legacy', '예전 키워드', week_id(NOW - timedelta(days=60)), '모델')
+    store.set_translation('b', '클로드 논문', digest_id, '모델')
+
+    _, categories = load_digest(store, digest_id)
+    assert categories['모델'][1]['a']['translatedKeyword'] == 'GPT-5 출시'
+    assert categories['모델'][1]['c']['preview'] == {'title': 'Gemini'}
+    assert set(categories['모델'][1]) == {'a', 'c'}
+    assert load_digest(store, week_id(NOW - timedelta(days=60))) is None
+    documents = dict(store.query())
+    assert documents['legacy']['translatedKeyword'] == '예전 키워드'
+    assert documents['c']['preview'] == {'title': 'Gemini'}
+
+    assert store.remove_from_digest(digest_id, [('모델', 'a'), ('모델', 'missing')]) == 1
+    count, categories = load_digest(store, digest_id)
+    assert count == 2
+    assert categories['모델'][0] == 1 and set(categories['모델'][1]) == {'c'}
+
+def test_untranslated_returns_newest_first(store):
+    store.bulk_upsert([(f"k{i}", keyword(f"keyword {i}", hours=(i * 7) % 10)) for i in range(10)])
+    store.set_translation('k0', '번역됨')
+    assert [doc_id for doc_id, _ in store.untranslated(3)] == ['k3', 'k6', 'k9']
+
+def test_search_index_add_and_remove(store):
+    documents = [
+        ('a', keyword('Gemini robotics model', translatedKeyword='제미나이 로봇')),
+        ('b', keyword('Gemini update', category='논문/학회')),
+    ]
+    store.bulk_upsert(documents)
+    update_search_index(store, documents)
+
+    expected = {}
+    for postings in build_postings(documents).values():
+        for term, docs in postings.items():
+            expected.setdefault(term, {}).update(docs)
+    assert load_postings(store) == expected
+    assert load_postings(store)['gemini'] == {'a': [20261014, '모델', 2], 'b': [20261014, '논문/학회', 2]}
+    assert all(data.get('indexed') for _, data in store.query())
+
+    store.remove_from_search_index(build_postings(documents[:1]), 1)
+    postings = load_postings(store)
+    assert postings['gemini'] == {'b': [20261014, '논문/학회', 2]}
+    assert 'robotics' not in postings
+    if isinstance(store, FirestoreStore):
+        assert store.search_index.document('_meta').get().get('documents') == 1
+
+def test_term_counts_accumulate(store):
+    store.add_term_counts('2026-10-14', {'GPT': 2, 'Gemini': 1})
+    store.add_term_counts('2026-10-14', {'GPT': 1})
+    store.add_term_counts('2026-10-15', {'Claude': 3})
+    assert store.term_counts(['2026-10-14', '2026-10-15', '2026-10-16']) == {
+        '2026-10-14': {'GPT': 3, 'Gemini': 1},
+        '2026-10-15': {'Claude': 3},
+    }
+
+def test_archive_round_trip(store):
+    digest_id = week_id(NOW)
+    assert store.load_archive(digest_id) is None
+    store.write_archive(digest_id, NOW, b'payload', 3)
+    store.write_archive(digest_id, NOW, b'replaced', 4)
+    assert store.load_archive(digest_id) == b'replaced'
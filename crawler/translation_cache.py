@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+번역 결과 캐시 (메모리 LRU -> 로컬 SQLite -> Firestore 선택)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 90 * 24 * 3600  # 90일
+DEFAULT_HOT_SIZE = 1024
+DEFAULT_MAX_ENTRIES = 50000
+
+def normalize_text(text):
+    """공백을 정리한 번역 원문"""
+    return ' '.join(text.split())
+
+def cache_key(text, langpair):
+    """정규화된 원문과 언어쌍으로 만든 콘텐츠 주소"""
+    payload = f"{langpair}\0{normalize_text(text)}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class TranslationCache:
+    """번역 결과를 실행 간에 재사용하기 위한 다단계 캐시"""
+
+    def __init__(self, path, ttl=DEFAULT_TTL, hot_size=DEFAULT_HOT_SIZE,
+                 max_entries=DEFAULT_MAX_ENTRIES, db=None, collection='translations'):
+        self.path = path
+        self.ttl = ttl
+        self.hot_size = hot_size
+        self.max_entries = max_entries
+        self.remote = db.collection(collection) if db is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._hot = OrderedDict()
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                langpair TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translated TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_accessed ON translations (accessed_at)"
+        )
+        self._conn.commit()
+
+    def _remember(self, key, translated):
+        """메모리 LRU에 등록 (용량 초과 시 가장 오래된 항목 제거)"""
+        self._hot[key] = translated
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    def get(self, text, langpair='en|ko'):
+        """캐시된 번역 반환, 없으면 None"""
+        key = cache_key(text, langpair)
+        now = time.time()
+
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                self.hits += 1
+                return self._hot[key]
+
+            row = self._conn.execute(
+                "SELECT translated, created_at FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] < self.ttl:
+                self._conn.execute(
+                    "UPDATE translations SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._remember(key, row[0])
+                self.hits += 1
+                return row[0]
+
+        translated = self._get_remote(key, now)
+        with self._lock:
+            if translated is None:
+                self.misses += 1
+                return None
+            self._store_local(key, langpair, text, translated, now)
+            self.hits += 1
+            return translated
+
+    def _get_remote(self, key, now):
+        """Firestore 캐시 조회 (설정된 경우만)"""
+        if self.remote is None:
+            return None
+        try:
+            snapshot = self.remote.document(key).get()
+            if not snapshot.exists:
+                return None
+            data = snapshot.to_dict()
+            if now - data.get('createdAt', 0) >= self.ttl:
+                return None
+            return data.get('translated')
+        except Exception as e:
+            logger.warning(f"Firestore 번역 캐시 조회 실패: {e}")
+            return None
+
+    def _store_local(self, key, langpair, text, translated, now):
+        self._conn.execute(
+            """INSERT OR REPLACE INTO translations
+               (key, langpair, source, translated, created_at, accessed_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (key, langpair, normalize_text(text), translated, now, now)
+        )
+        self._remember(key, translated)
+
+    def set(self, text, translated, langpair='en|ko'):
+        """번역 결과 저장"""
+        key = cache_key(text, langpair)
+        now = time.time()
+        with self._lock:
+            self._store_local(key, langpair, text, translated, now)
+            self._conn.commit()
+
+        if self.remote is not None:
+            try:
+                self.remote.document(key).set({
+                    'langpair': langpair,
+                    'source': normalize_text(text),
+                    'translated': translated,
+                    'createdAt': now
+                })
+            except Exception as e:
+                logger.warning(f"Firestore 번역 캐시 저장 실패: {e}")
+
+    def evict(self):
+        """만료된 항목 삭제 후 최대 개수를 넘으면 오래 사용되지 않은 항목부터 삭제"""
+        with self._lock:
+            expired = self._conn.execute(
+                "DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+            overflow = self._conn.execute(
+                """DELETE FROM translations WHERE key IN (
+                       SELECT key FROM translations ORDER BY accessed_at DESC
+                       LIMIT -1 OFFSET ?
+                   )""",
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+        if expired or overflow:
+            logger.info(f"번역 캐시 정리: 만료 {expired}개, 용량 초과 {overflow}개 삭제")
+
+    def close(self):
+        """캐시 정리 후 연결 종료"""
+        self.evict()
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+        logger.info(f"번역 캐시: 적중 {self.hits}회, 미스 {self.misses}회")
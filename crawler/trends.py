@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+용어별 일간 언급 수 카운터
+
+파싱 단계에서 새로 본 항목의 제목에서 추출한 AI 용어를 (날짜, 용어)별로 세어 두고,
+실행이 끝날 때 날짜별 카운터 문서(term_counts/<YYYY-MM-DD>)에 증분으로 더한다.
+트렌드 계산(functions/trends.py)은 keywords 컬렉션을 훑지 않고 이 카운터만 읽는다.
+"""
+
+import logging
+import threading
+from collections import Counter
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+class TermCounter:
+    """이번 실행에서 센 날짜별 용어 언급 수"""
+
+    def __init__(self):
+        self.days = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(sum(counts.values()) for counts in self.days.values())
+
+    def add(self, terms, day=None):
+        """제목 하나에서 추출한 용어들 (day: 날짜, 없으면 오늘)"""
+        if not terms:
+            return
+        key = (day or date.today()).isoformat()
+        with self._lock:
+            self.days.setdefault(key, Counter()).update(terms)
+
+    def flush(self, store):
+        """모은 카운트를 저장소의 날짜별 카운터에 더함"""
+        with self._lock:
+            days, self.days = self.days, {}
+        for day, counts in sorted(days.items()):
+            store.add_term_counts(day, dict(counts))
+            logger.info(f"용어 카운터 갱신: {day} ({len(counts)}개 용어, {sum(counts.values())}회)")
+        return sum(sum(counts.values()) for counts in days.values())
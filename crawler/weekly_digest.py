@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+주간 다이제스트 문서
+
+이번 주에 수집된 키워드를 카테고리별로 묶어 digests/<주 ID> 문서 하나에 모아 둔다.
+읽는 쪽(프론트엔드, get_weekly_digest)은 keywords 컬렉션을 범위 조회하는 대신 이 문서만 읽으면 된다.
+매 실행이 끝날 때 새로 저장된 키워드만 덧붙이고(저장 방식은 storage.py), 주가 바뀌면 새 문서가 시작된다.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+DIGEST_FIELDS = ['keyword', 'translatedKeyword', 'source', 'url', 'links', 'preview', 'createdAt']
+
+def week_start(moment):
+    """해당 주 월요일 0시"""
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=day.weekday())
+
+def week_id(moment):
+    """ISO 주 번호 기반 문서 ID (예: 2026-W42)"""
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def update_weekly_digest(store, documents, categories):
+    """새로 저장된 키워드 문서들을 주간 다이제스트에 반영
+
+    documents: (문서 ID, 키워드 문서) 목록
+    categories: 항상 포함할 카테고리 이름 (CATEGORY_MAPPING 값)
+    """
+    weeks = {}
+    for doc_id, data in documents:
+        created_at = data.get('createdAt') or datetime.now()
+        weeks.setdefault(week_id(created_at), []).append((doc_id, data))
+
+    for digest_id, items in weeks.items():
+        sections = {category: {} for category in categories}
+        for doc_id, data in items:
+            sections.setdefault(data['category'], {})[doc_id] = {
+                field: data.get(field) for field in DIGEST_FIELDS
+            }
+        store.add_to_digest(digest_id, week_start(items[0][1].get('createdAt') or datetime.now()), sections)
+        logger.info(f"주간 다이제스트 갱신: {digest_id} (+{len(items)}개)")
+
+    return len(weeks)
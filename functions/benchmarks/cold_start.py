@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Functions 콜드 스타트 벤치마크
+
+새 인터프리터에서 `python -X importtime`으로 main 모듈을 import하고
+지정한 엔트리포인트에 첫 요청을 보내기까지의 시간을 잰다.
+import 시간 상위 모듈과 스크래핑 의존성(requests/bs4/feedparser) 로드 여부도 함께 출력한다.
+
+첫 응답 시간까지 재려면 Firestore 에뮬레이터가 필요하다:
+  firebase emulators:start --only firestore
+  FIRESTORE_EMULATOR_HOST=localhost:8080 GCLOUD_PROJECT=demo-ai-weekly \\
+      python benchmarks/cold_start.py --entry get_keywords --runs 5
+
+에뮬레이터가 없으면 --import-only 로 import 시간만 잰다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+FUNCTIONS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['requests', 'bs4', 'feedparser', 'lxml', 'google.cloud.firestore', 'firebase_admin']
+
+# 자식 인터프리터에서 실행할 코드 (import -> 첫 요청)
+CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+result = {{"import_s": imported - started, "first_response_s": None, "status": None}}
+if {entry!r}:
+    from flask import Flask
+    with Flask(__name__).test_request_context({path!r}, query_string={query!r}):
+        from flask import request
+        response = getattr(main, {entry!r})(request)
+    result["first_response_s"] = time.perf_counter() - started
+    result["status"] = getattr(response, "status_code", None)
+result["loaded"] = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps(result))
+'''
+
+def parse_importtime(stderr):
+    """-X importtime 출력의 (모듈 이름(들여쓰기 포함), self us, cumulative us) 목록"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return modules
+
+def run_once(entry, path, query):
+    code = CHILD.format(entry=entry, path=path, query=query, heavy=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=FUNCTIONS_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError('\n'.join(errors[-5:]))
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['imports'] = parse_importtime(completed.stderr)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entry', default='get_keywords', help='첫 요청을 보낼 함수 이름')
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--query', default='limit=50')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='출력할 import 상위 모듈 수')
+    parser.add_argument('--import-only', action='store_true', help='첫 요청 없이 import 시간만 측정')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    entry = None if args.import_only else args.entry
+    runs = [run_once(entry, args.path, args.query) for _ in range(args.runs)]
+
+    # 최상위 패키지별 self 시간 합계 (실행별 합계의 중앙값)
+    packages = {}
+    for i, run in enumerate(runs):
+        for name, self_us, _ in run['imports']:
+            package = name.strip().split('.')[0]
+            totals = packages.setdefault(package, [0] * len(runs))
+            totals[i] += self_us
+    slowest = sorted(
+        ((name, statistics.median(values) / 1000) for name, values in packages.items()),
+        key=lambda item: item[1], reverse=True
+    )[:args.top]
+
+    results = {
+        'entry': entry,
+        'runs': args.runs,
+        'import_ms': round(statistics.median(run['import_s'] for run in runs) * 1000, 1),
+        'first_response_ms': (
+            round(statistics.median(run['first_response_s'] for run in runs) * 1000, 1) if entry else None
+        ),
+        'status': runs[-1]['status'],
+        'loaded_modules': runs[-1]['loaded'],
+        'import_ms_by_package': {name: round(ms, 1) for name, ms in slowest},
+    }
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+if __name__ == '__main__':
+    main()
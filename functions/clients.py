@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+지연 초기화되는 Firebase 클라이언트
+
+import 시점에는 아무것도 만들지 않고, 처음 필요할 때 만든 클라이언트를
+모듈 전역에 보관해서 웜 인스턴스의 다음 요청에서 재사용한다.
+"""
+
+import threading
+
+DIGEST_COLLECTION = 'digests'
+# 크롤러가 날짜별로 갱신하는 용어 언급 수 카운터 (crawler/trends.py)
+TRENDS_COLLECTION = 'term_counts'
+# 크롤러가 갱신하는 검색 역색인 샤드 (crawler/search_index.py)
+SEARCH_INDEX_COLLECTION = 'search_index'
+# 보존 기간이 지난 키워드의 주간 gzip 아카이브 (crawler/compaction.py)
+ARCHIVE_COLLECTION = 'keyword_archives'
+# 수동 크롤링의 키워드 중복 인덱스 스냅샷 (functions/crawling.py, 콜드 스타트에서 전체 조회 대신 읽음)
+KEYWORD_INDEX_COLLECTION = 'keyword_index'
+
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    """Firestore 클라이언트 (첫 호출 때 Firebase 앱 초기화)"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                # firebase_admin.firestore는 google.cloud.firestore 전체를 불러오므로 여기서 import
+                from firebase_admin import firestore, initialize_app
+                initialize_app()
+                _db = firestore.client()
+    return _db
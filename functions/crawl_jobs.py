@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 크롤링 작업
+
+manual_crawl 은 crawl_jobs/<작업 ID> 문서를 만들고 Cloud Tasks 큐(run_crawl_job)에 넣은 뒤 바로 응답한다.
+작업은 백그라운드에서 실행되며 소스별 진행 상황과 최종 지표를 같은 문서에 기록한다.
+crawl_locks/crawl 문서로 진행 중인 작업을 하나만 유지해서, 연달아 들어온 요청은 같은 작업 ID를 받는다.
+스케줄 실행(scheduled_crawl)도 같은 잠금을 잡고 작업 문서를 만든 뒤 큐 없이 바로 실행한다.
+"""
+
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from firebase_admin import firestore
+
+from clients import get_db
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = 'crawl_jobs'
+LOCK_COLLECTION = 'crawl_locks'
+LOCK_DOCUMENT = 'crawl'
+CRAWL_TASK_QUEUE = 'run_crawl_job'
+ACTIVE_STATUSES = ('queued', 'running')
+
+# 이 시간 동안 갱신이 없는 작업은 중단된 것으로 보고 새 작업을 허용 (태스크 타임아웃보다 길게)
+JOB_STALE_AFTER = timedelta(minutes=15)
+
+def _lock_ref(db):
+    return db.collection(LOCK_COLLECTION).document(LOCK_DOCUMENT)
+
+def _is_active(lock):
+    if not lock or lock.get('status') not in ACTIVE_STATUSES:
+        return False
+    updated_at = lock.get('updatedAt')
+    return updated_at is not None and time.time() - updated_at.timestamp() < JOB_STALE_AFTER.total_seconds()
+
+def claim_job(db, trigger):
+    """진행 중인 작업이 있으면 그 ID, 없으면 새 작업 문서를 만들고 ID 반환 -> (작업 ID, 새로 만들었는지)"""
+    lock_ref = _lock_ref(db)
+
+    @firestore.transactional
+    def claim(transaction):
+        lock = lock_ref.get(transaction=transaction).to_dict()
+        if _is_active(lock):
+            return lock['jobId'], False
+
+        job_id = uuid.uuid4().hex
+        now = datetime.now()
+        transaction.set(db.collection(JOBS_COLLECTION).document(job_id), {
+            'status': 'queued',
+            'trigger': trigger,
+            'createdAt': now,
+            'updatedAt': now,
+            'sources': {},
+        })
+        transaction.set(lock_ref, {'jobId': job_id, 'status': 'queued', 'updatedAt': now})
+        return job_id, True
+
+    return claim(db.transaction())
+
+def _set_lock_status(db, job_id, status):
+    """잠금 문서의 작업 상태 갱신 (그 사이 다른 작업이 잠금을 가져갔으면 그대로 둠)"""
+    lock_ref = _lock_ref(db)
+
+    @firestore.transactional
+    def update(transaction):
+        lock = lock_ref.get(transaction=transaction).to_dict() or {}
+        if lock.get('jobId') == job_id:
+            transaction.set(lock_ref, {'jobId': job_id, 'status': status, 'updatedAt': datetime.now()})
+
+    update(db.transaction())
+
+def enqueue_crawl_job(trigger='manual'):
+    """크롤링 작업 등록 후 (작업 ID, 새로 만들었는지) 반환"""
+    from firebase_admin import functions
+
+    db = get_db()
+    job_id, created = claim_job(db, trigger)
+    if not created:
+        logger.info(f"진행 중인 크롤링 작업에 합류: {job_id}")
+        return job_id, False
+
+    try:
+        # 태스크 ID를 작업 ID로 지정해서 같은 작업이 두 번 큐에 들어가지 않게 함
+        functions.task_queue(CRAWL_TASK_QUEUE).enqueue(
+            {'jobId': job_id}, functions.TaskOptions(task_id=job_id)
+        )
+    except Exception as e:
+        db.collection(JOBS_COLLECTION).document(job_id).update({
+            'status': 'failed', 'error': f"작업 등록 실패: {e}", 'updatedAt': datetime.now()
+        })
+        _set_lock_status(db, job_id, 'failed')
+        raise
+
+    logger.info(f"크롤링 작업 등록: {job_id}")
+    return job_id, True
+
+def run_scheduled_job():
+    """스케줄 실행: 잠금을 잡고 바로 실행 (진행 중인 작업이 있으면 건너뛰고 그 ID 반환)"""
+    job_id, created = claim_job(get_db(), 'scheduled')
+    if not created:
+        logger.info(f"진행 중인 크롤링 작업이 있어 스케줄 실행을 건너뜀: {job_id}")
+        return job_id, False
+    run_job(job_id)
+    return job_id, True
+
+def run_job(job_id):
+    """큐에서 꺼낸 작업 실행 (소스별 진행 상황과 최종 지표를 작업 문서에 기록)"""
+    from crawling import CRAWLERS, run_crawlers
+
+    db = get_db()
+    job_ref = db.collection(JOBS_COLLECTION).document(job_id)
+    job = job_ref.get()
+    if not job.exists or job.get('status') != 'queued':
+        logger.warning(f"실행할 수 없는 크롤링 작업: {job_id}")
+        return
+
+    started = time.monotonic()
+    job_ref.update({
+        'status': 'running',
+        'startedAt': datetime.now(),
+        'updatedAt': datetime.now(),
+        'sources': {name: {'status': 'pending', 'added': 0} for name in CRAWLERS},
+    })
+    _set_lock_status(db, job_id, 'running')
+    final_status = 'failed'
+
+    def progress(source, added, error):
+        job_ref.update({
+            f'sources.{source}': {'status': 'error' if error else 'done', 'added': added, 'error': error},
+            'updatedAt': datetime.now(),
+        })
+
+    try:
+        result = run_crawlers(progress=progress)
+        job_ref.update({
+            'status': 'succeeded',
+            'finishedAt': datetime.now(),
+            'updatedAt': datetime.now(),
+            'metrics': {**result, 'durationSeconds': round(time.monotonic() - started, 2)},
+        })
+        final_status = 'succeeded'
+        logger.info(f"크롤링 작업 완료: {job_id} - {result}")
+    except Exception as e:
+        logger.error(f"크롤링 작업 실패: {job_id} - {e}")
+        job_ref.update({
+            'status': 'failed',
+            'error': str(e),
+            'finishedAt': datetime.now(),
+            'updatedAt': datetime.now(),
+            'metrics': {'durationSeconds': round(time.monotonic() - started, 2)},
+        })
+    finally:
+        _set_lock_status(db, job_id, final_status)
+
+def load_job(job_id=None):
+    """작업 문서 조회 (ID가 없으면 가장 최근 작업)"""
+    db = get_db()
+    if job_id is None:
+        lock = _lock_ref(db).get()
+        if not lock.exists:
+            return None
+        job_id = lock.get('jobId')
+
+    job = db.collection(JOBS_COLLECTION).document(job_id).get()
+    if not job.exists:
+        return None
+    return {'jobId': job.id, **job.to_dict()}
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+"""
+Functions용 크롤러 (스케줄/수동 크롤링에서만 import)
+
+requests, bs4, feedparser 같은 스크래핑 의존성은 여기서만 불러와서
+조회 전용 함수(get_keywords 등)의 콜드 스타트에 포함되지 않게 한다.
+
+이 경로는 수동 크롤링용 예비 경로로 고정되어 있다. 파싱(lxml/스트리밍), 키워드 매칭, 번역, 스토리 묶기는
+GitHub Actions 크롤러(crawler/)에만 있으므로 같은 페이지에서도 수집되는 키워드가 다를 수 있다.
+대신 저장하는 문서와 다이제스트 항목은 크롤러와 같은 형식으로 맞춘다: translatedKeyword 를 비워 두면
+다음 정기 크롤링의 재번역 단계가 문서와 다이제스트 항목을 번역하고, 다이제스트 필드는 크롤러의 DIGEST_FIELDS 와 같다.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+import feedparser
+import requests
+from bs4 import BeautifulSoup
+from firebase_admin import firestore
+from requests.adapters import HTTPAdapter
+
+from clients import DIGEST_COLLECTION, KEYWORD_INDEX_COLLECTION, get_db
+
+logger = logging.getLogger(__name__)
+
+# 동시 크롤링 설정
+MAX_WORKERS = int(os.getenv('CRAWL_CONCURRENCY', '4'))
+REQUEST_TIMEOUT = 10
+
+# 호스트별 keep-alive 세션 풀 (웜 인스턴스에서 재사용)
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(url):
+    """URL 호스트에 해당하는 공유 세션 반환 (없으면 생성)"""
+    host = urlparse(url).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(MAX_WORKERS, 1))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[host] = session
+        return session
+
+def http_get(url, **kwargs):
+    """호스트별 세션을 재사용하는 GET 요청"""
+    kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+    return get_session(url).get(url, **kwargs)
+
+# 카테고리 매핑
+CATEGORY_MAPPING = {
+    'huggingface': '모델',
+    'paperswithcode': '논문/학회', 
+    'techcrunch': '서비스/앱',
+    'ainews': '커뮤니티 이슈',
+    'reddit': '커뮤니티 이슈',
+    'hackernews': '실습/코드'
+}
+
+# 문서 ID가 이미 존재할 때 반환되는 gRPC 상태 코드
+ALREADY_EXISTS = 6
+MAX_WRITE_ATTEMPTS = 5
+
+def keyword_doc_id(keyword):
+    """키워드 내용으로부터 결정적인 문서 ID 생성"""
+    normalized = ' '.join(keyword.split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:40]
+
+# 다른 실행에서 저장된 문서를 놓치지 않기 위한 여유 시간
+INDEX_REFRESH_MARGIN = timedelta(hours=1)
+# 스냅샷 문서 하나에 넣는 키 수 (키는 20바이트로 묶어서 저장, 문서 크기 제한 1MiB 안쪽)
+INDEX_SNAPSHOT_CHUNK = 40000
+INDEX_KEY_BYTES = 20
+
+class KeywordIndex:
+    """저장된 키워드의 문서 ID 집합 (웜 인스턴스에서 모듈 스코프로 유지)"""
+    
+    def __init__(self):
+        self.keys = set()
+        self.updated_at = None
+        self._lock = threading.Lock()
+    
+    def __contains__(self, keyword):
+        return keyword_doc_id(keyword) in self.keys
+    
+    def add(self, keyword):
+        with self._lock:
+            self.keys.add(keyword_doc_id(keyword))
+    
+    def load_snapshot(self, db):
+        """저장된 스냅샷에서 키와 갱신 시각 복원 (없거나 일부가 빠졌으면 False)"""
+        snapshots = db.collection(KEYWORD_INDEX_COLLECTION)
+        meta = snapshots.document('_meta').get()
+        if not meta.exists:
+            return False
+        meta = meta.to_dict()
+        references = [snapshots.document(f"{meta['generation']}-{n}") for n in range(meta['chunks'])]
+        keys = set()
+        for chunk in db.get_all(references):
+            if not chunk.exists:
+                return False
+            packed = chunk.get('keys')
+            keys.update(packed[i:i + INDEX_KEY_BYTES].hex() for i in range(0, len(packed), INDEX_KEY_BYTES))
+        self.keys = keys
+        self.updated_at = meta['updatedAt']
+        logger.info(f"키워드 인덱스 스냅샷 로드: {len(keys)}개 ({self.updated_at})")
+        return True
+    
+    def save_snapshot(self, db):
+        """키를 묶어서 새 세대의 스냅샷 문서들로 저장한 뒤 _meta 를 바꾸고 이전 세대를 지움"""
+        snapshots = db.collection(KEYWORD_INDEX_COLLECTION)
+        previous = snapshots.document('_meta').get()
+        previous = previous.to_dict() if previous.exists else None
+        
+        keys = sorted(self.keys)
+        generation = self.updated_at.strftime('%Y%m%d%H%M%S%f')
+        chunks = [keys[start:start + INDEX_SNAPSHOT_CHUNK] for start in range(0, len(keys), INDEX_SNAPSHOT_CHUNK)]
+        for n, chunk in enumerate(chunks):
+            snapshots.document(f"{generation}-{n}").set({'keys': b''.join(bytes.fromhex(key) for key in chunk)})
+        # 읽는 쪽은 _meta 가 가리키는 세대만 읽으므로 쓰는 도중에도 이전 스냅샷이 그대로 보임
+        snapshots.document('_meta').set({
+            'generation': generation,
+            'chunks': len(chunks),
+            'count': len(keys),
+            'updatedAt': self.updated_at,
+        })
+        if previous and previous['generation'] != generation:
+            batch = db.batch()
+            for n in range(previous['chunks']):
+                batch.delete(snapshots.document(f"{previous['generation']}-{n}"))
+            batch.commit()
+    
+    def refresh(self, db, collection='keywords'):
+        """마지막 갱신 이후의 키워드만 projection 쿼리로 가져오기"""
+        query = db.collection(collection).select(['keyword'])
+        if self.updated_at:
+            query = query.where('createdAt', '>=', self.updated_at - INDEX_REFRESH_MARGIN)
+        
+        started = datetime.now()
+        for doc in query.stream():
+            keyword = doc.get('keyword')
+            if keyword:
+                self.keys.add(keyword_doc_id(keyword))
+        self.updated_at = started
+        logger.info(f"키워드 인덱스 갱신: 총 {len(self.keys)}개")
+        return self
+
+_keyword_index = None
+
+def get_keyword_index():
+    """모듈 스코프 키워드 인덱스 반환 (콜드 스타트 시 스냅샷을 읽고, 그 이후 변경분만 조회)"""
+    global _keyword_index
+    if _keyword_index is None:
+        _keyword_index = KeywordIndex()
+        try:
+            _keyword_index.load_snapshot(get_db())
+        except Exception as e:
+            logger.warning(f"키워드 인덱스 스냅샷 로드 실패, 전체 조회로 대체: {e}")
+            _keyword_index = KeywordIndex()
+    return _keyword_index.refresh(get_db())
+
+def save_keyword_index(index):
+    """다음 콜드 스타트가 전체 조회 대신 읽을 스냅샷 저장 (실패해도 크롤링 결과에는 영향 없음)"""
+    try:
+        index.save_snapshot(get_db())
+    except Exception as e:
+        logger.warning(f"키워드 인덱스 스냅샷 저장 실패: {e}")
+
+class KeywordBatchWriter:
+    """크롤링 결과를 모아서 BulkWriter로 한 번에 저장"""
+    
+    def __init__(self, db, collection='keywords', index=None):
+        self.db = db
+        self.collection = db.collection(collection)
+        self.index = index
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._created_ids = set()
+        self.added_by_source = {}
+        self.created = 0
+        self.duplicates = 0
+        self.failed = 0
+        self._failed_ids = set()
+    
+    def add(self, keyword, category, source, url=None):
+        """저장할 키워드를 대기열에 추가 (같은 실행 내 중복은 무시)"""
+        if self.index is not None and keyword in self.index:
+            with self._lock:
+                self.duplicates += 1
+            logger.info(f"키워드 '{keyword}' 이미 존재함")
+            return False
+        
+        doc_id = keyword_doc_id(keyword)
+        with self._lock:
+            if doc_id in self._pending:
+                logger.info(f"키워드 '{keyword}' 이번 실행에서 이미 수집됨")
+                return False
+            self._pending[doc_id] = {
+                'keyword': keyword,
+                # 크롤러의 재번역 단계가 translatedKeyword == None 으로 찾으므로 필드를 비워서라도 둠
+                'translatedKeyword': None,
+                'category': category,
+                'source': source,
+                'url': url,
+                'createdAt': datetime.now(),
+                'isActive': True
+            }
+            self.added_by_source[source] = self.added_by_source.get(source, 0) + 1
+            return True
+    
+    def _on_write_result(self, reference, result, bulk_writer):
+        with self._lock:
+            self.created += 1
+            self._created_ids.add(reference.id)
+    
+    def _on_write_error(self, error, bulk_writer):
+        # 이미 저장된 키워드는 재시도하지 않고 중복으로 처리
+        with self._lock:
+            if error.code == ALREADY_EXISTS:
+                self.duplicates += 1
+                return False
+            if error.attempts < MAX_WRITE_ATTEMPTS:
+                return True
+            self.failed += 1
+            self._failed_ids.add(error.operation.reference.id)
+        logger.error(f"Firestore 저장 오류: {error.operation.reference.id} - {error.message}")
+        return False
+    
+    def flush(self):
+        """대기 중인 키워드를 일괄 저장"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        
+        bulk_writer = self.db.bulk_writer()
+        bulk_writer.on_write_result(self._on_write_result)
+        bulk_writer.on_write_error(self._on_write_error)
+        for doc_id, data in pending.items():
+            bulk_writer.create(self.collection.document(doc_id), data)
+        bulk_writer.close()
+        
+        if self.index is not None:
+            for doc_id, data in pending.items():
+                if doc_id not in self._failed_ids:
+                    self.index.add(data['keyword'])
+        
+        # 이번 주 다이제스트 문서에 새 키워드 반영
+        try:
+            update_weekly_digest(
+                self.db, [(doc_id, pending[doc_id]) for doc_id in self._created_ids if doc_id in pending]
+            )
+        except Exception as e:
+            logger.error(f"주간 다이제스트 갱신 실패: {e}")
+        
+        logger.info(
+            f"일괄 저장 완료: 신규 {self.created}개, 중복 {self.duplicates}개, 실패 {self.failed}개"
+        )
+        return self.created
+
+# crawler/weekly_digest.py 의 DIGEST_FIELDS 와 같아야 함 (이 경로에서는 links/preview 가 없으므로 null)
+DIGEST_FIELDS = ['keyword', 'translatedKeyword', 'source', 'url', 'links', 'preview', 'createdAt']
+
+def week_id(moment):
+    """ISO 주 번호 기반 다이제스트 문서 ID (예: 2026-W42)"""
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def update_weekly_digest(db, documents):
+    """새로 저장된 키워드를 digests/<주 ID> 문서에 merge로 덧붙임 (crawler/weekly_digest.py 와 같은 형식)"""
+    weeks = {}
+    for doc_id, data in documents:
+        weeks.setdefault(week_id(data['createdAt']), []).append((doc_id, data))
+    
+    for digest_id, items in weeks.items():
+        grouped = {category: {} for category in set(CATEGORY_MAPPING.values())}
+        for doc_id, data in items:
+            grouped.setdefault(data['category'], {})[doc_id] = {field: data.get(field) for field in DIGEST_FIELDS}
+        
+        # 빈 맵은 merge 시 기존 값을 덮어쓰므로 키워드가 있는 카테고리에만 넣음
+        sections = {}
+        for category, keywords in grouped.items():
+            sections[category] = {'count': firestore.Increment(len(keywords))}
+            if keywords:
+                sections[category]['keywords'] = keywords
+        
+        created_at = items[0][1]['createdAt']
+        db.collection(DIGEST_COLLECTION).document(digest_id).set({
+            'weekId': digest_id,
+            'weekStart': (created_at - timedelta(days=created_at.weekday())).replace(hour=0, minute=0, second=0, microsecond=0),
+            'updatedAt': datetime.now(),
+            'count': firestore.Increment(len(items)),
+            'categories': sections,
+        }, merge=True)
+        logger.info(f"주간 다이제스트 갱신: {digest_id} (+{len(items)}개)")
+
+def crawl_huggingface_papers(writer):
+    """Hugging Face Papers 크롤링"""
+    url = "https://huggingface.co/papers"
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    
+    response = http_get(url, headers=headers)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+    
+    # 논문 제목들 추출 (실제 셀렉터는 사이트 구조에 따라 조정 필요)
+    papers = soup.find_all('h3', class_='text-lg')
+    
+    for paper in papers[:10]:  # 최신 10개만
+        title = paper.get_text().strip()
+        if len(title) > 5:  # 의미있는 제목만
+            writer.add(title, CATEGORY_MAPPING['huggingface'], 'huggingface')
+
+def crawl_papers_with_code(writer):
+    """Papers with Code 크롤링"""
+    url = "https://paperswithcode.com/latest"
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    
+    response = http_get(url, headers=headers)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+    
+    # 논문 제목들 추출
+    papers = soup.find_all('h1')
+    
+    for paper in papers[:10]:
+        title = paper.get_text().strip()
+        if len(title) > 5:
+            writer.add(title, CATEGORY_MAPPING['paperswithcode'], 'paperswithcode')
+
+def crawl_techcrunch_ai(writer):
+    """TechCrunch AI RSS 크롤링"""
+    rss_url = "https://techcrunch.com/category/artificial-intelligence/feed/"
+    response = http_get(rss_url)
+    response.raise_for_status()
+    feed = feedparser.parse(response.content)
+    
+    for entry in feed.entries[:10]:
+        title = entry.title
+        # AI 관련 키워드 추출
+        ai_keywords = extract_ai_keywords(title)
+        for keyword in ai_keywords:
+            writer.add(keyword, CATEGORY_MAPPING['techcrunch'], 'techcrunch', entry.link)
+
+def crawl_ai_news(writer):
+    """AI News 사이트 크롤링"""
+    url = "https://www.artificialintelligence-news.com"
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    
+    response = http_get(url, headers=headers)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+    
+    # 기사 제목들 추출
+    articles = soup.find_all('h2', class_='entry-title')
+    
+    for article in articles[:10]:
+        title = article.get_text().strip()
+        ai_keywords = extract_ai_keywords(title)
+        for keyword in ai_keywords:
+            writer.add(keyword, CATEGORY_MAPPING['ainews'], 'ainews')
+
+def extract_ai_keywords(text):
+    """텍스트에서 AI 관련 키워드 추출"""
+    ai_terms = [
+        'GPT', 'Claude', 'Gemini', 'LLaMA', 'Mixtral', 'Phi-3', 'DeepSeek',
+        'OpenAI', 'Anthropic', 'Google', 'Meta', 'Microsoft',
+        'transformer', 'BERT', 'T5', 'PaLM', 'Bard', 'ChatGPT',
+        'machine learning', 'deep learning', 'neural network',
+        'AI model', 'language model', 'LLM', 'AGI'
+    ]
+    
+    keywords = []
+    text_lower = text.lower()
+    
+    for term in ai_terms:
+        if term.lower() in text_lower:
+            # 원본 케이스 유지해서 추출
+            start_idx = text_lower.find(term.lower())
+            if start_idx != -1:
+                original_term = text[start_idx:start_idx + len(term)]
+                keywords.append(original_term)
+    
+    return list(set(keywords))  # 중복 제거
+
+# 소스 이름 -> 크롤러 (작업 진행 상황도 이 이름으로 기록)
+CRAWLERS = {
+    'huggingface': crawl_huggingface_papers,
+    'paperswithcode': crawl_papers_with_code,
+    'techcrunch': crawl_techcrunch_ai,
+    'ainews': crawl_ai_news,
+}
+
+def run_crawlers(crawlers=CRAWLERS, max_workers=MAX_WORKERS, progress=None):
+    """크롤러들을 제한된 스레드 풀에서 병렬 실행 후 일괄 저장
+
+    progress(source, added, error)는 소스 하나가 끝날 때마다 호출된다.
+    크롤러는 오류를 잡지 않으므로 실패한 소스는 error에 메시지가 들어간다.
+    """
+    index = get_keyword_index()
+    writer = KeywordBatchWriter(get_db(), index=index)
+    
+    def finished(name, error=None):
+        if progress is not None:
+            try:
+                progress(name, writer.added_by_source.get(name, 0), error)
+            except Exception as e:
+                logger.warning(f"진행 상황 기록 실패: {name} - {e}")
+    
+    if max_workers <= 1:
+        for name, crawler in crawlers.items():
+            try:
+                crawler(writer)
+            except Exception as e:
+                logger.error(f"{name} 실행 오류: {e}")
+                finished(name, str(e))
+                continue
+            finished(name)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crawl') as executor:
+            futures = {executor.submit(crawler, writer): name for name, crawler in crawlers.items()}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    finished(futures[future])
+                except Exception as e:
+                    logger.error(f"{futures[future]} 실행 오류: {e}")
+                    finished(futures[future], str(e))
+    
+    writer.flush()
+    # 저장에 실패한 키워드는 인덱스에 없으므로 다음 실행에서 다시 시도됨
+    save_keyword_index(index)
+    return {
+        'created': writer.created,
+        'duplicates': writer.duplicates,
+        'failed': writer.failed,
+        'added': dict(writer.added_by_source),
+    }
@@ -1,206 +1,502 @@
 # Firebase Functions for AI Weekly News Crawler
-from firebase_functions import https_fn, scheduler_fn
-from firebase_admin import initialize_app, firestore
-import requests
-from bs4 import BeautifulSoup
-import feedparser
+# 조회 함수의 콜드 스타트를 줄이기 위해 크롤링 의존성(crawling.py)은 크롤링 함수 안에서만 import
+from firebase_functions import https_fn, options, scheduler_fn, tasks_fn
 from datetime import datetime, timedelta
+from collections import OrderedDict
 import logging
+import gzip
+import hashlib
+import json
+import base64
+import os
+import re
+import threading
+import time
+import zlib
 
-# Firebase 초기화
-initialize_app()
-db = firestore.client()
+from clients import ARCHIVE_COLLECTION, DIGEST_COLLECTION, get_db
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 카테고리 매핑
-CATEGORY_MAPPING = {
-    'huggingface': '모델',
-    'paperswithcode': '논문/학회', 
-    'techcrunch': '서비스/앱',
-    'ainews': '커뮤니티 이슈',
-    'reddit': '커뮤니티 이슈',
-    'hackernews': '실습/코드'
-}
-
-def save_keyword_to_firestore(keyword, category, source, url=None):
-    """키워드를 Firestore에 저장"""
-    try:
-        # 중복 체크
-        existing = db.collection('keywords').where('keyword', '==', keyword).limit(1).get()
-        if len(existing) > 0:
-            logger.info(f"키워드 '{keyword}' 이미 존재함")
-            return
-        
-        # 새 키워드 저장
-        doc_data = {
-            'keyword': keyword,
-            'category': category,
-            'source': source,
-            'url': url,
-            'createdAt': datetime.now(),
-            'isActive': True
-        }
-        
-        db.collection('keywords').add(doc_data)
-        logger.info(f"새 키워드 저장: {keyword} ({category})")
-        
-    except Exception as e:
-        logger.error(f"Firestore 저장 오류: {e}")
+@scheduler_fn.on_schedule(schedule="0 9,18 * * 1,3,5")  # 월,수,금 오전9시, 오후6시
+def scheduled_crawl(event):
+    """스케줄된 크롤링 실행"""
+    from crawl_jobs import run_scheduled_job
+    
+    logger.info("스케줄된 크롤링 시작")
+    
+    # 수동 작업과 같은 잠금을 잡아서 겹쳐 실행되지 않게 함
+    job_id, ran = run_scheduled_job()
+    if not ran:
+        return f"진행 중인 작업이 있어 건너뜀: {job_id}"
+    
+    logger.info(f"스케줄된 크롤링 완료: {job_id}")
+    
+    return "크롤링 완료"
 
-def crawl_huggingface_papers():
-    """Hugging Face Papers 크롤링"""
+@https_fn.on_request()
+def manual_crawl(req: https_fn.Request) -> https_fn.Response:
+    """수동 크롤링 트리거 (작업을 큐에 넣고 바로 202 + 작업 ID 반환, 진행 중인 작업이 있으면 그 작업 ID)"""
     try:
-        url = "https://huggingface.co/papers"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        from crawl_jobs import enqueue_crawl_job
         
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 논문 제목들 추출 (실제 셀렉터는 사이트 구조에 따라 조정 필요)
-        papers = soup.find_all('h3', class_='text-lg')
+        job_id, created = enqueue_crawl_job('manual')
+        body = {"jobId": job_id, "created": created, "statusUrl": f"crawl_status?id={job_id}"}
+        return https_fn.Response(
+            json.dumps(body), status=202, headers={"Content-Type": "application/json; charset=utf-8"}
+        )
         
-        for paper in papers[:10]:  # 최신 10개만
-            title = paper.get_text().strip()
-            if len(title) > 5:  # 의미있는 제목만
-                save_keyword_to_firestore(title, CATEGORY_MAPPING['huggingface'], 'huggingface')
-                
     except Exception as e:
-        logger.error(f"Hugging Face 크롤링 오류: {e}")
+        logger.error(f"수동 크롤링 오류: {e}")
+        return https_fn.Response(f"크롤링 중 오류 발생: {str(e)}", status=500)
 
-def crawl_papers_with_code():
-    """Papers with Code 크롤링"""
+# 크롤링 작업은 한 번에 하나씩, 재시도 없이 실행 (실패는 작업 문서에 기록)
+@tasks_fn.on_task_dispatched(
+    retry_config=options.RetryConfig(max_attempts=1),
+    rate_limits=options.RateLimits(max_concurrent_dispatches=1),
+    timeout_sec=540,
+)
+def run_crawl_job(req: tasks_fn.CallableRequest) -> None:
+    """큐에 들어온 크롤링 작업 실행"""
+    from crawl_jobs import run_job
+    
+    run_job(req.data['jobId'])
+
+@https_fn.on_request()
+def crawl_status(req: https_fn.Request) -> https_fn.Response:
+    """크롤링 작업 상태 (?id=작업 ID, 없으면 가장 최근 작업)"""
     try:
-        url = "https://paperswithcode.com/latest"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        from crawl_jobs import load_job
         
-        # 논문 제목들 추출
-        papers = soup.find_all('h1')
+        job = load_job(req.args.get('id') or None)
+        if job is None:
+            return https_fn.Response("작업이 없습니다", status=404)
+        return https_fn.Response(
+            json.dumps(job, ensure_ascii=False, default=str),
+            headers={"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-store"}
+        )
         
-        for paper in papers[:10]:
-            title = paper.get_text().strip()
-            if len(title) > 5:
-                save_keyword_to_firestore(title, CATEGORY_MAPPING['paperswithcode'], 'paperswithcode')
-                
     except Exception as e:
-        logger.error(f"Papers with Code 크롤링 오류: {e}")
+        logger.error(f"작업 상태 조회 오류: {e}")
+        return https_fn.Response(f"조회 중 오류 발생: {str(e)}", status=500)
 
-def crawl_techcrunch_ai():
-    """TechCrunch AI RSS 크롤링"""
-    try:
-        rss_url = "https://techcrunch.com/category/artificial-intelligence/feed/"
-        feed = feedparser.parse(rss_url)
-        
-        for entry in feed.entries[:10]:
-            title = entry.title
-            # AI 관련 키워드 추출
-            ai_keywords = extract_ai_keywords(title)
-            for keyword in ai_keywords:
-                save_keyword_to_firestore(keyword, CATEGORY_MAPPING['techcrunch'], 'techcrunch', entry.link)
-                
-    except Exception as e:
-        logger.error(f"TechCrunch 크롤링 오류: {e}")
+# get_keywords 응답 설정
+KEYWORDS_PAGE_SIZE = 100
+KEYWORDS_MAX_PAGE_SIZE = 500
+KEYWORDS_DAYS = 7
+# 크롤러의 보존 기간(CRAWL_RETENTION_DAYS 기본값)보다 오래된 키워드는 아카이브에 있음
+KEYWORDS_MAX_DAYS = 90
+# ndjson 스트리밍 시 한 번에 내보낼 크기
+STREAM_CHUNK_BYTES = 64 * 1024
+KEYWORDS_CACHE_TTL = int(os.getenv('KEYWORDS_CACHE_TTL', '60'))
+KEYWORDS_CACHE_SIZE = 256
+KEYWORD_FIELDS = ['keyword', 'translatedKeyword', 'category', 'source', 'url', 'links', 'preview', 'createdAt', 'isActive']
+# Firestore 'in' 필터에 넣을 수 있는 최대 값 개수
+MAX_CATEGORY_FILTERS = 10
 
-def crawl_ai_news():
-    """AI News 사이트 크롤링"""
-    try:
-        url = "https://www.artificialintelligence-news.com"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 기사 제목들 추출
-        articles = soup.find_all('h2', class_='entry-title')
-        
-        for article in articles[:10]:
-            title = article.get_text().strip()
-            ai_keywords = extract_ai_keywords(title)
-            for keyword in ai_keywords:
-                save_keyword_to_firestore(keyword, CATEGORY_MAPPING['ainews'], 'ainews')
-                
-    except Exception as e:
-        logger.error(f"AI News 크롤링 오류: {e}")
-
-def extract_ai_keywords(text):
-    """텍스트에서 AI 관련 키워드 추출"""
-    ai_terms = [
-        'GPT', 'Claude', 'Gemini', 'LLaMA', 'Mixtral', 'Phi-3', 'DeepSeek',
-        'OpenAI', 'Anthropic', 'Google', 'Meta', 'Microsoft',
-        'transformer', 'BERT', 'T5', 'PaLM', 'Bard', 'ChatGPT',
-        'machine learning', 'deep learning', 'neural network',
-        'AI model', 'language model', 'LLM', 'AGI'
-    ]
+class ResponseCache:
+    """쿼리별 응답 본문/ETag를 TTL 동안 보관하는 LRU 캐시 (웜 인스턴스에서 재사용)"""
+    
+    def __init__(self, ttl=KEYWORDS_CACHE_TTL, max_entries=KEYWORDS_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+    
+    def set(self, key, body, etag):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+_response_cache = ResponseCache()
+
+def encode_cursor(created_at, doc_id):
+    """다음 페이지 시작 위치 (마지막 문서의 createdAt, 문서 ID)"""
+    raw = json.dumps([created_at.isoformat(), doc_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    created_at, doc_id = json.loads(raw)
+    return datetime.fromisoformat(created_at), doc_id
+
+def parse_keywords_query(args):
+    """요청 파라미터 정규화 (잘못된 값은 ValueError)"""
+    output = args.get('format', 'json')
+    if output not in ('json', 'ndjson'):
+        raise ValueError("format은 json 또는 ndjson이어야 합니다")
+    
+    # ndjson은 한 번에 하나씩 내보내므로 limit이 없으면 기간 전체
+    if output == 'ndjson':
+        limit = int(args['limit']) if args.get('limit') else None
+        if limit is not None and limit < 1:
+            raise ValueError("limit은 1 이상이어야 합니다")
+    else:
+        limit = int(args.get('limit', KEYWORDS_PAGE_SIZE))
+        if not 1 <= limit <= KEYWORDS_MAX_PAGE_SIZE:
+            raise ValueError(f"limit은 1~{KEYWORDS_MAX_PAGE_SIZE} 사이여야 합니다")
+    
+    days = int(args.get('days', KEYWORDS_DAYS))
+    if not 1 <= days <= KEYWORDS_MAX_DAYS:
+        raise ValueError(f"days는 1~{KEYWORDS_MAX_DAYS} 사이여야 합니다")
+    
+    fields = [f for value in args.getlist('fields') for f in value.split(',') if f]
+    unknown = set(fields) - set(KEYWORD_FIELDS)
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(sorted(unknown))}")
+    
+    categories = sorted({c for value in args.getlist('category') for c in value.split(',') if c})
+    if len(categories) > MAX_CATEGORY_FILTERS:
+        raise ValueError(f"category는 최대 {MAX_CATEGORY_FILTERS}개까지 지정할 수 있습니다")
+    
+    cursor = args.get('cursor') or None
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except Exception:
+            raise ValueError("잘못된 cursor 값입니다")
+    
+    return {
+        'format': output,
+        'limit': limit,
+        'days': days,
+        'fields': sorted(set(fields)) or KEYWORD_FIELDS,
+        'categories': categories,
+        'cursor': cursor,
+        'gzip': output == 'ndjson' and args.get('gzip') in ('1', 'true'),
+    }
+
+def keywords_query(params):
+    """최근 days일 키워드를 createdAt 내림차순으로 조회하는 쿼리 (limit 없음)"""
+    since = datetime.now() - timedelta(days=params['days'])
+    
+    # 커서 생성을 위해 createdAt은 항상 가져옴
+    projection = sorted(set(params['fields']) | {'createdAt'})
+    query = (
+        get_db().collection('keywords')
+        .where('createdAt', '>=', since)
+        .where('isActive', '==', True)
+    )
+    if params['categories']:
+        query = query.where('category', 'in', params['categories'])
+    query = (
+        query.select(projection)
+        .order_by('createdAt', direction='DESCENDING')
+        .order_by('__name__', direction='DESCENDING')
+    )
+    if params['cursor']:
+        created_at, doc_id = decode_cursor(params['cursor'])
+        query = query.start_after({'createdAt': created_at, '__name__': doc_id})
+    return query
+
+def load_keywords_page(params):
+    """키워드 한 페이지 조회 (다음 페이지 커서 포함)"""
+    # 다음 페이지 존재 여부 확인용으로 하나 더 조회
+    docs = list(keywords_query(params).limit(params['limit'] + 1).stream())
+    has_more = len(docs) > params['limit']
+    docs = docs[:params['limit']]
     
     keywords = []
-    text_lower = text.lower()
+    for doc in docs:
+        data = doc.to_dict()
+        item = {field: data.get(field) for field in params['fields']}
+        if isinstance(item.get('createdAt'), datetime):
+            item['createdAt'] = item['createdAt'].isoformat()
+        item['id'] = doc.id
+        keywords.append(item)
     
-    for term in ai_terms:
-        if term.lower() in text_lower:
-            # 원본 케이스 유지해서 추출
-            start_idx = text_lower.find(term.lower())
-            if start_idx != -1:
-                original_term = text[start_idx:start_idx + len(term)]
-                keywords.append(original_term)
+    next_cursor = None
+    if has_more and docs:
+        last = docs[-1]
+        next_cursor = encode_cursor(last.get('createdAt'), last.id)
     
-    return list(set(keywords))  # 중복 제거
+    return {"keywords": keywords, "count": len(keywords), "nextCursor": next_cursor}
 
-@scheduler_fn.on_schedule(schedule="0 9,18 * * 1,3,5")  # 월,수,금 오전9시, 오후6시
-def scheduled_crawl(event):
-    """스케줄된 크롤링 실행"""
-    logger.info("스케줄된 크롤링 시작")
+def _json_default(value):
+    # 문서에서 JSON이 아닌 값은 대부분 createdAt 같은 datetime
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+_ndjson_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+def stream_keywords(params):
+    """조회 결과를 Firestore 스트림에서 받는 대로 NDJSON 바이트 청크로 내보냄 (메모리에는 청크 하나만)"""
+    query = keywords_query(params)
+    if params['limit'] is not None:
+        query = query.limit(params['limit'])
     
-    crawl_huggingface_papers()
-    crawl_papers_with_code() 
-    crawl_techcrunch_ai()
-    crawl_ai_news()
+    fields = params['fields']
+    chunk, size = [], 0
+    try:
+        for doc in query.stream():
+            data = doc.to_dict()
+            item = {field: data.get(field) for field in fields}
+            item['id'] = doc.id
+            line = (_ndjson_encoder.encode(item) + '\n').encode('utf-8')
+            chunk.append(line)
+            size += len(line)
+            if size >= STREAM_CHUNK_BYTES:
+                yield b''.join(chunk)
+                chunk, size = [], 0
+    except Exception as e:
+        # 응답 상태는 이미 보냈으므로 마지막 줄로 오류를 알림
+        logger.error(f"키워드 스트리밍 오류: {e}")
+        chunk.append((_ndjson_encoder.encode({'error': str(e)}) + '\n').encode('utf-8'))
+    if chunk:
+        yield b''.join(chunk)
+
+def gzip_chunks(chunks):
+    """바이트 청크를 이어지는 gzip 스트림으로 압축"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def etag_matches(header, etag):
+    """If-None-Match 헤더에 현재 ETag가 포함되어 있는지"""
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+def cached_json_response(req, cache_key, load):
+    """load() 결과를 JSON으로 캐시하고 ETag/If-None-Match(304) 처리 (결과가 None이면 404)"""
+    cached = _response_cache.get(cache_key)
+    if cached is None:
+        result = load()
+        if result is None:
+            return https_fn.Response("데이터가 없습니다", status=404)
+        body = json.dumps(result, ensure_ascii=False, default=str).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        _response_cache.set(cache_key, body, etag)
+    else:
+        body, etag = cached
     
-    logger.info("스케줄된 크롤링 완료")
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max(KEYWORDS_CACHE_TTL, 0)}",
+    }
+    if etag_matches(req.headers.get('If-None-Match'), etag):
+        return https_fn.Response(status=304, headers=headers)
     
-    return "크롤링 완료"
+    return https_fn.Response(body, headers={**headers, "Content-Type": "application/json; charset=utf-8"})
 
 @https_fn.on_request()
-def manual_crawl(req: https_fn.Request) -> https_fn.Response:
-    """수동 크롤링 트리거"""
+def get_keywords(req: https_fn.Request) -> https_fn.Response:
+    """저장된 키워드 조회 (?limit=&cursor=&fields=&category=&days=, ?format=ndjson[&gzip=1] 이면 스트리밍)"""
     try:
-        logger.info("수동 크롤링 시작")
+        params = parse_keywords_query(req.args)
+    except ValueError as e:
+        return https_fn.Response(str(e), status=400)
+    
+    if params['format'] == 'ndjson':
+        # 결과 전체를 모으지 않으므로 응답 캐시/ETag 없이 바로 스트리밍
+        headers = {"Content-Type": "application/x-ndjson; charset=utf-8", "Cache-Control": "no-store"}
+        body = stream_keywords(params)
+        if params['gzip']:
+            body = gzip_chunks(body)
+            headers["Content-Encoding"] = "gzip"
+        return https_fn.Response(body, headers=headers)
+    
+    try:
+        return cached_json_response(
+            req, 'keywords:' + json.dumps(params, sort_keys=True), lambda: load_keywords_page(params)
+        )
         
-        crawl_huggingface_papers()
-        crawl_papers_with_code()
-        crawl_techcrunch_ai() 
-        crawl_ai_news()
+    except Exception as e:
+        logger.error(f"키워드 조회 오류: {e}")
+        return https_fn.Response(f"조회 중 오류 발생: {str(e)}", status=500)
+
+def load_weekly_digest(week=None):
+    """주간 다이제스트 문서 하나 조회 (week가 없으면 가장 최근 주)"""
+    collection = get_db().collection(DIGEST_COLLECTION)
+    if week:
+        doc = collection.document(week).get()
+        docs = [doc] if doc.exists else []
+    else:
+        docs = list(collection.order_by('weekStart', direction='DESCENDING').limit(1).stream())
+    if not docs:
+        return None
+    
+    digest = docs[0].to_dict()
+    for section in digest.get('categories', {}).values():
+        # 최신 키워드가 먼저 오도록 목록으로 변환
+        keywords = [{'id': doc_id, **data} for doc_id, data in section.get('keywords', {}).items()]
+        keywords.sort(key=lambda item: str(item.get('createdAt')), reverse=True)
+        section['keywords'] = keywords
+    return digest
+
+@https_fn.on_request()
+def get_weekly_digest(req: https_fn.Request) -> https_fn.Response:
+    """이번 주(또는 ?week=2026-W42) 카테고리별 키워드 다이제스트"""
+    week = req.args.get('week') or None
+    try:
+        return cached_json_response(req, f"digest:{week}", lambda: load_weekly_digest(week))
         
-        return https_fn.Response("크롤링이 성공적으로 완료되었습니다!")
+    except Exception as e:
+        logger.error(f"다이제스트 조회 오류: {e}")
+        return https_fn.Response(f"조회 중 오류 발생: {str(e)}", status=500)
+
+def list_archives():
+    """아카이브된 주 목록 (본문 없이 메타데이터만)"""
+    query = (
+        get_db().collection(ARCHIVE_COLLECTION)
+        .select(['weekId', 'weekStart', 'count', 'bytes', 'updatedAt'])
+        .order_by('weekStart', direction='DESCENDING')
+    )
+    return {"archives": [doc.to_dict() for doc in query.stream()]}
+
+def load_archive(week, categories=()):
+    """주간 아카이브 압축을 풀어서 반환 (categories가 있으면 해당 카테고리만)"""
+    doc = get_db().collection(ARCHIVE_COLLECTION).document(week).get()
+    if not doc.exists:
+        return None
+    archive = json.loads(gzip.decompress(doc.get('data')))
+    if categories:
+        archive['documents'] = [item for item in archive['documents'] if item.get('category') in categories]
+        archive['count'] = len(archive['documents'])
+    return archive
+
+@https_fn.on_request()
+def get_archive(req: https_fn.Request) -> https_fn.Response:
+    """보존 기간이 지난 주의 키워드 (?week=2026-W30&category=, week가 없으면 아카이브 목록)"""
+    week = req.args.get('week') or None
+    if week is not None and not re.fullmatch(r'\d{4}-W\d{2}', week):
+        return https_fn.Response("week는 2026-W30 형식이어야 합니다", status=400)
+    categories = sorted({c for value in req.args.getlist('category') for c in value.split(',') if c})
+    try:
+        if week is None:
+            return cached_json_response(req, 'archives', list_archives)
+        return cached_json_response(req, f"archive:{week}:{','.join(categories)}", lambda: load_archive(week, categories))
         
     except Exception as e:
-        logger.error(f"수동 크롤링 오류: {e}")
-        return https_fn.Response(f"크롤링 중 오류 발생: {str(e)}", status=500)
+        logger.error(f"아카이브 조회 오류: {e}")
+        return https_fn.Response(f"조회 중 오류 발생: {str(e)}", status=500)
+
+# get_trends 파라미터 범위
+TRENDS_MAX_WINDOW = 28
+TRENDS_MAX_DAYS = 90
+TRENDS_MAX_TOP = 50
+
+def parse_trends_query(args):
+    """트렌드 요청 파라미터 정규화 (잘못된 값은 ValueError)"""
+    window = int(args.get('window', 7))
+    if not 1 <= window <= TRENDS_MAX_WINDOW:
+        raise ValueError(f"window는 1~{TRENDS_MAX_WINDOW} 사이여야 합니다")
+    days = int(args.get('days', 4 * window))
+    if not window < days <= TRENDS_MAX_DAYS:
+        raise ValueError(f"days는 window보다 크고 {TRENDS_MAX_DAYS} 이하여야 합니다")
+    top = int(args.get('top', 10))
+    if not 1 <= top <= TRENDS_MAX_TOP:
+        raise ValueError(f"top은 1~{TRENDS_MAX_TOP} 사이여야 합니다")
+    end = args.get('date') or None
+    if end:
+        try:
+            end = datetime.strptime(end, '%Y-%m-%d').date().isoformat()
+        except ValueError:
+            raise ValueError("date는 YYYY-MM-DD 형식이어야 합니다")
+    return {'window': window, 'days': days, 'top': top, 'date': end or datetime.now().date().isoformat()}
 
 @https_fn.on_request()
-def get_keywords(req: https_fn.Request) -> https_fn.Response:
-    """저장된 키워드 조회"""
+def get_trends(req: https_fn.Request) -> https_fn.Response:
+    """용어별 언급 추이와 상승 용어 (?window=7&days=28&top=10&date=YYYY-MM-DD)"""
     try:
-        # 최근 일주일 내 키워드만 조회
-        week_ago = datetime.now() - timedelta(days=7)
+        params = parse_trends_query(req.args)
+    except ValueError as e:
+        return https_fn.Response(str(e), status=400)
+    
+    def load():
+        # numpy는 이 함수에서만 쓰므로 여기서 import
+        from trends import load_trends
         
-        keywords_ref = db.collection('keywords').where('createdAt', '>=', week_ago).where('isActive', '==', True)
-        keywords = []
+        return load_trends(
+            datetime.strptime(params['date'], '%Y-%m-%d').date(),
+            window=params['window'], days=params['days'], top_k=params['top'],
+        )
+    
+    try:
+        return cached_json_response(req, 'trends:' + json.dumps(params, sort_keys=True), load)
         
-        for doc in keywords_ref.stream():
-            data = doc.to_dict()
-            data['id'] = doc.id
-            keywords.append(data)
+    except Exception as e:
+        logger.error(f"트렌드 조회 오류: {e}")
+        return https_fn.Response(f"조회 중 오류 발생: {str(e)}", status=500)
+
+# search_keywords 페이지 크기
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+def parse_day(value, name):
+    """YYYY-MM-DD -> YYYYMMDD 정수 (색인 포스팅의 날짜 형식)"""
+    try:
+        return int(datetime.strptime(value, '%Y-%m-%d').strftime('%Y%m%d'))
+    except ValueError:
+        raise ValueError(f"{name}는 YYYY-MM-DD 형식이어야 합니다")
+
+def parse_search_query(args):
+    """검색 요청 파라미터 정규화 (잘못된 값은 ValueError)"""
+    from search import decode_offset, parse_query
+    
+    q = ' '.join((args.get('q') or '').split())
+    parse_query(q)
+    
+    limit = int(args.get('limit', SEARCH_PAGE_SIZE))
+    if not 1 <= limit <= SEARCH_MAX_PAGE_SIZE:
+        raise ValueError(f"limit은 1~{SEARCH_MAX_PAGE_SIZE} 사이여야 합니다")
+    
+    categories = sorted({c for value in args.getlist('category') for c in value.split(',') if c})
+    
+    cursor = args.get('cursor') or None
+    if cursor:
+        try:
+            decode_offset(cursor)
+        except Exception:
+            raise ValueError("잘못된 cursor 값입니다")
+    
+    return {
+        'q': q,
+        'limit': limit,
+        'categories': categories,
+        'since': parse_day(args['since'], 'since') if args.get('since') else None,
+        'until': parse_day(args['until'], 'until') if args.get('until') else None,
+        'cursor': cursor,
+    }
+
+@https_fn.on_request()
+def search_keywords(req: https_fn.Request) -> https_fn.Response:
+    """역색인으로 키워드 검색 (?q=gemini 로봇, 접두사는 ?q=gem* / &category=&since=&until=&limit=&cursor=)"""
+    try:
+        params = parse_search_query(req.args)
+    except ValueError as e:
+        return https_fn.Response(str(e), status=400)
+    
+    def load():
+        from search import search_keywords as search
         
-        return https_fn.Response(
-            {"keywords": keywords, "count": len(keywords)},
-            headers={"Content-Type": "application/json"}
-        )
+        return search(params, KEYWORD_FIELDS)
+    
+    try:
+        return cached_json_response(req, 'search:' + json.dumps(params, sort_keys=True), load)
         
     except Exception as e:
-        logger.error(f"키워드 조회 오류: {e}")
-        return https_fn.Response(f"조회 중 오류 발생: {str(e)}", status=500)
\ No newline at end of file
+        logger.error(f"검색 오류: {e}")
+        return https_fn.Response(f"조회 중 오류 발생: {str(e)}", status=500)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+역색인 기반 키워드 검색 (search_keywords)
+
+크롤러가 갱신하는 search_index/<샤드> 문서에서 질의어가 속한 샤드만 읽어 후보를 찾고
+(색인어 가중치 x idf x 최신성)으로 순위를 매긴 뒤, 결과 페이지의 키워드 문서만 조회한다.
+keywords 컬렉션을 범위 조회하지 않으므로 일주일보다 오래된 키워드도 찾을 수 있다.
+색인 규칙(tokenize, hangul_ngrams, shard_id)은 crawler/search_index.py 와 같아야 한다.
+"""
+
+import base64
+import json
+import math
+import re
+from datetime import datetime
+
+from clients import SEARCH_INDEX_COLLECTION, get_db
+
+SEARCH_META_DOCUMENT = '_meta'
+SHARD_PREFIX_LENGTH = 2
+# 이 일수만큼 지난 문서는 점수가 절반
+RECENCY_HALF_LIFE_DAYS = 30
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-.][a-z0-9]+)*")
+_HANGUL_PATTERN = re.compile(r"[가-힣]+")
+STOPWORDS = frozenset(
+    'a an the and or of to in on for with by from at as is are be its it this that new how why what'.split()
+)
+
+def tokenize(text):
+    return {token for token in _TOKEN_PATTERN.findall((text or '').lower()) if token not in STOPWORDS}
+
+def hangul_ngrams(text):
+    grams = set()
+    for word in _HANGUL_PATTERN.findall(text or ''):
+        if len(word) == 1:
+            grams.add(word)
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+def shard_id(token):
+    return token[:SHARD_PREFIX_LENGTH]
+
+def parse_query(query):
+    """질의 -> 절 목록 [(색인어 목록, 접두사 여부)] (모든 절을 만족하는 문서만 결과에 포함)
+
+    'gem*' 처럼 끝에 *가 붙은 영문 토큰은 접두사 검색, 한글 단어는 바이그램이 모두 있어야 일치한다.
+    """
+    clauses = []
+    for word in query.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*')
+        grams = hangul_ngrams(word)
+        if grams:
+            clauses.append((sorted(grams), False))
+        for token in sorted(tokenize(word)):
+            if prefix and len(token) < SHARD_PREFIX_LENGTH:
+                raise ValueError(f"접두사 검색어는 {SHARD_PREFIX_LENGTH}글자 이상이어야 합니다")
+            clauses.append(([token], prefix))
+    if not clauses:
+        raise ValueError("검색어가 없습니다")
+    return clauses
+
+def encode_offset(offset):
+    return base64.urlsafe_b64encode(json.dumps({'offset': offset}).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_offset(cursor):
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    offset = json.loads(raw)['offset']
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError(cursor)
+    return offset
+
+def _load_shards(db, clauses):
+    collection = db.collection(SEARCH_INDEX_COLLECTION)
+    shard_ids = {shard_id(term) for terms, _ in clauses for term in terms} | {SEARCH_META_DOCUMENT}
+    snapshots = db.get_all([collection.document(shard) for shard in sorted(shard_ids)])
+    shards = {snapshot.id: snapshot.to_dict() or {} for snapshot in snapshots if snapshot.exists}
+    total = shards.pop(SEARCH_META_DOCUMENT, {}).get('documents', 0)
+    return shards, total
+
+def _idf(postings, total):
+    return math.log(1 + max(total, len(postings)) / max(len(postings), 1))
+
+def _clause_matches(clause, shards, total):
+    """절 하나에 일치하는 문서 -> (점수, 포스팅)"""
+    terms, prefix = clause
+    matches = {}
+    if prefix:
+        # 접두사에 걸리는 색인어 중 가장 높은 점수
+        shard = shards.get(shard_id(terms[0]), {}).get('tokens', {})
+        for token, postings in shard.items():
+            if not token.startswith(terms[0]):
+                continue
+            idf = _idf(postings, total)
+            for doc_id, posting in postings.items():
+                score = posting[2] * idf
+                if doc_id not in matches or score > matches[doc_id][0]:
+                    matches[doc_id] = (score, posting)
+        return matches
+
+    # 한글 단어의 바이그램은 모두 있어야 하고 점수는 평균
+    postings_list = [shards.get(shard_id(term), {}).get('tokens', {}).get(term, {}) for term in terms]
+    if not all(postings_list):
+        return matches
+    common = set.intersection(*(set(postings) for postings in postings_list))
+    for doc_id in common:
+        score = sum(postings[doc_id][2] * _idf(postings, total) for postings in postings_list) / len(postings_list)
+        matches[doc_id] = (score, postings_list[0][doc_id])
+    return matches
+
+def rank(clauses, shards, total, categories=None, since=None, until=None, today=None):
+    """절을 모두 만족하는 문서를 점수순으로 [(문서 ID, 점수, 날짜)] (since/until: YYYYMMDD 정수)"""
+    today = today or datetime.now()
+    combined = None
+    for clause in clauses:
+        matches = _clause_matches(clause, shards, total)
+        if combined is None:
+            combined = matches
+        else:
+            combined = {
+                doc_id: (combined[doc_id][0] + score, posting)
+                for doc_id, (score, posting) in matches.items() if doc_id in combined
+            }
+        if not combined:
+            return []
+
+    ranked = []
+    for doc_id, (score, (day, category, _)) in combined.items():
+        if categories and category not in categories:
+            continue
+        if (since and day < since) or (until and day > until):
+            continue
+        age = max((today - datetime.strptime(str(day), '%Y%m%d')).days, 0) if day else 0
+        ranked.append((doc_id, score / (1 + age / RECENCY_HALF_LIFE_DAYS), day))
+    ranked.sort(key=lambda item: (-item[1], -item[2], item[0]))
+    return ranked
+
+def search_keywords(params, fields):
+    """검색 결과 한 페이지 (params: q, categories, since, until, limit, cursor)"""
+    db = get_db()
+    clauses = parse_query(params['q'])
+    shards, total = _load_shards(db, clauses)
+    ranked = rank(
+        clauses, shards, total,
+        categories=set(params['categories']), since=params['since'], until=params['until'],
+    )
+
+    offset = decode_offset(params['cursor']) if params['cursor'] else 0
+    page = ranked[offset:offset + params['limit']]
+    # 결과 페이지의 문서만 조회 (보존 기간이 지나 삭제된 문서는 건너뜀)
+    keywords = db.collection('keywords')
+    snapshots = db.get_all([keywords.document(doc_id) for doc_id, _, _ in page], field_paths=fields) if page else []
+    documents = {snapshot.id: snapshot.to_dict() for snapshot in snapshots if snapshot.exists}
+
+    results = []
+    for doc_id, score, _ in page:
+        data = documents.get(doc_id)
+        if data is None:
+            continue
+        item = {field: data.get(field) for field in fields}
+        if isinstance(item.get('createdAt'), datetime):
+            item['createdAt'] = item['createdAt'].isoformat()
+        results.append({'id': doc_id, 'score': round(score, 4), **item})
+
+    has_more = offset + params['limit'] < len(ranked)
+    return {
+        'query': params['q'],
+        'total': len(ranked),
+        'results': results,
+        'nextCursor': encode_offset(offset + params['limit']) if has_more else None,
+    }
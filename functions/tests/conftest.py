@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Functions 테스트 공통 설정 (Firestore 는 crawler/benchmarks 의 메모리 구현으로 대체)"""
+
+import os
+import sys
+
+import pytest
+
+FUNCTIONS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [FUNCTIONS_DIR, os.path.join(os.path.dirname(FUNCTIONS_DIR), 'crawler', 'benchmarks')]
+
+@pytest.fixture
+def db(monkeypatch):
+    """get_db() 가 돌려줄 메모리 Firestore"""
+    import clients
+    from fake_firestore import InMemoryFirestore
+
+    fake = InMemoryFirestore()
+    monkeypatch.setattr(clients, '_db', fake)
+    return fake
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""get_keywords 커서 페이지네이션/NDJSON 테스트 (메모리 Firestore)"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask, request
+
+import main
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    # 요청마다 다른 데이터를 쓰므로 웜 인스턴스 응답 캐시를 비움
+    monkeypatch.setattr(main, '_response_cache', main.ResponseCache())
+
+@pytest.fixture
+def keywords(db):
+    """최근 문서 7개 (두 문서는 createdAt 이 같아 문서 ID 로 순서가 정해짐), 비활성/기간 밖 문서 하나씩"""
+    now = datetime.now().replace(microsecond=0)
+    documents = {
+        'k1': ('GPT-5 release', '모델', now - timedelta(hours=1)),
+        'k2': ('Claude paper', '논문/학회', now - timedelta(hours=2)),
+        'k3a': ('Gemini update', '모델', now - timedelta(hours=3)),
+        'k3b': ('Gemini robotics', '모델', now - timedelta(hours=3)),
+        'k4': ('LLaMA weights', '논문/학회', now - timedelta(hours=4)),
+        'k5': ('Mixtral MoE', '모델', now - timedelta(hours=5)),
+        'k6': ('DeepSeek coder', '서비스/앱', now - timedelta(hours=6)),
+        'hidden': ('inactive', '모델', now - timedelta(hours=2)),
+        'stale': ('too old', '모델', now - timedelta(days=30)),
+    }
+    for doc_id, (keyword, category, created_at) in documents.items():
+        db.collection('keywords').document(doc_id).set({
+            'keyword': keyword,
+            'translatedKeyword': None,
+            'category': category,
+            'source': 'huggingface',
+            'url': None,
+            'createdAt': created_at,
+            'isActive': doc_id != 'hidden',
+        })
+    return ['k1', 'k2', 'k3b', 'k3a', 'k4', 'k5', 'k6']
+
+def call(query, headers=None):
+    with Flask(__name__).test_request_context('/get_keywords', query_string=query, headers=headers or {}):
+        return main.get_keywords(request)
+
+def fetch_all(query):
+    """nextCursor 를 따라가며 모든 페이지를 받아서 (문서 ID 목록, 페이지 수) 반환"""
+    ids, pages, cursor = [], 0, None
+    while True:
+        response = call({**query, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200
+        page = json.loads(response.get_data())
+        assert page['count'] == len(page['keywords']) <= int(query['limit'])
+        ids.extend(item['id'] for item in page['keywords'])
+        pages += 1
+        cursor = page['nextCursor']
+        if cursor is None:
+            return ids, pages
+
+@pytest.mark.parametrize('limit', ['1', '2', '3', '7', '100'])
+def test_cursor_round_trip_returns_every_document_once(keywords, limit):
+    ids, pages = fetch_all({'limit': limit})
+    assert ids == keywords
+    assert pages == max(-(-len(keywords) // int(limit)), 1)
+
+def test_cursor_round_trip_with_category_and_fields(keywords):
+    ids, _ = fetch_all({'limit': '2', 'category': '모델', 'fields': 'keyword'})
+    assert ids == ['k1', 'k3b', 'k3a', 'k5']
+
+    page = json.loads(call({'limit': '2', 'category': '모델', 'fields': 'keyword'}).get_data())
+    assert page['keywords'][0] == {'keyword': 'GPT-5 release', 'id': 'k1'}
+
+def test_cursor_is_stable_when_newer_documents_arrive(db, keywords):
+    first = json.loads(call({'limit': '3'}).get_data())
+    db.collection('keywords').document('k0').set({
+        'keyword': 'brand new', 'category': '모델', 'createdAt': datetime.now(), 'isActive': True,
+    })
+    second = json.loads(call({'limit': '3', 'cursor': first['nextCursor']}).get_data())
+    assert [item['id'] for item in first['keywords'] + second['keywords']] == keywords[:6]
+
+def test_encode_decode_cursor():
+    created_at = datetime(2026, 10, 14, 9, 30, 15, 250000)
+    assert main.decode_cursor(main.encode_cursor(created_at, 'abc')) == (created_at, 'abc')
+
+@pytest.mark.parametrize('query', [
+    {'cursor': 'not-a-cursor'},
+    {'limit': '0'},
+    {'limit': '501'},
+    {'days': '91'},
+    {'fields': 'password'},
+    {'format': 'xml'},
+])
+def test_invalid_parameters_are_rejected(db, query):
+    assert call(query).status_code == 400
+
+def test_etag_returns_not_modified(keywords):
+    response = call({'limit': '2'})
+    again = call({'limit': '2'}, headers={'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+
+def test_ndjson_streams_every_document(keywords):
+    response = call({'format': 'ndjson', 'fields': 'keyword,createdAt'})
+    lines = [json.loads(line) for line in response.get_data().decode('utf-8').splitlines()]
+    assert [line['id'] for line in lines] == keywords
+    assert set(lines[0]) == {'id', 'keyword', 'createdAt'}
+
+    compressed = call({'format': 'ndjson', 'gzip': '1', 'limit': '2'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    lines = gzip.decompress(compressed.get_data()).decode('utf-8').splitlines()
+    assert [json.loads(line)['id'] for line in lines] == keywords[:2]
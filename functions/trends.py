@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+용어 트렌드 계산 (get_trends)
+
+크롤러가 갱신하는 날짜별 카운터 문서(term_counts/<YYYY-MM-DD>)만 읽어서
+용어 x 날짜 행렬을 만들고, 이동 합계/주간 증감/상위 상승 용어를 NumPy 로 한 번에 계산한다.
+numpy 는 이 모듈에서만 쓰므로 다른 조회 함수의 콜드 스타트에는 영향이 없다.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from clients import TRENDS_COLLECTION, get_db
+
+def day_range(end, days):
+    """end 까지 days일 (오래된 날짜부터)"""
+    return [(end - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+
+def load_counter_matrix(end, days):
+    """(용어 목록, 날짜 목록, 용어 x 날짜 언급 수 행렬)"""
+    db = get_db()
+    day_ids = day_range(end, days)
+    collection = db.collection(TRENDS_COLLECTION)
+    snapshots = db.get_all([collection.document(day) for day in day_ids], field_paths=['terms'])
+    counts = {snapshot.id: snapshot.get('terms') or {} for snapshot in snapshots if snapshot.exists}
+
+    terms = sorted({term for day_counts in counts.values() for term in day_counts})
+    row = {term: i for i, term in enumerate(terms)}
+    matrix = np.zeros((len(terms), len(day_ids)), dtype=np.int64)
+    for column, day in enumerate(day_ids):
+        for term, count in counts.get(day, {}).items():
+            matrix[row[term], column] = count
+    return terms, day_ids, matrix
+
+def rolling_sums(matrix, window):
+    """각 날짜까지 window일 이동 합계 (앞의 window-1일은 잘라냄)"""
+    cumulative = np.cumsum(matrix, axis=1)
+    padded = np.concatenate([np.zeros((matrix.shape[0], 1), dtype=cumulative.dtype), cumulative], axis=1)
+    return padded[:, window:] - padded[:, :-window]
+
+def top_indices(scores, k, mask=None):
+    """점수 상위 k개 행 번호 (내림차순, mask가 False인 행 제외)"""
+    if mask is not None:
+        candidates = np.flatnonzero(mask)
+        scores = scores[candidates]
+    else:
+        candidates = np.arange(len(scores))
+    if len(candidates) == 0:
+        return candidates
+    k = min(k, len(candidates))
+    # 전체 정렬 대신 argpartition 으로 상위 k개만 고른 뒤 그 안에서 정렬
+    top = np.argpartition(-scores, k - 1)[:k]
+    return candidates[top[np.argsort(-scores[top], kind='stable')]]
+
+def compute_trends(terms, day_ids, matrix, window=7, top_k=10):
+    """이동 합계, 직전 기간 대비 증감, 상위 상승/언급 용어
+
+    matrix 는 window-1일 + 2*window일 이상을 포함해야 한다 (현재/직전 기간 비교).
+    """
+    rolling = rolling_sums(matrix, window)
+    current = rolling[:, -1]
+    previous = rolling[:, -1 - window]
+    delta = current - previous
+    # 직전 기간이 0이면 증가율이 무한대가 되므로 1을 더해 완화
+    growth = (current + 1) / (previous + 1)
+
+    series_days = day_ids[window - 1:]
+    term_list = np.array(terms, dtype=object)
+
+    def entry(i):
+        return {
+            'term': term_list[i],
+            'count': int(current[i]),
+            'previous': int(previous[i]),
+            'delta': int(delta[i]),
+            'growth': round(float(growth[i]), 3),
+            'series': rolling[i].tolist(),
+        }
+
+    # 증가량이 같으면 증가율 순 (증가량 + 증가율 / (최대 증가율 + 1) 로 한 번에 정렬)
+    riser_scores = delta + growth / (growth.max(initial=0) + 1)
+    risers = top_indices(riser_scores, top_k, mask=delta > 0)
+    top = top_indices(current.astype(np.float64), top_k, mask=current > 0)
+
+    return {
+        'asOf': day_ids[-1],
+        'window': window,
+        'days': series_days,
+        'terms': len(terms),
+        'mentions': int(current.sum()),
+        'risers': [entry(i) for i in risers],
+        'top': [entry(i) for i in top],
+    }
+
+def load_trends(end=None, window=7, days=28, top_k=10):
+    """end(기본 오늘)까지 days일의 window일 이동 합계와 상승 용어"""
+    end = end or date.today()
+    # 첫 날짜의 이동 합계에 필요한 window-1일을 앞에 더 읽음
+    terms, day_ids, matrix = load_counter_matrix(end, days + window - 1)
+    return compute_trends(terms, day_ids, matrix, window=window, top_k=top_k)
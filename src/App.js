@@ -17,27 +17,32 @@ const AIWeeklyNews = () => {
     try {
       setLoading(true);
       
-      const weekAgo = new Date();
-      weekAgo.setDate(weekAgo.getDate() - 7);
-      
+      // 크롤러가 매 실행마다 갱신하는 이번 주 다이제스트 문서 하나만 읽음
       const q = query(
-        collection(db, 'keywords'),
-        where('createdAt', '>=', weekAgo),
-        orderBy('createdAt', 'desc'),
-        limit(50)
+        collection(db, 'digests'),
+        orderBy('weekStart', 'desc'),
+        limit(1)
       );
       
       const querySnapshot = await getDocs(q);
       const keywordList = [];
       
       querySnapshot.forEach((doc) => {
-        const data = doc.data();
-        keywordList.push({
-          id: doc.id,
-          ...data,
-          createdAt: data.createdAt?.toDate ? data.createdAt.toDate() : new Date(data.createdAt?.seconds * 1000)
+        const categories = doc.data().categories || {};
+        Object.entries(categories).forEach(([category, section]) => {
+          Object.entries(section.keywords || {}).forEach(([id, data]) => {
+            // 예전 크롤러가 번역/링크만 덧붙여 만든 keyword 없는 항목은 건너뜀
+            if (!data || !data.keyword) return;
+            keywordList.push({
+              id,
+              category,
+              ...data,
+              createdAt: data.createdAt?.toDate ? data.createdAt.toDate() : new Date(data.createdAt?.seconds * 1000)
+            });
+          });
         });
       });
+      keywordList.sort((a, b) => b.createdAt - a.createdAt);
       
       setKeywords(keywordList);
       
@@ -102,6 +107,24 @@ const AIWeeklyNews = () => {
     return grouped;
   };
 
+  // 여러 소스에 실린 같은 기사는 크롤러가 하나의 스토리로 묶고 links 에 소스를 모아 둠
+  const sourceLabel = (item) => {
+    const sources = [...new Set((item.links || []).map(link => link.source))];
+    return sources.length > 1 ? sources.join(', ') : item.source;
+  };
+
+  // 크롤러가 기사 페이지의 og 메타데이터를 모은 경우(preview) 카드에 이미지/요약 표시
+  const MODEL_CARD_IMAGE = 'https://lh3.googleusercontent.com/aida-public/AB6AXuByle37IgSPURy5U9yGieZClk_URwy-Dt6yGRNEcSMncEacP_DhTb1TREZ9bjMowu9I_khuLLwEdbn6O2Rhn5kwZmPIZ7dHwTw-l3S2vQwvKg1pRiwR-dWoV8qrzvBOK_STUvuRrC9gw7olJvSrPIjREp1qtDaDnc39oA6YgxLFf8xTxh2P8M960nYObi2cOB1gVjmKnS_7lmxesEvu8MjGCP6zFbpha8pBLKtBi-tMr6d5GLDC9Z-vYWJDrhUMYyAvz7SlxnpYdRgy';
+  // 외부 페이지가 준 값이므로 http(s) URL만 사용하고 CSS 가 아닌 <img src> 로 넣음
+  const cardImage = (item) => {
+    const image = item.preview && item.preview.image;
+    return typeof image === 'string' && /^https?:\/\//i.test(image) ? image : MODEL_CARD_IMAGE;
+  };
+  const cardSummary = (item) => {
+    const text = (item.preview && item.preview.description) || item.keyword || '';
+    return text.length > 100 ? text.substring(0, 100) + '...' : text;
+  };
+
   const createNewsSlides = () => {
     const grouped = groupByCategory(keywords);
     const slides = [];
@@ -328,14 +351,19 @@ const AIWeeklyNews = () => {
                   {slide.items.map((item, itemIndex) => (
                     <div key={itemIndex} style={{ padding: '16px' }}>
                       <div style={{ display: 'flex', flexDirection: 'column', alignItems: 'stretch', justifyContent: 'flex-start', borderRadius: '12px' }}>
-                        <div style={{
-                          width: '100%',
-                          backgroundSize: 'cover',
-                          backgroundPosition: 'center',
-                          aspectRatio: '16/9',
-                          borderRadius: '12px',
-                          backgroundImage: 'url("https://lh3.googleusercontent.com/aida-public/AB6AXuByle37IgSPURy5U9yGieZClk_URwy-Dt6yGRNEcSMncEacP_DhTb1TREZ9bjMowu9I_khuLLwEdbn6O2Rhn5kwZmPIZ7dHwTw-l3S2vQwvKg1pRiwR-dWoV8qrzvBOK_STUvuRrC9gw7olJvSrPIjREp1qtDaDnc39oA6YgxLFf8xTxh2P8M960nYObi2cOB1gVjmKnS_7lmxesEvu8MjGCP6zFbpha8pBLKtBi-tMr6d5GLDC9Z-vYWJDrhUMYyAvz7SlxnpYdRgy")'
-                        }} />
+                        <img
+                          src={cardImage(item)}
+                          alt=""
+                          loading="lazy"
+                          referrerPolicy="no-referrer"
+                          style={{
+                            width: '100%',
+                            objectFit: 'cover',
+                            objectPosition: 'center',
+                            aspectRatio: '16/9',
+                            borderRadius: '12px'
+                          }}
+                        />
                         <div style={{ display: 'flex', width: '100%', minWidth: '288px', flexDirection: 'column', alignItems: 'stretch', justifyContent: 'center', gap: '4px', paddingTop: '16px' }}>
                           <p style={{ color: '#111618', fontSize: '18px', fontWeight: 'bold', lineHeight: 'tight' }}>
                             {item.keyword}
@@ -343,10 +371,10 @@ const AIWeeklyNews = () => {
                           <div style={{ display: 'flex', alignItems: 'flex-end', gap: '12px', justifyContent: 'space-between' }}>
                             <div style={{ display: 'flex', flexDirection: 'column', gap: '4px' }}>
                               <p style={{ color: '#617c89', fontSize: '16px', fontWeight: 'normal', lineHeight: 'normal' }}>
-                                {item.category} • {item.source}
+                                {item.category} • {sourceLabel(item)}
                               </p>
                               <p style={{ color: '#617c89', fontSize: '16px', fontWeight: 'normal', lineHeight: 'normal' }}>
-                                {item.keyword.length > 100 ? item.keyword.substring(0, 100) + '...' : item.keyword}
+                                {cardSummary(item)}
                               </p>
                             </div>
                           </div>
@@ -456,7 +484,7 @@ const AIWeeklyNews = () => {
                           {(item.translatedKeyword || item.keyword).split(':')[0] || (item.translatedKeyword || item.keyword)}
                         </p>
                         <p style={{ color: '#617c89', fontSize: '14px', fontWeight: 'normal', lineHeight: 'normal', overflow: 'hidden', textOverflow: 'ellipsis', display: '-webkit-box', WebkitLineClamp: 2, WebkitBoxOrient: 'vertical' }}>
-                          {item.source} • {item.category}
+                          {sourceLabel(item)} • {item.category}
                         </p>
                       </div>
                     </div>
@@ -491,7 +519,7 @@ const AIWeeklyNews = () => {
                           {item.source === 'techcrunch' ? 'OpenAI' : item.source === 'ainews' ? 'Google DeepMind' : 'Anthropic'}
                         </p>
                         <p style={{ color: '#617c89', fontSize: '14px', fontWeight: 'normal', lineHeight: 'normal', overflow: 'hidden', textOverflow: 'ellipsis', display: '-webkit-box', WebkitLineClamp: 2, WebkitBoxOrient: 'vertical' }}>
-                          {(item.translatedKeyword || item.keyword).length > 80 ? (item.translatedKeyword || item.keyword).substring(0, 80) + '...' : (item.translatedKeyword || item.keyword)}
+                          {(item.translatedKeyword || item.keyword || '').length > 80 ? (item.translatedKeyword || item.keyword || '').substring(0, 80) + '...' : (item.translatedKeyword || item.keyword || '')}
                         </p>
                       </div>
                     </div>